@@ -0,0 +1,80 @@
+"""
+Benchmarks - API Load Test
+Drives one endpoint with N concurrent keep-alive clients for a fixed time and
+reports throughput and latency per concurrency level. Run it against the same
+data before and after a change (e.g. sync vs async endpoints) to compare.
+
+Usage:
+    python benchmarks/api_load.py --url http://localhost:8000 --path /prices/BTCUSDT \
+        --concurrency 1,10,50,200 --duration 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+async def _worker(client: httpx.AsyncClient, path: str, deadline: float, latencies: List[float], errors: List[int]):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+async def run_level(url: str, path: str, concurrency: int, duration: float) -> Dict[str, float]:
+    """Hammer `path` with `concurrency` clients for `duration` seconds"""
+    latencies: List[float] = []
+    errors: List[int] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        await client.get(path)  # Warm up connections and caches
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            _worker(client, path, deadline, latencies, errors) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000 if latencies else 0.0
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+async def _main(args):
+    print(f"{'conc':>6} {'requests':>9} {'errors':>7} {'req/s':>9} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in args.concurrency:
+        result = await run_level(args.url, args.path, concurrency, args.duration)
+        print(
+            f"{result['concurrency']:>6} {result['requests']:>9} {result['errors']:>7} {result['rps']:>9.0f} "
+            f"{result['mean_ms']:>9.1f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for one API endpoint")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/prices/BTCUSDT?limit=200")
+    parser.add_argument("--concurrency", default="1,10,50,200",
+                        type=lambda value: [int(level) for level in value.split(",")])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    asyncio.run(_main(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmarks - Compare Runs
+Lines up the numbers of two suite.py result files and flags every one that
+moved the wrong way by more than the threshold. Rates (`*_per_sec`, `rps`)
+should go up; latencies and durations (`*_ms`, `seconds`) should go down.
+
+Usage:
+    python benchmarks/compare.py benchmarks/results/<old>.json benchmarks/results/<new>.json
+    python benchmarks/compare.py old.json new.json --threshold 0.1 --fail-on-regression
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+HIGHER_IS_BETTER = ("_per_sec", "rps")
+LOWER_IS_BETTER = ("_ms", "seconds")
+
+def direction(field: str) -> Optional[int]:
+    """+1 if bigger is better, -1 if smaller is better, None for counts and settings"""
+    if field.endswith(HIGHER_IS_BETTER):
+        return 1
+    if field.endswith(LOWER_IS_BETTER):
+        return -1
+    return None
+
+def compare(old: Dict[str, dict], new: Dict[str, dict], threshold: float) -> List[Tuple[str, str, float, float, float, bool]]:
+    """(benchmark, field, old, new, relative change, regressed) for every field both runs measured"""
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        for field, before in old[key].items():
+            after = new[key].get(field)
+            sign = direction(field)
+            if sign is None or not isinstance(before, (int, float)) or not isinstance(after, (int, float)) or not before:
+                continue
+            change = (after - before) / before
+            rows.append((key, field, before, after, change, change * sign < -threshold))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.05, help="Relative change counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if anything regressed")
+    args = parser.parse_args()
+
+    old, new = (json.loads(path.read_text()) for path in (args.old, args.new))
+    print(f"old: {old['meta'].get('commit')} ({old['meta'].get('timestamp')})")
+    print(f"new: {new['meta'].get('commit')} ({new['meta'].get('timestamp')})")
+
+    rows = compare(old["results"], new["results"], args.threshold)
+    for key, field, before, after, change, regressed in rows:
+        flag = "REGRESSED" if regressed else ""
+        print(f"{key:<32} {field:<16} {before:>12.2f} {after:>12.2f} {change:>+8.1%}  {flag}")
+
+    skipped = sorted(old["results"].keys() ^ new["results"].keys())
+    if skipped:
+        print(f"Only in one run: {', '.join(skipped)}")
+
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
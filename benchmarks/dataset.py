@@ -0,0 +1,133 @@
+"""
+Benchmarks - Synthetic Dataset
+Seeded OHLCV random walks for `symbols x days` at a fixed tick interval,
+bulk-loaded into prices with COPY and rolled up into the bar tables, so
+every benchmark run starts from the same data. Benchmark symbols are named
+BENCH-<set>-<n> and live under their own asset type, which keeps them
+apart from real data and lets one dataset be dropped without the others.
+
+Usage:
+    python benchmarks/dataset.py --set api --symbols 20 --days 7 --interval 60
+    python benchmarks/dataset.py --drop
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT), str(ROOT / "services" / "common")]
+
+from sqlalchemy import text  # noqa: E402
+
+from common.bulk_load import load_prices  # noqa: E402
+from common.db import SessionLocal, engine  # noqa: E402
+from common.models import Base, Symbol  # noqa: E402
+from services.etl_service.app.rollups import rebuild_bars  # noqa: E402
+
+PREFIX = "BENCH-"
+
+def check_database():
+    """Refuse to write into anything that does not look like a scratch database"""
+    url = engine.url.render_as_string(hide_password=True)
+    if not any(marker in url.lower() for marker in ("bench", "test", "localhost")) and not os.getenv("BENCH_ALLOW_ANY_DB"):
+        sys.exit(f"Refusing to load benchmark data into {url}; set BENCH_ALLOW_ANY_DB=1 to override")
+
+def asset_type(name: str) -> str:
+    return f"bench_{name}"[:20]
+
+def symbol_names(name: str, count: int) -> List[str]:
+    return [f"{PREFIX}{name.upper()}-{i:05d}" for i in range(count)]
+
+def random_walk(
+    symbol_ids: List[int], start: datetime, days: int, interval: int, seed: int
+) -> Iterator[Tuple]:
+    """PRICE_COLUMNS rows, one series per symbol, ~2% daily volatility"""
+    rng = np.random.default_rng(seed)
+    steps = days * 86400 // interval
+    step_sigma = 0.02 * np.sqrt(interval / 86400)
+    timestamps = [start + timedelta(seconds=interval * i) for i in range(steps)]
+
+    for symbol_id in symbol_ids:
+        opens = rng.uniform(10, 1000) * np.exp(np.cumsum(rng.normal(0, step_sigma, steps)))
+        closes = np.append(opens[1:], opens[-1] * np.exp(rng.normal(0, step_sigma)))
+        spread = np.abs(rng.normal(0, step_sigma, steps)) * opens
+        highs = np.maximum(opens, closes) + spread
+        lows = np.minimum(opens, closes) - spread
+        volumes = rng.lognormal(3, 1, steps)
+        for i in range(steps):
+            yield (symbol_id, timestamps[i], opens[i], highs[i], lows[i], closes[i], volumes[i], "bench")
+
+def generate(name: str, symbols: int, days: int, interval: int, seed: int = 42, end: Optional[datetime] = None) -> dict:
+    """Create (or replace) dataset `name`; returns what was loaded and how long it took"""
+    check_database()
+    Base.metadata.create_all(bind=engine)
+    drop(name)
+
+    end = end or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        rows = [
+            Symbol(symbol=symbol, display_name=symbol, asset_type=asset_type(name), source="bench", is_active=True)
+            for symbol in symbol_names(name, symbols)
+        ]
+        db.add_all(rows)
+        db.flush()
+        symbol_ids = [row.id for row in rows]
+
+        stats = load_prices(random_walk(symbol_ids, start, days, interval, seed), db=db, bars=True)
+        bars = rebuild_bars(db, start, end, symbol_ids)
+        db.commit()
+    finally:
+        db.close()
+
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE prices"))
+
+    return {
+        "set": name,
+        "symbols": symbols,
+        "days": days,
+        "interval_seconds": interval,
+        "seed": seed,
+        "prices": stats.rows,
+        "bars": bars,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+def drop(name: Optional[str] = None):
+    """Delete one benchmark dataset, or all of them (prices and bars cascade)"""
+    pattern = f"{PREFIX}{name.upper()}-%" if name else f"{PREFIX}%"
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM symbols WHERE symbol LIKE :pattern"), {"pattern": pattern})
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a seeded synthetic OHLCV dataset for benchmarks")
+    parser.add_argument("--set", default="api", help="Dataset name, also its asset type suffix")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--interval", type=int, default=60, help="Seconds between ticks")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--drop", action="store_true", help="Delete every benchmark dataset and exit")
+    args = parser.parse_args()
+
+    if args.drop:
+        check_database()
+        drop()
+        return
+    result = generate(args.set, args.symbols, args.days, args.interval, args.seed)
+    print(
+        f"Loaded {result['prices']} prices and {result['bars']} bars for {result['symbols']} symbols "
+        f"in {result['seconds']:.1f}s"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmarks - Response Serialization
+Times the JSON encoding of one price history response, as rows come back
+from the database, along the paths FastAPI can take: untyped (jsonable_encoder
++ json.dumps, what endpoints without a response_model paid), typed
+(response_model validated and dumped by pydantic-core), and plain orjson
+as a floor.
+
+Usage:
+    python benchmarks/serialization.py --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "services" / "common"))
+from common.schemas import PriceResponse  # noqa: E402
+
+def make_rows(count: int) -> List[dict]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "ts": start + timedelta(minutes=i),
+            "open": 50000.0 + i,
+            "high": 50010.5 + i,
+            "low": 49990.25 + i,
+            "close": 50005.125 + i,
+            "volume": 12.5 * (i % 7),
+        }
+        for i in range(count)
+    ]
+
+def time_it(encode: Callable[[], bytes], repeat: int) -> List[float]:
+    encode()  # Warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON encoding cost of one price history response")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    adapter = TypeAdapter(List[PriceResponse])
+    paths = {
+        "untyped (jsonable_encoder + json)": lambda: json.dumps(jsonable_encoder(rows)).encode(),
+        "typed (pydantic-core dump_json)": lambda: adapter.dump_json(adapter.validate_python(rows)),
+        "orjson, no validation": lambda: orjson.dumps(rows),
+    }
+
+    print(f"{args.rows} rows, {args.repeat} runs")
+    print(f"{'path':<36} {'mean ms':>9} {'p50 ms':>9} {'min ms':>9} {'bytes':>9}")
+    for name, encode in paths.items():
+        timings = time_it(encode, args.repeat)
+        print(
+            f"{name:<36} {statistics.fmean(timings) * 1000:>9.2f} {statistics.median(timings) * 1000:>9.2f} "
+            f"{min(timings) * 1000:>9.2f} {len(encode()):>9}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Benchmarks - Hot Path Suite
+Times the ETL write path, the metrics engine and the read API against the
+synthetic datasets of benchmarks/dataset.py, and writes every number to a
+JSON file tagged with the commit, so two runs can be compared with
+benchmarks/compare.py.
+
+Benchmarks:
+    etl      _process_data (one tick per call) and _process_batch throughput
+    metrics  run_metrics over 10 / 1k / 10k symbols of 60 daily bars
+    api      /symbols, /prices/{symbol} and /prices?symbols= latency percentiles,
+             against --api-url or a uvicorn started for the run
+
+Usage:
+    python benchmarks/suite.py                                  # everything, default sizes
+    python benchmarks/suite.py --only etl,metrics --metric-sizes 10,1000
+    python benchmarks/compare.py benchmarks/results/<old>.json benchmarks/results/<new>.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+import dataset
+from api_load import run_level
+
+from sqlalchemy import text
+
+from common.db import SessionLocal, engine
+from services.etl_service.app import tasks
+from services.etl_service.app.metrics_engine import run_metrics
+
+ROOT = dataset.ROOT
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def _percentiles(seconds: List[float]) -> Dict[str, float]:
+    ordered = sorted(seconds)
+
+    def at(p: float) -> float:
+        return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+    return {"mean_ms": statistics.fmean(ordered) * 1000, "p50_ms": at(0.50), "p99_ms": at(0.99)}
+
+def _timed_calls(call: Callable[..., Any], count: int) -> List[float]:
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def bench_etl(ticks: int, batch_size: int, symbols: int) -> Dict[str, dict]:
+    """Ticks per second through the real ETL write path (prices, indicators, bars, Redis)"""
+    name = "etl"
+    dataset.drop(name)
+    names = dataset.symbol_names(name, symbols)
+    asset_type = dataset.asset_type(name)
+    start = datetime.now(timezone.utc).replace(microsecond=0)
+    payloads: List[Dict[str, Any]] = [
+        {
+            "symbol": names[i % symbols],
+            "source": "bench",
+            "price": 100.0 + (i % 50) * 0.1,
+            "volume": 1.0,
+            "ts": (start + timedelta(seconds=i // symbols)).isoformat(),
+        }
+        for i in range(ticks)
+    ]
+    # One log line per tick would be measured too
+    logging.getLogger("etl-tasks").setLevel(logging.WARNING)
+
+    results = {}
+    try:
+        tasks._process_batch(payloads[:symbols], asset_type)  # Create the symbols, warm the cache
+
+        calls = iter(payloads)
+        timings = _timed_calls(lambda calls=calls, asset_type=asset_type: tasks._process_data(next(calls), asset_type), ticks)
+        results["etl.process_data"] = {
+            "ticks": ticks,
+            "ticks_per_sec": ticks / sum(timings),
+            **_percentiles(timings),
+        }
+
+        shifted = [
+            {**payload, "ts": (datetime.fromisoformat(payload["ts"]) + timedelta(days=1)).isoformat()}
+            for payload in payloads
+        ]
+        batches = iter(shifted[i:i + batch_size] for i in range(0, ticks, batch_size))
+        count = (ticks + batch_size - 1) // batch_size
+        timings = _timed_calls(lambda batches=batches, asset_type=asset_type: tasks._process_batch(next(batches), asset_type), count)
+        results["etl.process_batch"] = {
+            "ticks": ticks,
+            "batch_size": batch_size,
+            "ticks_per_sec": ticks / sum(timings),
+            **_percentiles(timings),
+        }
+    finally:
+        dataset.drop(name)
+    return results
+
+def bench_metrics(sizes: List[int], repeat: int, reuse: bool) -> Dict[str, dict]:
+    """run_metrics wall time per symbol count; the first call per size is a warm-up"""
+    logging.getLogger("etl-metrics-engine").setLevel(logging.WARNING)
+    results = {}
+    for size in sizes:
+        name = f"m{size}"
+        asset_type = dataset.asset_type(name)
+        with engine.connect() as conn:
+            loaded = conn.execute(
+                text("SELECT count(*) FROM symbols WHERE asset_type = :asset_type"), {"asset_type": asset_type}
+            ).scalar()
+        if not (reuse and loaded == size):
+            print(f"  generating {size} symbols x 60 days ...")
+            dataset.generate(name, size, days=60, interval=86400)
+
+        db = SessionLocal()
+        try:
+            run_metrics(db, asset_type)
+            timings = _timed_calls(lambda db=db, asset_type=asset_type: run_metrics(db, asset_type), repeat)
+        finally:
+            db.close()
+        results[f"metrics.symbols_{size}"] = {
+            "symbols": size,
+            "seconds": statistics.median(timings),
+            "symbols_per_sec": size / statistics.median(timings),
+        }
+    return results
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _start_api() -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(ROOT / "services" / "common"), str(ROOT)]),
+        "LOG_LEVEL": "WARNING",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT / "services" / "api_service",
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API did not come up within 30s")
+
+def bench_api(url: str, concurrency: List[int], duration: float, symbols: int, reuse: bool) -> Dict[str, dict]:
+    """Latency percentiles and throughput per endpoint and concurrency level"""
+    name = "api"
+    names = dataset.symbol_names(name, symbols)
+    with engine.connect() as conn:
+        loaded = conn.execute(
+            text("SELECT count(*) FROM symbols WHERE asset_type = :asset_type"),
+            {"asset_type": dataset.asset_type(name)}
+        ).scalar()
+    if not (reuse and loaded == symbols):
+        print(f"  generating {symbols} symbols x 7 days of 1m ticks ...")
+        dataset.generate(name, symbols, days=7, interval=60)
+
+    process = None
+    if url is None:
+        process, url = _start_api()
+    paths = {
+        "symbols": "/symbols",
+        "price_history": f"/prices/{names[0]}?limit=200",
+        "multi_prices": f"/prices?symbols={','.join(names)}&limit=20",
+    }
+    results = {}
+    try:
+        for label, path in paths.items():
+            for level in concurrency:
+                result = asyncio.run(run_level(url, path, level, duration))
+                results[f"api.{label}.c{level}"] = {"path": path, **result}
+                print(f"  {label:<14} c={level:<4} {result['rps']:>8.0f} req/s  p50 {result['p50_ms']:.1f} ms  p99 {result['p99_ms']:.1f} ms")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+    return results
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ETL, metrics and API hot paths")
+    parser.add_argument("--only", default="etl,metrics,api", help="Comma separated subset of etl,metrics,api")
+    parser.add_argument("--etl-ticks", type=int, default=2000)
+    parser.add_argument("--etl-batch-size", type=int, default=500)
+    parser.add_argument("--etl-symbols", type=int, default=10)
+    parser.add_argument("--metric-sizes", default="10,1000,10000")
+    parser.add_argument("--metric-repeat", type=int, default=5)
+    parser.add_argument("--api-url", default=None, help="Running API to test; default starts one")
+    parser.add_argument("--api-symbols", type=int, default=20)
+    parser.add_argument("--concurrency", default="1,10,50")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per API concurrency level")
+    parser.add_argument("--reuse", action="store_true", help="Keep already loaded datasets of the right size")
+    parser.add_argument("--output", default=None, help="Result file, default benchmarks/results/<time>-<commit>.json")
+    args = parser.parse_args()
+
+    dataset.check_database()
+    selected = set(args.only.split(","))
+    commit = _git("rev-parse", "--short", "HEAD")
+    with engine.connect() as conn:
+        server_version = conn.execute(text("SHOW server_version")).scalar()
+
+    results: Dict[str, dict] = {}
+    if "etl" in selected:
+        print("etl ...")
+        results.update(bench_etl(args.etl_ticks, args.etl_batch_size, args.etl_symbols))
+    if "metrics" in selected:
+        print("metrics ...")
+        results.update(bench_metrics(
+            [int(size) for size in args.metric_sizes.split(",")], args.metric_repeat, args.reuse
+        ))
+    if "api" in selected:
+        print("api ...")
+        results.update(bench_api(
+            args.api_url, [int(level) for level in args.concurrency.split(",")],
+            args.duration, args.api_symbols, args.reuse
+        ))
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "postgres": server_version,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    for key, values in results.items():
+        headline = {k: round(v, 2) for k, v in values.items() if isinstance(v, float)}
+        print(f"{key:<32} {headline}")
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
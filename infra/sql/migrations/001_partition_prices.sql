@@ -0,0 +1,59 @@
+-- ===============================
+-- Migrate prices to a monthly range-partitioned table
+-- ===============================
+-- Run once, in a maintenance window (prices is locked while rows are copied):
+--   psql "$DB_URL" -f infra/sql/migrations/001_partition_prices.sql
+-- Partitions for future months are then kept by etl.maintain_partitions.
+
+BEGIN;
+
+-- Keep the old heap around under another name; index and constraint names
+-- are schema-wide, so they move out of the way too
+ALTER TABLE prices RENAME TO prices_legacy;
+ALTER TABLE prices_legacy RENAME CONSTRAINT uq_symbol_ts TO uq_symbol_ts_legacy;
+ALTER INDEX IF EXISTS prices_pkey RENAME TO prices_legacy_pkey;
+ALTER INDEX IF EXISTS ix_prices_ts RENAME TO ix_prices_legacy_ts;
+ALTER INDEX IF EXISTS idx_prices_symbol_ts RENAME TO idx_prices_legacy_symbol_ts;
+
+CREATE TABLE prices (
+    LIKE prices_legacy INCLUDING DEFAULTS,
+    PRIMARY KEY (index, ts),
+    CONSTRAINT uq_symbol_ts UNIQUE (symbol_id, ts),
+    FOREIGN KEY (symbol_id) REFERENCES symbols(id) ON DELETE CASCADE
+) PARTITION BY RANGE (ts);
+
+CREATE INDEX ix_prices_ts ON prices(ts);
+CREATE TABLE prices_default PARTITION OF prices DEFAULT;
+
+-- One partition per month from the oldest row up to three months ahead
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE(min(ts), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '3 months',
+            INTERVAL '1 month'
+        )::date
+        FROM prices_legacy
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF prices FOR VALUES FROM (%L) TO (%L)',
+            'prices_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month::text || ' 00:00:00+00',
+            (month + INTERVAL '1 month')::date::text || ' 00:00:00+00'
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO prices SELECT * FROM prices_legacy;
+
+-- The serial default still points at the legacy sequence; hand it over
+ALTER SEQUENCE prices_index_seq OWNED BY prices.index;
+SELECT setval('prices_index_seq', COALESCE((SELECT max(index) FROM prices), 1));
+
+COMMIT;
+
+-- After checking the new table:
+--   DROP TABLE prices_legacy;
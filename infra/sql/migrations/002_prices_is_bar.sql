@@ -0,0 +1,16 @@
+-- ===============================
+-- Flag prices rows that are provider OHLC bars
+-- ===============================
+-- Snapshot rows (24h tickers, Yahoo's latest daily values) carry open/high/low
+-- that are not the minute's, so the 1m rollup only uses them when is_bar is set.
+--   psql "$DB_URL" -f infra/sql/migrations/002_prices_is_bar.sql
+-- Existing rows cannot be told apart and stay snapshots (their bars are built
+-- from close); re-run a backfill for ranges whose bar wicks should be kept.
+-- Afterwards rebuild bars skewed by ticker ranges with etl.repair_bars.
+
+BEGIN;
+
+-- Constant default: catalog-only change, no table rewrite
+ALTER TABLE prices ADD COLUMN IF NOT EXISTS is_bar BOOLEAN NOT NULL DEFAULT FALSE;
+
+COMMIT;
@@ -13,9 +13,9 @@ CREATE TABLE IF NOT EXISTS symbols (
     created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
--- 2. PRICES (time-series)
+-- 2. PRICES (time-series, one partition per UTC month)
 CREATE TABLE IF NOT EXISTS prices (
-    index           BIGSERIAL PRIMARY KEY,
+    index           BIGSERIAL,
     symbol_id       INT NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
     ts              TIMESTAMPTZ NOT NULL,
     open            NUMERIC(18,8),
@@ -24,14 +24,62 @@ CREATE TABLE IF NOT EXISTS prices (
     close           NUMERIC(18,8) NOT NULL,
     volume          NUMERIC(24,8),
     source          TEXT NOT NULL,
+    is_bar          BOOLEAN NOT NULL DEFAULT FALSE,  -- OHLC of a provider bar, not snapshot (24h) stats
     inserted_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (index, ts),               -- keys must contain the partition column
     CONSTRAINT  uq_symbol_ts UNIQUE (symbol_id, ts)
-);
+) PARTITION BY RANGE (ts);
 
 CREATE INDEX IF NOT EXISTS idx_prices_symbol_ts
     ON prices(symbol_id, ts DESC);
 
--- 3. DAILY METRICS (batch results)
+-- Catch-all for rows outside the monthly partitions; monthly partitions
+-- (prices_yYYYYmMM) are created ahead of time by etl.maintain_partitions
+CREATE TABLE IF NOT EXISTS prices_default PARTITION OF prices DEFAULT;
+
+-- 3. 1-MINUTE BARS (rolled up from prices)
+CREATE TABLE IF NOT EXISTS price_bars_1m (
+    symbol_id       INT NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    bucket          TIMESTAMPTZ NOT NULL,  -- bar start
+    open            NUMERIC(18,8) NOT NULL,
+    high            NUMERIC(18,8) NOT NULL,
+    low             NUMERIC(18,8) NOT NULL,
+    close           NUMERIC(18,8) NOT NULL,
+    volume          NUMERIC(24,8),
+    ticks           INT NOT NULL,          -- raw prices rows in the bar
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (symbol_id, bucket)
+);
+
+-- 4. 1-HOUR BARS (rolled up from price_bars_1m)
+CREATE TABLE IF NOT EXISTS price_bars_1h (
+    symbol_id       INT NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    bucket          TIMESTAMPTZ NOT NULL,  -- bar start
+    open            NUMERIC(18,8) NOT NULL,
+    high            NUMERIC(18,8) NOT NULL,
+    low             NUMERIC(18,8) NOT NULL,
+    close           NUMERIC(18,8) NOT NULL,
+    volume          NUMERIC(24,8),
+    ticks           INT NOT NULL,          -- raw prices rows in the bar
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (symbol_id, bucket)
+);
+
+-- 5. 1-DAY BARS, UTC (rolled up from price_bars_1h)
+CREATE TABLE IF NOT EXISTS price_bars_1d (
+    symbol_id       INT NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    bucket          TIMESTAMPTZ NOT NULL,  -- bar start
+    open            NUMERIC(18,8) NOT NULL,
+    high            NUMERIC(18,8) NOT NULL,
+    low             NUMERIC(18,8) NOT NULL,
+    close           NUMERIC(18,8) NOT NULL,
+    volume          NUMERIC(24,8),
+    ticks           INT NOT NULL,          -- raw prices rows in the bar
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (symbol_id, bucket)
+);
+
+-- 6. DAILY METRICS (batch results)
 CREATE TABLE IF NOT EXISTS daily_metrics (
     id              BIGSERIAL PRIMARY KEY,
     symbol_id       INT NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
@@ -45,7 +93,39 @@ CREATE TABLE IF NOT EXISTS daily_metrics (
     CONSTRAINT uq_symbol_date UNIQUE(symbol_id, date)
 );
 
--- 4. ETL JOB TRACKING
+-- 7. STREAMING INDICATORS (updated on every tick)
+CREATE TABLE IF NOT EXISTS indicator_state (
+    symbol_id       INT PRIMARY KEY REFERENCES symbols(id) ON DELETE CASCADE,
+    last_ts         TIMESTAMPTZ,
+    last_close      NUMERIC(18,8),
+    ma_20           NUMERIC(18,8),
+    ma_50           NUMERIC(18,8),
+    rsi_14          NUMERIC(18,8),
+    volatility_20   NUMERIC(18,8),
+    state           BYTEA,                 -- packed running sums + last 50 closes
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- 8. BACKFILL CHECKPOINTS (one row per symbol x chunk)
+CREATE TABLE IF NOT EXISTS backfill_chunks (
+    id              SERIAL PRIMARY KEY,
+    symbol          TEXT NOT NULL,
+    asset_type      TEXT NOT NULL,
+    interval        TEXT NOT NULL,         -- 1m, 1h, 1d
+    chunk_start     TIMESTAMPTZ NOT NULL,
+    chunk_end       TIMESTAMPTZ NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'pending',  -- pending, running, done, failed
+    attempts        INT NOT NULL DEFAULT 0,
+    rows            INT,
+    error_message   TEXT,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_backfill_chunk UNIQUE (symbol, interval, chunk_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_backfill_chunks_status
+    ON backfill_chunks(status);
+
+-- 9. ETL JOB TRACKING
 CREATE TABLE IF NOT EXISTS etl_jobs (
     id              BIGSERIAL PRIMARY KEY,
     job_type        TEXT NOT NULL,         -- ingest_crypto, calc_daily_metrics
@@ -53,4 +133,20 @@ CREATE TABLE IF NOT EXISTS etl_jobs (
     started_at      TIMESTAMPTZ,
     finished_at     TIMESTAMPTZ,
     error_message   TEXT
-);
\ No newline at end of file
+);
+
+-- 10. PIPELINE TRACES (stage timings of sampled ticks)
+CREATE TABLE IF NOT EXISTS pipeline_traces (
+    id              BIGSERIAL PRIMARY KEY,
+    symbol          TEXT NOT NULL,
+    asset_type      TEXT NOT NULL,
+    queue           TEXT NOT NULL,         -- etl.crypto, etl.equity, ...
+    source_ts       TIMESTAMPTZ,           -- the provider's timestamp (prices.ts)
+    fetched_at      TIMESTAMPTZ,
+    published_at    TIMESTAMPTZ,
+    etl_started_at  TIMESTAMPTZ,
+    committed_at    TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_pipeline_traces_committed_at
+    ON pipeline_traces(committed_at);
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from common.db import async_engine
+from common.export import EXTENSIONS, MEDIA_TYPES, export_query, make_writer
+
+router = APIRouter()
+
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = Query("arrow", description="arrow, parquet or csv"),
+    symbols: Optional[str] = Query(None, description="Comma separated, default all"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = Query(50_000, ge=1_000, le=500_000),
+):
+    """
+    Stream a whole dataset as Arrow IPC, Parquet or CSV. Rows come through a
+    server-side cursor and each batch is encoded and sent as it arrives, so
+    neither the API nor the database materialises the full result.
+    """
+    try:
+        writer = make_writer(dataset, format)
+        sql, params = export_query(
+            dataset,
+            [symbol.strip() for symbol in symbols.split(",") if symbol.strip()] if symbols else None,
+            start,
+            end,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    async def chunks():
+        async with async_engine.connect() as conn:
+            result = await conn.stream(sql.execution_options(yield_per=batch_size), params)
+            async for rows in result.partitions():
+                yield writer.write(rows)
+        yield writer.close()
+
+    return StreamingResponse(
+        chunks(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{EXTENSIONS[format]}"'},
+    )
@@ -0,0 +1,77 @@
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.cache_versions import CATALOG_SCOPE
+from common.db import get_async_db
+from common.latest_prices import get_empty_async, get_latest_async, mark_empty_async, update_latest_async
+from common.schemas import LatestPriceResponse
+from ...core.cache import response_cache
+
+router = APIRouter()
+
+async def _from_database(db: AsyncSession, symbols: List[str]) -> Dict[str, dict]:
+    """Newest row of each symbol, for entries the Redis hash does not hold yet"""
+    result = await db.execute(
+        text(
+            """
+            SELECT s.symbol, p.ts, p.open, p.high, p.low, p.close, p.volume, p.source
+            FROM symbols s
+            CROSS JOIN LATERAL (
+                SELECT ts, open, high, low, close, volume, source
+                FROM prices
+                WHERE symbol_id = s.id
+                ORDER BY ts DESC
+                LIMIT 1
+            ) p
+            WHERE s.symbol = ANY(CAST(:symbols AS text[]))
+            """
+        ),
+        {"symbols": symbols}
+    )
+    return {row["symbol"]: dict(row) for row in result.mappings()}
+
+async def _latest(db: AsyncSession, symbols: List[str]) -> List[dict]:
+    """Latest tick of each symbol that has one, in request order"""
+    cached = await get_latest_async(symbols) or {}
+    missing = [symbol for symbol in symbols if cached.get(symbol) is None]
+    if missing:
+        # Symbols without any prices stay missing; their marker keeps them off Postgres
+        empty = await get_empty_async(missing)
+        missing = [symbol for symbol in missing if symbol not in empty]
+    if missing:
+        found = await _from_database(db, missing)
+        # Goes through the same newer-wins script, so a tick the ETL wrote meanwhile is kept
+        await update_latest_async(found.values())
+        await mark_empty_async(symbol for symbol in missing if symbol not in found)
+        cached.update(found)
+    return [{**cached[symbol], "symbol": symbol} for symbol in symbols if cached.get(symbol)]
+
+@router.get("/latest", response_model=List[LatestPriceResponse])
+async def get_latest_prices(
+    asset_type: Optional[str] = Query(None, description="crypto, equity, commodity or bond, default all"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Latest tick of every active symbol, served from Redis"""
+    async def load():
+        conditions = ["is_active = true"]
+        if asset_type:
+            conditions.append("asset_type = :asset_type")
+        result = await db.execute(
+            text(f"SELECT symbol FROM symbols WHERE {' AND '.join(conditions)} ORDER BY symbol"),
+            {"asset_type": asset_type}
+        )
+        return result.scalars().all()
+
+    # The symbol list comes from the catalog cache, so polling stays off Postgres
+    symbols = await response_cache.get_or_load(f"latest:symbols:{asset_type}", CATALOG_SCOPE, load)
+    return await _latest(db, list(symbols))
+
+@router.get("/latest/{symbol}", response_model=LatestPriceResponse)
+async def get_latest_price(symbol: str, db: AsyncSession = Depends(get_async_db)):
+    latest = await _latest(db, [symbol])
+    if not latest:
+        raise HTTPException(status_code=404, detail=f"No prices for {symbol}")
+    return latest[0]
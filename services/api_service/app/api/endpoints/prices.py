@@ -0,0 +1,197 @@
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.db import get_async_db
+from common.schemas import CandleInterval, CandleResponse, IndicatorResponse, MultiPriceRequest, PriceResponse
+from ...core.cache import response_cache
+
+router = APIRouter()
+
+# Finest rollup table each candle interval is a whole multiple of
+_BAR_TABLES = {
+    CandleInterval.M1: "price_bars_1m",
+    CandleInterval.M5: "price_bars_1m",
+    CandleInterval.M15: "price_bars_1m",
+    CandleInterval.H1: "price_bars_1h",
+    CandleInterval.H4: "price_bars_1h",
+    CandleInterval.D1: "price_bars_1d",
+}
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def _encode_cursor(ts: datetime) -> str:
+    return base64.urlsafe_b64encode(_utc(ts).isoformat().encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> datetime:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        return _utc(datetime.fromisoformat(raw))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def _latest_prices(db: AsyncSession, symbols: List[str], limit: int) -> Dict[str, list]:
+    """Last `limit` rows of every symbol in one query, grouped by symbol in request order"""
+    result = await db.execute(
+        text(
+            """
+            SELECT s.symbol, p.ts, p.open, p.high, p.low, p.close, p.volume
+            FROM symbols s
+            CROSS JOIN LATERAL (
+                SELECT ts, open, high, low, close, volume
+                FROM prices
+                WHERE symbol_id = s.id
+                ORDER BY ts DESC
+                LIMIT :limit
+            ) p
+            WHERE s.symbol = ANY(CAST(:symbols AS text[]))
+            ORDER BY s.symbol, p.ts DESC
+            """
+        ),
+        {"symbols": symbols, "limit": limit}
+    )
+    grouped: Dict[str, list] = {symbol: [] for symbol in symbols}
+    for row in result.mappings():
+        grouped[row["symbol"]].append(row)
+    return grouped
+
+def _symbol_list(symbols: List[str]) -> List[str]:
+    symbols = list(dict.fromkeys(symbol.strip() for symbol in symbols if symbol.strip()))
+    if not symbols or len(symbols) > 500:
+        raise HTTPException(status_code=422, detail="Between 1 and 500 symbols are required")
+    return symbols
+
+@router.get("/prices", response_model=Dict[str, List[PriceResponse]])
+async def get_prices(
+    symbols: str = Query(..., description="Comma separated, e.g. BTCUSDT,ETHUSDT"),
+    limit: int = Query(20, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _latest_prices(db, _symbol_list(symbols.split(",")), limit)
+
+@router.post("/prices", response_model=Dict[str, List[PriceResponse]])
+async def post_prices(request: MultiPriceRequest, db: AsyncSession = Depends(get_async_db)):
+    return await _latest_prices(db, _symbol_list(request.symbols), request.limit)
+
+@router.get("/prices/{symbol}", response_model=List[PriceResponse])
+async def get_price_history(
+    symbol: str,
+    response: Response,
+    limit: int = Query(200, ge=1, le=1000),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Newest first; the next (older) page's cursor is returned in the X-Next-Cursor header"""
+    before = _decode_cursor(cursor) if cursor else None
+
+    async def load():
+        # Only the bounds actually given, so every page is a plain range
+        # scan backwards over the (symbol_id, ts) index
+        conditions = ["p.symbol_id = (SELECT id FROM symbols WHERE symbol = :symbol)"]
+        params = {"symbol": symbol, "limit": limit + 1}
+        if start_date:
+            conditions.append("p.ts >= :start_date")
+            params["start_date"] = _utc(start_date)
+        if end_date:
+            conditions.append("p.ts < :end_date")
+            params["end_date"] = _utc(end_date)
+        if before:
+            conditions.append("p.ts < :before")
+            params["before"] = before
+
+        result = await db.execute(
+            text(
+                f"""
+                SELECT p.ts, p.open, p.high, p.low, p.close, p.volume
+                FROM prices p
+                WHERE {" AND ".join(conditions)}
+                ORDER BY p.ts DESC
+                LIMIT :limit
+                """
+            ),
+            params
+        )
+        rows = result.mappings().all()
+        # One extra row tells whether an older page exists
+        next_cursor = _encode_cursor(rows[limit - 1]["ts"]) if len(rows) > limit else None
+        return {"prices": rows[:limit], "next_cursor": next_cursor}
+
+    key = f"prices:{symbol}:{limit}:{start_date and start_date.isoformat()}:{end_date and end_date.isoformat()}:{cursor}"
+    page = await response_cache.get_or_load(key, symbol, load)
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["prices"]
+
+@router.get("/prices/{symbol}/candles", response_model=List[CandleResponse])
+async def get_candles(
+    symbol: str,
+    interval: CandleInterval = Query(CandleInterval.H1),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(500, ge=1, le=2000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """OHLCV buckets merged from the rollup bars in Postgres, oldest first, at most `limit` of them"""
+    async def load():
+        # Clamp the range to the last `limit` buckets so the scan stays bounded too
+        range_end = _utc(end) if end else datetime.now(timezone.utc)
+        range_start = range_end - interval.delta * limit
+        if start and _utc(start) > range_start:
+            range_start = _utc(start)
+
+        result = await db.execute(
+            text(
+                f"""
+                SELECT date_bin(CAST(:step AS interval), b.bucket, TIMESTAMPTZ '2000-01-01 00:00:00+00') AS ts,
+                       (array_agg(b.open ORDER BY b.bucket))[1] AS open,
+                       max(b.high) AS high,
+                       min(b.low) AS low,
+                       (array_agg(b.close ORDER BY b.bucket DESC))[1] AS close,
+                       sum(b.volume) AS volume
+                FROM {_BAR_TABLES[interval]} b
+                WHERE b.symbol_id = (SELECT id FROM symbols WHERE symbol = :symbol)
+                  AND b.bucket >= :start
+                  AND b.bucket < :end
+                GROUP BY 1
+                ORDER BY 1 DESC
+                LIMIT :limit
+                """
+            ),
+            {
+                "step": interval.delta,
+                "symbol": symbol,
+                "start": range_start,
+                "end": range_end,
+                "limit": limit
+            }
+        )
+        return list(reversed(result.mappings().all()))
+
+    key = f"candles:{symbol}:{interval.value}:{start and start.isoformat()}:{end and end.isoformat()}:{limit}"
+    return await response_cache.get_or_load(key, symbol, load)
+
+@router.get("/indicators/{symbol}", response_model=IndicatorResponse)
+async def get_indicators(symbol: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        text(
+            """
+            SELECT i.last_ts, i.last_close, i.ma_20, i.ma_50, i.rsi_14, i.volatility_20
+            FROM indicator_state i
+            JOIN symbols s ON i.symbol_id = s.id
+            WHERE s.symbol = :symbol
+            """
+        ),
+        {"symbol": symbol}
+    )
+    row = result.mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"No indicators for {symbol}")
+    return row
@@ -0,0 +1,68 @@
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket
+from fastapi.responses import StreamingResponse
+
+from common.config import settings
+from ...core.fanout import price_fanout
+
+router = APIRouter()
+
+def _parse_symbols(symbols: str) -> Optional[List[str]]:
+    parsed = list(dict.fromkeys(symbol.strip() for symbol in symbols.split(",") if symbol.strip()))
+    if not parsed or len(parsed) > settings.live_feed_max_symbols:
+        return None
+    return parsed
+
+@router.get("/stream/prices")
+async def stream_prices(symbols: str = Query(..., description="Comma separated, e.g. BTCUSDT,ETHUSDT")):
+    """Server-sent events, one `data:` line per committed tick of the watched symbols"""
+    parsed = _parse_symbols(symbols)
+    if parsed is None:
+        raise HTTPException(status_code=422, detail=f"Between 1 and {settings.live_feed_max_symbols} symbols are required")
+
+    async def events():
+        subscription = await price_fanout.subscribe(parsed)
+        try:
+            yield ": subscribed\n\n"
+            while True:
+                message = await subscription.next_within(settings.live_feed_keepalive)
+                # Comments keep proxies from closing an idle stream
+                yield f"data: {message}\n\n" if message is not None else ": keepalive\n\n"
+        finally:
+            await price_fanout.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/stream/prices")
+async def stream_prices_ws(websocket: WebSocket, symbols: str = Query(...)):
+    """The same feed over a WebSocket: a `subscribed` frame, then one text frame per tick"""
+    parsed = _parse_symbols(symbols)
+    if parsed is None:
+        await websocket.close(code=1008, reason=f"Between 1 and {settings.live_feed_max_symbols} symbols are required")
+        return
+
+    await websocket.accept()
+    subscription = await price_fanout.subscribe(parsed)
+    # Clients only listen, so a pending receive completes when they go away
+    received = asyncio.ensure_future(websocket.receive())
+    try:
+        await websocket.send_json({"type": "subscribed", "symbols": parsed})
+        while True:
+            message = asyncio.ensure_future(subscription.next())
+            done, _ = await asyncio.wait({message, received}, return_when=asyncio.FIRST_COMPLETED)
+            if received in done:
+                message.cancel()
+                if received.result()["type"] == "websocket.disconnect":
+                    break
+                received = asyncio.ensure_future(websocket.receive())
+                continue
+            await websocket.send_text(message.result())
+    finally:
+        received.cancel()
+        await price_fanout.unsubscribe(subscription)
@@ -0,0 +1,27 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.cache_versions import CATALOG_SCOPE
+from common.db import get_async_db
+from common.schemas import SymbolResponse
+from ...core.cache import response_cache
+
+router = APIRouter()
+
+@router.get("/symbols", response_model=List[SymbolResponse])
+async def get_symbols(db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        result = await db.execute(
+            text("""
+                SELECT id, symbol, display_name, asset_type, source, is_active
+                FROM symbols
+                WHERE is_active = true
+                ORDER BY symbol
+                """)
+        )
+        return result.mappings().all()
+
+    return await response_cache.get_or_load("symbols", CATALOG_SCOPE, load)
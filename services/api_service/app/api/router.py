@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from .endpoints import export, latest, prices, stream, symbols
+
+api_router = APIRouter()
+api_router.include_router(symbols.router, tags=["symbols"])
+api_router.include_router(prices.router, tags=["prices"])
+api_router.include_router(latest.router, tags=["latest"])
+api_router.include_router(stream.router, tags=["stream"])
+api_router.include_router(export.router, tags=["export"])
@@ -0,0 +1,167 @@
+"""
+API Service - Response Cache
+Read-through cache for query results. Entries are tagged with the version
+of their scope (a symbol, or the symbol catalog) and stop matching as soon
+as the ETL bumps that version after a commit.
+
+Lookup order: process-local LRU -> shared Redis tier -> database.
+
+Values are kept as the loader returned them; the endpoint's response model
+turns them into JSON, and the Redis tier stores them through orjson.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+import redis
+import redis.asyncio
+
+from common.cache_versions import get_versions_async
+from common.config import settings
+from common.logging_config import setup_logging
+from common.redis_client import get_async_redis, get_redis
+
+logger = setup_logging("api-cache")
+
+class ResponseCache:
+    """Two-tier versioned cache with hit/miss counters per tier"""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        unversioned_ttl: float,
+        version_refresh: float,
+        redis_tier: bool = True,
+        enabled: bool = True,
+        client: Optional[redis.asyncio.Redis] = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.unversioned_ttl = unversioned_ttl
+        self.version_refresh = version_refresh
+        self.redis_tier = redis_tier
+        self.enabled = enabled
+        self._client = client
+        # key -> (scope version, expires at, value)
+        self._entries: "OrderedDict[str, Tuple[Optional[int], float, Any]]" = OrderedDict()
+        # scope -> (version, looked up at)
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @property
+    def client(self) -> redis.asyncio.Redis:
+        return self._client or get_async_redis()
+
+    async def get_or_load(self, key: str, scope: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value of `key`, awaiting `loader` (the DB query) on a miss"""
+        if not self.enabled:
+            return await loader()
+
+        # Read the version before loading: a write landing in between bumps it
+        # again, so a result older than the write is never stored as current
+        version = await self._version(scope)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.local_hits += 1
+                return entry[2]
+
+        value = await self._redis_get(key, version)
+        if value is not None:
+            self.redis_hits += 1
+        else:
+            self.misses += 1
+            value = await loader()
+            await self._redis_set(key, version, value)
+
+        self._store(key, version, value, now)
+        return value
+
+    async def _version(self, scope: str) -> Optional[int]:
+        now = time.monotonic()
+        cached = self._versions.get(scope)
+        if cached is not None and now - cached[1] < self.version_refresh:
+            return cached[0]
+        versions = await get_versions_async([scope], client=self._client)
+        if versions is None:
+            return None
+        self._versions[scope] = (versions[scope], now)
+        return versions[scope]
+
+    def _store(self, key: str, version: Optional[int], value: Any, now: float):
+        ttl = self.ttl if version is not None else self.unversioned_ttl
+        with self._lock:
+            self._entries[key] = (version, now + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _redis_key(self, key: str, version: int) -> str:
+        return f"cache:response:{key}:v{version}"
+
+    async def _redis_get(self, key: str, version: Optional[int]) -> Any:
+        if not self.redis_tier or version is None:
+            return None
+        try:
+            raw = await self.client.get(self._redis_key(key, version))
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache tier unavailable: {e}")
+            return None
+        return orjson.loads(raw) if raw is not None else None
+
+    async def _redis_set(self, key: str, version: Optional[int], value: Any):
+        if not self.redis_tier or version is None:
+            return
+        try:
+            # Rows come back as RowMapping, which orjson encodes as a plain dict
+            raw = orjson.dumps(value, default=dict, option=orjson.OPT_UTC_Z)
+            await self.client.set(self._redis_key(key, version), raw, ex=int(self.ttl))
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache tier unavailable: {e}")
+
+    def clear(self):
+        """Drop local entries and counters, and every shared entry in Redis (blocking, for ops and tests)"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.local_hits = 0
+            self.redis_hits = 0
+            self.misses = 0
+        if self.redis_tier:
+            try:
+                client = get_redis()
+                keys = list(client.scan_iter(match="cache:response:*", count=1000))
+                if keys:
+                    client.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning(f"Could not clear Redis cache tier: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.local_hits + self.redis_hits) / lookups if lookups else 0.0,
+        }
+
+# One per API process
+response_cache = ResponseCache(
+    max_size=settings.api_cache_max_size,
+    ttl=settings.api_cache_ttl,
+    unversioned_ttl=settings.api_cache_unversioned_ttl,
+    version_refresh=settings.api_cache_version_refresh,
+    redis_tier=settings.api_cache_redis,
+    enabled=settings.api_cache_enabled,
+)
@@ -0,0 +1,131 @@
+"""
+API Service - Live Price Fan-out
+One Redis pub/sub connection per API process, subscribed to the channels
+of the symbols its clients watch (reference counted). Each message is
+copied into every interested client's bounded queue; a client that falls
+behind loses its oldest ticks instead of holding memory or slowing the rest.
+"""
+import asyncio
+from typing import Dict, List, Optional, Set
+
+import redis
+import redis.asyncio
+
+from common.config import settings
+from common.live_feed import CHANNEL_PREFIX, channel_name
+from common.logging_config import setup_logging
+from common.redis_client import get_async_redis
+
+logger = setup_logging("api-fanout")
+
+class Subscription:
+    """One client's view of the feed"""
+
+    def __init__(self, symbols: List[str], buffer_size: int):
+        self.symbols = symbols
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = 0
+
+    def deliver(self, message: str):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+    async def next(self) -> str:
+        return await self._queue.get()
+
+    async def next_within(self, timeout: float) -> Optional[str]:
+        """Next message, or None if nothing arrives within `timeout` seconds"""
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class PriceFanout:
+    def __init__(self, buffer_size: int, client: Optional[redis.asyncio.Redis] = None):
+        self.buffer_size = buffer_size
+        self._client = client
+        self._pubsub: Optional[redis.asyncio.client.PubSub] = None
+        self._reader: Optional[asyncio.Task] = None
+        # symbol -> subscriptions watching it
+        self._watchers: Dict[str, Set[Subscription]] = {}
+        self._lock = asyncio.Lock()
+        self.received = 0
+        self.delivered = 0
+
+    async def subscribe(self, symbols: List[str]) -> Subscription:
+        subscription = Subscription(symbols, self.buffer_size)
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = (self._client or get_async_redis()).pubsub(ignore_subscribe_messages=True)
+            new = [symbol for symbol in symbols if symbol not in self._watchers]
+            for symbol in symbols:
+                self._watchers.setdefault(symbol, set()).add(subscription)
+            if new:
+                await self._pubsub.subscribe(*(channel_name(symbol) for symbol in new))
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        async with self._lock:
+            unused = []
+            for symbol in subscription.symbols:
+                watchers = self._watchers.get(symbol)
+                if watchers is None:
+                    continue
+                watchers.discard(subscription)
+                if not watchers:
+                    del self._watchers[symbol]
+                    unused.append(symbol)
+            if unused and self._pubsub is not None:
+                try:
+                    await self._pubsub.unsubscribe(*(channel_name(symbol) for symbol in unused))
+                except redis.RedisError as e:
+                    logger.warning(f"Could not unsubscribe {len(unused)} channels: {e}")
+
+    async def _read(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except redis.RedisError as e:
+                # The next read reconnects, and redis-py subscribes the channels again
+                logger.warning(f"Live feed subscriber lost Redis: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            self.received += 1
+            for subscription in list(self._watchers.get(message["channel"][len(CHANNEL_PREFIX):], ())):
+                subscription.deliver(message["data"])
+                self.delivered += 1
+
+    async def close(self):
+        """Stop the reader and drop the pub/sub connection (call on event loop shutdown)"""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        self._watchers.clear()
+
+    def stats(self) -> Dict[str, int]:
+        subscriptions = {subscription for watchers in self._watchers.values() for subscription in watchers}
+        return {
+            "clients": len(subscriptions),
+            "channels": len(self._watchers),
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": sum(subscription.dropped for subscription in subscriptions),
+        }
+
+# One per API process
+price_fanout = PriceFanout(buffer_size=settings.live_feed_buffer)
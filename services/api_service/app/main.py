@@ -1,48 +1,43 @@
-from fastapi import FastAPI, Query, Depends
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi import FastAPI, Response
 
-from common.db import get_db, engine
+from common.db import async_engine, engine
+from common.metrics import render
 from common.models import Base
+from common.redis_client import close_async_redis
+from .api.router import api_router
+from .core.cache import response_cache
+from .core.fanout import price_fanout
+from .core.metrics import RequestMetricsMiddleware
 
 app = FastAPI(title="MarketFlow API")
+app.add_middleware(RequestMetricsMiddleware)
 
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
 
-@app.get("/symbols")
-def get_symbols(db: Session = Depends(get_db)):    
-    result = db.execute(
-        text("""
-            SELECT id, symbol, asset_type, source
-            FROM symbols
-            WHERE is_active = true
-            ORDER BY symbol
-            """)
-    ).mappings().all()
-    return result
-        
-@app.get("/prices/{symbol}")
-def get_price_history(symbol: str, limit: int = Query(200, le=1000), db: Session = Depends(get_db)):
-    result = db.execute(
-        text(
-            """
-            SELECT p.ts, p.close, p.volume
-            FROM prices p
-            JOIN symbols s ON p.symbol_id = s.id
-            WHERE s.symbol = :symbol
-            ORDER BY p.ts DESC
-            LIMIT :limit
-            """
-        ),
-        {
-            "symbol": symbol,
-            "limit": limit
-        }
-    ).mappings().all()
-    return result
+@app.on_event("shutdown")
+async def on_shutdown():
+    # Pooled asyncpg/Redis connections belong to this event loop
+    await price_fanout.close()
+    await async_engine.dispose()
+    await close_async_redis()
+
+app.include_router(api_router)
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return response_cache.stats()
+
+@app.get("/stream/stats")
+async def get_stream_stats():
+    return price_fanout.stats()
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render()
+    return Response(content=body, media_type=content_type)
 
 @app.get("/health")
-def health():
-    return {"status": "healthy"}
\ No newline at end of file
+async def health():
+    return {"status": "healthy"}
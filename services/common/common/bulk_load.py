@@ -0,0 +1,175 @@
+"""
+COPY-based bulk loader
+Streams rows from any iterator into a temp staging table with COPY and
+merges each chunk into the target table with one INSERT ... ON CONFLICT.
+Memory stays bounded by the CSV read buffer, whatever the input size.
+"""
+import csv
+import io
+import time
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from .db import engine
+from .logging_config import setup_logging
+
+logger = setup_logging("bulk-load")
+
+PRICE_COLUMNS = ("symbol_id", "ts", "open", "high", "low", "close", "volume", "source")
+METRIC_COLUMNS = ("symbol_id", "date", "ma_20", "ma_50", "rsi_14", "volatility_20", "daily_return")
+
+_NULL = r"\N"
+
+class LoadStats:
+    """Outcome of a bulk load"""
+
+    def __init__(self, rows: int, seconds: float):
+        self.rows = rows
+        self.seconds = seconds
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return f"LoadStats(rows={self.rows}, seconds={self.seconds:.3f}, rows_per_sec={self.rows_per_sec:.0f})"
+
+def _encode(value: Any) -> Any:
+    if value is None:
+        return _NULL
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+class _CsvStream(io.RawIOBase):
+    """File-like view over a row iterator, encoded to CSV on demand for COPY"""
+
+    def __init__(self, rows: Iterator[Sequence[Any]]):
+        self._rows = rows
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = b""
+        self.count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow([_encode(value) for value in row])
+            self.count += 1
+            if self._buffer.tell() >= 65536:
+                self._flush()
+        self._flush()
+
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def _flush(self):
+        self._pending += self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+def copy_upsert(
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+    extra_columns: Optional[Dict[str, str]] = None,
+    chunk_size: int = 100_000,
+    db=None,
+) -> LoadStats:
+    """
+    COPY `rows` (tuples ordered like `columns`) into `table`, updating
+    `update_columns` on conflict (DO NOTHING when empty). `extra_columns`
+    maps further target columns to SQL expressions, e.g. {"inserted_at": "now()"}.
+
+    With `db` (Session or Connection) the load runs inside the caller's
+    transaction and the caller commits; otherwise it runs in its own.
+    """
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in conflict_columns]
+
+    extra_columns = extra_columns or {}
+    staging = f"_stage_{table}"
+    column_list = ", ".join(columns)
+    target_list = ", ".join([*columns, *extra_columns])
+    select_list = ", ".join([*columns, *extra_columns.values()])
+    key_list = ", ".join(conflict_columns)
+    if update_columns:
+        action = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
+    else:
+        action = "DO NOTHING"
+
+    # DISTINCT ON keeps the last copy of a key so ON CONFLICT never hits a row twice;
+    # _row numbers rows in COPY order, physical order (ctid) is not guaranteed
+    merge_sql = f"""
+        INSERT INTO {table} ({target_list})
+        SELECT DISTINCT ON ({key_list}) {select_list}
+        FROM {staging}
+        ORDER BY {key_list}, _row DESC
+        ON CONFLICT ({key_list}) {action}
+    """
+
+    def _load(sa_conn) -> int:
+        raw = sa_conn.connection.dbapi_connection
+        total = 0
+        with raw.cursor() as cur:
+            cur.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                f"AS SELECT {column_list} FROM {table} WITH NO DATA"
+            )
+            cur.execute(f"ALTER TABLE {staging} ADD COLUMN IF NOT EXISTS _row BIGINT GENERATED ALWAYS AS IDENTITY")
+            source = iter(rows)
+            while True:
+                stream = _CsvStream(islice(source, chunk_size))
+                cur.copy_expert(
+                    f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')",
+                    stream
+                )
+                if stream.count == 0:
+                    break
+                cur.execute(merge_sql)
+                cur.execute(f"TRUNCATE {staging}")
+                total += stream.count
+                if stream.count < chunk_size:
+                    break
+            cur.execute(f"DROP TABLE IF EXISTS {staging}")
+        return total
+
+    started = time.perf_counter()
+    if db is None:
+        with engine.begin() as conn:
+            total = _load(conn)
+    else:
+        total = _load(db.connection() if isinstance(db, Session) else db)
+    stats = LoadStats(total, time.perf_counter() - started)
+
+    logger.info(f"Bulk loaded {stats.rows} rows into {table} in {stats.seconds:.2f}s ({stats.rows_per_sec:.0f} rows/s)")
+    return stats
+
+def load_prices(rows: Iterable[Sequence[Any]], db=None, bars: bool = False, **kwargs) -> LoadStats:
+    """Rows ordered like PRICE_COLUMNS, upserted on (symbol_id, ts). `bars`
+    marks them as provider OHLC bars (is_bar), whose open/high/low feed the
+    1m rollup; leave it off for snapshot rows such as 24h tickers."""
+    return copy_upsert(
+        "prices", PRICE_COLUMNS, rows, ("symbol_id", "ts"),
+        update_columns=[*PRICE_COLUMNS[2:], "is_bar"],
+        extra_columns={"is_bar": "true" if bars else "false", "inserted_at": "now()"}, db=db, **kwargs
+    )
+
+def load_daily_metrics(rows: Iterable[Sequence[Any]], db=None, **kwargs) -> LoadStats:
+    """Rows ordered like METRIC_COLUMNS, upserted on (symbol_id, date)"""
+    return copy_upsert(
+        "daily_metrics", METRIC_COLUMNS, rows, ("symbol_id", "date"),
+        extra_columns={"created_at": "now()"}, db=db, **kwargs
+    )
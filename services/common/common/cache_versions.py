@@ -0,0 +1,59 @@
+"""
+Cache versions
+Per-symbol version counters in Redis. Writers bump a symbol's counter after
+committing new prices; readers key cached responses by the counter, so a
+bump makes every older entry for that symbol unreachable at once.
+"""
+from typing import Dict, Iterable, List, Optional, cast
+
+import redis
+import redis.asyncio
+
+from .logging_config import setup_logging
+from .redis_client import get_async_redis, get_redis
+
+logger = setup_logging("cache-versions")
+
+# Scope of responses that depend on the symbol list rather than one symbol
+CATALOG_SCOPE = "*symbols"
+
+def version_key(scope: str) -> str:
+    return f"cache:version:{scope}"
+
+def bump_versions(scopes: Iterable[str], client: Optional[redis.Redis] = None):
+    """Invalidate cached responses of `scopes`; call only after the write committed"""
+    scopes = set(scopes)
+    if not scopes:
+        return
+    try:
+        pipe = (client or get_redis()).pipeline(transaction=False)
+        for scope in scopes:
+            pipe.incr(version_key(scope))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not bump cache versions for {len(scopes)} scopes: {e}")
+
+def get_versions(scopes: Iterable[str], client: Optional[redis.Redis] = None) -> Optional[Dict[str, int]]:
+    """Current version of each scope (0 if never bumped), None when Redis is unreachable"""
+    scopes = list(scopes)
+    try:
+        values = cast(List[Optional[str]], (client or get_redis()).mget([version_key(scope) for scope in scopes]))
+    except redis.RedisError as e:
+        logger.warning(f"Cache versions unavailable: {e}")
+        return None
+    return _parse_versions(scopes, values)
+
+async def get_versions_async(
+    scopes: Iterable[str], client: Optional[redis.asyncio.Redis] = None
+) -> Optional[Dict[str, int]]:
+    """get_versions() for the asyncio API"""
+    scopes = list(scopes)
+    try:
+        values = cast(List[Optional[str]], await (client or get_async_redis()).mget([version_key(scope) for scope in scopes]))
+    except redis.RedisError as e:
+        logger.warning(f"Cache versions unavailable: {e}")
+        return None
+    return _parse_versions(scopes, values)
+
+def _parse_versions(scopes: List[str], values: List[Optional[str]]) -> Dict[str, int]:
+    return {scope: int(value or 0) for scope, value in zip(scopes, values)}
@@ -2,6 +2,8 @@ from celery import Celery
 from celery.schedules import crontab
 from kombu import Exchange, Queue
 from .config import settings
+# Absolute on purpose: collectors register once, even when this package is also imported as services.common.common
+from common.metrics import instrument_celery
 
 celery_app = Celery(
     "marketflow",
@@ -24,6 +26,7 @@ celery_app.conf.task_queues = (
     Queue("ingestion.equity", market_exchange, routing_key="ingestion.equity"),
     Queue("ingestion.commodity", market_exchange, routing_key="ingestion.commodity"),
     Queue("ingestion.bond", market_exchange, routing_key="ingestion.bond"),
+    Queue("ingestion.backfill", market_exchange, routing_key="ingestion.backfill"),
     Queue("etl.crypto", market_exchange, routing_key="etl.crypto"),
     Queue("etl.equity", market_exchange, routing_key="etl.equity"),
     Queue("etl.commodity", market_exchange, routing_key="etl.commodity"),
@@ -37,11 +40,16 @@ celery_app.conf.task_routes = {
     "ingestion.fetch_equity": {"queue": "ingestion.equity"},
     "ingestion.fetch_commodity": {"queue": "ingestion.commodity"},
     "ingestion.fetch_bond": {"queue": "ingestion.bond"},
+    "ingestion.backfill": {"queue": "ingestion.backfill"},
+    "ingestion.backfill_chunk": {"queue": "ingestion.backfill"},
     # ETL Tasks
     "etl.process_crypto": {"queue": "etl.crypto"},
     "etl.process_equity": {"queue": "etl.equity"},
     "etl.process_commodity": {"queue": "etl.commodity"},
-    "etl.process_bond": {"queue": "etl.bond"}
+    "etl.process_bond": {"queue": "etl.bond"},
+    "etl.repair_bars": {"queue": "etl.crypto"},
+    "etl.maintain_partitions": {"queue": "etl.crypto"}
+    # etl.process_batch is published straight to etl.<asset_type> by the ingestion tasks
 }
 
 # Celery Beat Schedule
@@ -70,6 +78,18 @@ celery_app.conf.beat_schedule = {
         "schedule": settings.bond_fetch_interval, 
         "options": {"queue": "ingestion.bond"}
     },
+    # prices partitions - Every day at 00:01
+    "maintain-price-partitions": {
+        "task": "etl.maintain_partitions",
+        "schedule": crontab(hour=0, minute=1),
+        "options": {"queue": "etl.crypto"}
+    },
+    # Rollup repair - Every day at 00:02, before the metrics read the daily bars
+    "repair-price-bars": {
+        "task": "etl.repair_bars",
+        "schedule": crontab(hour=0, minute=2),
+        "options": {"queue": "etl.crypto"}
+    },
     # Daily metrics - Every day at 00:05
     "calculate-crypto-metrics": {
         "task": "etl.calculate_metrics",
@@ -86,6 +106,8 @@ celery_app.conf.beat_schedule = {
     }
 }
 
+instrument_celery(port=settings.worker_metrics_port)
+
 celery_app.conf.update(
     # Serialization
     task_serializer="json",
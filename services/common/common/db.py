@@ -1,6 +1,10 @@
 from .config import settings
+# Absolute on purpose: collectors register once, even when this package is also imported as services.common.common
+from common.metrics import instrument_engine, instrument_sessions
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 db_url = settings.db_url
 
@@ -13,4 +17,41 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Same database through asyncpg, used by the async API endpoints
+async_db_url = make_url(db_url).set(drivername="postgresql+asyncpg")
+
+async_engine = create_async_engine(
+    async_db_url,
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    connect_args={
+        # SQLAlchemy's per-connection statement cache and asyncpg's own
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        "statement_cache_size": settings.db_statement_cache_size,
+    },
+)
+
+class _AsyncBackingSession(Session):
+    """Sync Session behind each AsyncSession, a class of its own so it can be instrumented"""
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=_AsyncBackingSession,
+)
+
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+instrument_sessions(SessionLocal)
+instrument_sessions(_AsyncBackingSession)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,215 @@
+"""
+Columnar export
+Streams prices or daily_metrics out of Postgres through a server-side
+cursor and encodes each fixed-size batch as it arrives (Arrow IPC stream,
+Parquet row groups or CSV), so memory stays flat whatever the row count.
+Arrow and Parquet need the optional pyarrow package.
+
+Usage:
+    python -m common.export prices btc.parquet --format parquet --symbols BTCUSDT --start 2024-01-01
+"""
+import argparse
+import csv
+import io
+import sys
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+from .logging_config import setup_logging
+
+logger = setup_logging("export")
+
+FORMATS = ("arrow", "parquet", "csv")
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "csv": "text/csv",
+}
+EXTENSIONS = {"arrow": "arrows", "parquet": "parquet", "csv": "csv"}
+
+# dataset -> (table, time column, [(column, arrow type name)])
+DATASETS: Dict[str, Tuple[str, str, List[Tuple[str, str]]]] = {
+    "prices": ("prices", "ts", [
+        ("symbol", "string"), ("ts", "timestamp"), ("open", "float64"), ("high", "float64"),
+        ("low", "float64"), ("close", "float64"), ("volume", "float64"), ("source", "string"),
+    ]),
+    "daily_metrics": ("daily_metrics", "date", [
+        ("symbol", "string"), ("date", "date32"), ("ma_20", "float64"), ("ma_50", "float64"),
+        ("rsi_14", "float64"), ("volatility_20", "float64"), ("daily_return", "float64"),
+    ]),
+}
+
+def export_query(
+    dataset: str,
+    symbols: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Tuple[TextClause, Dict[str, Any]]:
+    """SELECT for a dataset, ordered like its (symbol_id, time) unique index so no sort is needed"""
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset {dataset}, expected one of {', '.join(DATASETS)}")
+    table, time_column, columns = DATASETS[dataset]
+
+    select_list = ", ".join("s.symbol" if name == "symbol" else f"t.{name}" for name, _ in columns)
+    conditions = ["true"]
+    params: Dict[str, Any] = {}
+    if symbols:
+        conditions.append("s.symbol = ANY(CAST(:symbols AS text[]))")
+        params["symbols"] = list(symbols)
+    if start:
+        conditions.append(f"t.{time_column} >= :start")
+        params["start"] = start
+    if end:
+        conditions.append(f"t.{time_column} < :end")
+        params["end"] = end
+
+    sql = f"""
+        SELECT {select_list}
+        FROM {table} t
+        JOIN symbols s ON s.id = t.symbol_id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY t.symbol_id, t.{time_column}
+    """
+    return text(sql), params
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+class CsvWriter:
+    def __init__(self, columns: List[Tuple[str, str]]):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._writer.writerow([name for name, _ in columns])
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        self._writer.writerows(
+            [value.isoformat() if isinstance(value, (datetime, date)) else value for value in row]
+            for row in rows
+        )
+        return self._drain()
+
+    def close(self) -> bytes:
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+class ArrowWriter:
+    """Arrow IPC stream or Parquet, one record batch / row group per batch"""
+
+    def __init__(self, columns: List[Tuple[str, str]], fmt: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(f"The {fmt} format needs pyarrow (pip install pyarrow)")
+
+        types = {
+            "string": pa.string(),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+            "float64": pa.float64(),
+            "date32": pa.date32(),
+        }
+        self._pa = pa
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self._sink = _ChunkSink()
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(self._sink, self.schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        if rows:
+            arrays = [
+                self._pa.array(list(values), type=field.type)
+                for values, field in zip(zip(*rows), self.schema)
+            ]
+            self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+def make_writer(dataset: str, fmt: str):
+    """Encoder for `fmt`; raises ValueError/RuntimeError before any data is read"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt}, expected one of {', '.join(FORMATS)}")
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset {dataset}, expected one of {', '.join(DATASETS)}")
+    columns = DATASETS[dataset][2]
+    return CsvWriter(columns) if fmt == "csv" else ArrowWriter(columns, fmt)
+
+def iter_export(
+    conn,
+    dataset: str,
+    fmt: str,
+    symbols: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 50_000,
+) -> Iterator[bytes]:
+    """Encoded chunks of a dataset read through a server-side cursor on a sync Connection"""
+    writer = make_writer(dataset, fmt)
+    sql, params = export_query(dataset, symbols, start, end)
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(sql, params)
+    for rows in result.partitions():
+        yield writer.write(rows)
+    yield writer.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Export prices or daily metrics as Arrow, Parquet or CSV")
+    parser.add_argument("dataset", choices=list(DATASETS))
+    parser.add_argument("output", help="File to write, '-' for stdout")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--symbols", default=None, help="Comma separated, default all")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    from .db import engine
+
+    symbols = [symbol.strip() for symbol in args.symbols.split(",")] if args.symbols else None
+    started = time.perf_counter()
+    written = 0
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        with engine.connect() as conn:
+            for chunk in iter_export(conn, args.dataset, args.format, symbols, args.start, args.end, args.batch_size):
+                out.write(chunk)
+                written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    logger.info(f"Exported {args.dataset} as {args.format}: {written / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Latest prices
+Redis hash per symbol holding its newest OHLCV tick, so "what is the price
+now" never reaches Postgres. Every write goes through one Lua script that
+compares timestamps, which makes concurrent ETL workers (and API fallbacks
+filling a missing entry) safe in any order: an older tick never overwrites
+a newer one. Symbols the database has no prices for get a short-lived
+marker instead, so polling them does not reach Postgres either.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import redis
+import redis.asyncio
+
+from .config import settings
+from .logging_config import setup_logging
+from .redis_client import get_async_redis, get_redis
+
+logger = setup_logging("latest-prices")
+
+FIELDS = ("ts", "open", "high", "low", "close", "volume", "source")
+
+# KEYS[1] = hash, ARGV[1] = tick time in epoch microseconds, ARGV[2..] = field/value pairs.
+# An equal timestamp still writes, matching the upsert of a corrected tick in prices.
+_SET_IF_NEWER = """
+local current = redis.call('HGET', KEYS[1], 'epoch_us')
+if current and tonumber(current) > tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'epoch_us', ARGV[1], unpack(ARGV, 2))
+return 1
+"""
+
+def latest_key(symbol: str) -> str:
+    return f"latest:{symbol}"
+
+def empty_key(symbol: str) -> str:
+    return f"latest:empty:{symbol}"
+
+def _utc(ts: datetime) -> datetime:
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+def _script_args(tick: Dict[str, Any]) -> List[Any]:
+    ts = _utc(tick["ts"])
+    args: List[Any] = [int(ts.timestamp() * 1_000_000)]
+    for field in FIELDS:
+        value = ts.isoformat() if field == "ts" else tick.get(field)
+        args += [field, "" if value is None else value]
+    return args
+
+def _newest(ticks: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Newest tick of every symbol, so each symbol costs one script call"""
+    newest: Dict[str, Dict[str, Any]] = {}
+    for tick in ticks:
+        current = newest.get(tick["symbol"])
+        if current is None or _utc(tick["ts"]) >= _utc(current["ts"]):
+            newest[tick["symbol"]] = tick
+    return newest
+
+def _decode(values: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    if not values:
+        return None
+    return {field: values.get(field) or None for field in FIELDS}
+
+def update_latest(ticks: Iterable[Dict[str, Any]], client: Optional[redis.Redis] = None) -> int:
+    """
+    Record committed ticks, given as dicts with symbol, ts and the OHLCV
+    columns of prices. Returns how many symbols moved forward; Redis
+    being down only costs the API a database fallback.
+    """
+    newest = _newest(ticks)
+    if not newest:
+        return 0
+    try:
+        client = client or get_redis()
+        script = client.register_script(_SET_IF_NEWER)
+        pipe = client.pipeline(transaction=False)
+        for symbol, tick in newest.items():
+            script(keys=[latest_key(symbol)], args=_script_args(tick), client=pipe)
+        return sum(pipe.execute())
+    except redis.RedisError as e:
+        logger.warning(f"Could not update latest prices for {len(newest)} symbols: {e}")
+        return 0
+
+async def update_latest_async(
+    ticks: Iterable[Dict[str, Any]], client: Optional[redis.asyncio.Redis] = None
+) -> int:
+    """update_latest() for the asyncio API"""
+    newest = _newest(ticks)
+    if not newest:
+        return 0
+    try:
+        client = client or get_async_redis()
+        script = client.register_script(_SET_IF_NEWER)
+        pipe = client.pipeline(transaction=False)
+        for symbol, tick in newest.items():
+            await script(keys=[latest_key(symbol)], args=_script_args(tick), client=pipe)
+        return sum(await pipe.execute())
+    except redis.RedisError as e:
+        logger.warning(f"Could not update latest prices for {len(newest)} symbols: {e}")
+        return 0
+
+async def get_latest_async(
+    symbols: List[str], client: Optional[redis.asyncio.Redis] = None
+) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+    """Latest tick of each symbol (None where missing), None when Redis is unreachable"""
+    try:
+        pipe = (client or get_async_redis()).pipeline(transaction=False)
+        for symbol in symbols:
+            pipe.hgetall(latest_key(symbol))
+        values = await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Latest prices unavailable: {e}")
+        return None
+    return {symbol: _decode(value) for symbol, value in zip(symbols, values)}
+
+async def get_empty_async(symbols: List[str], client: Optional[redis.asyncio.Redis] = None) -> Set[str]:
+    """Symbols recently found to have no prices (none when Redis is unreachable)"""
+    if not symbols:
+        return set()
+    try:
+        values = await (client or get_async_redis()).mget([empty_key(symbol) for symbol in symbols])
+    except redis.RedisError as e:
+        logger.warning(f"Empty-symbol markers unavailable: {e}")
+        return set()
+    return {symbol for symbol, value in zip(symbols, values) if value is not None}
+
+async def mark_empty_async(symbols: Iterable[str], client: Optional[redis.asyncio.Redis] = None):
+    """
+    Remember symbols without prices for settings.latest_empty_ttl. Their
+    first tick lands in the latest hash, which is read before the marker,
+    so the TTL only bounds how long a missed hash write hides a price.
+    """
+    symbols = list(symbols)
+    if not symbols:
+        return
+    try:
+        pipe = (client or get_async_redis()).pipeline(transaction=False)
+        for symbol in symbols:
+            pipe.set(empty_key(symbol), 1, ex=settings.latest_empty_ttl)
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not mark {len(symbols)} symbols without prices: {e}")
@@ -0,0 +1,42 @@
+"""
+Live feed
+Redis pub/sub channel per symbol carrying every committed tick as JSON.
+The ETL publishes after commit; each API process holds one subscriber and
+fans messages out to its SSE and WebSocket clients.
+"""
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+import redis
+
+from .logging_config import setup_logging
+from .redis_client import get_redis
+
+logger = setup_logging("live-feed")
+
+CHANNEL_PREFIX = "prices:live:"
+
+def channel_name(symbol: str) -> str:
+    return f"{CHANNEL_PREFIX}{symbol}"
+
+def encode_tick(tick: Dict[str, Any]) -> str:
+    ts = tick["ts"]
+    if isinstance(ts, datetime):
+        ts = (ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)).isoformat()
+    return json.dumps({**tick, "ts": ts})
+
+def publish_ticks(ticks: Iterable[Dict[str, Any]], client: Optional[redis.Redis] = None) -> int:
+    """Publish committed ticks to their symbol channels; returns messages sent"""
+    ticks = list(ticks)
+    if not ticks:
+        return 0
+    try:
+        pipe = (client or get_redis()).pipeline(transaction=False)
+        for tick in ticks:
+            pipe.publish(channel_name(tick["symbol"]), encode_tick(tick))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish {len(ticks)} ticks to the live feed: {e}")
+        return 0
+    return len(ticks)
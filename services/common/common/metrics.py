@@ -0,0 +1,161 @@
+"""
+Metrics
+Prometheus metrics shared by every service: fetch latency and errors per
+source, Celery task runtimes and retries, database statement and commit
+timings, and API request latency per route.
+
+Prefork Celery workers and multi-process uvicorn need PROMETHEUS_MULTIPROC_DIR
+set (to an empty, writable directory) before any process starts; each child
+then writes its samples there and the scrape endpoint merges them.
+
+Import it as common.metrics only: a second copy would register every
+collector again, which prometheus_client rejects.
+"""
+import os
+import shutil
+import time
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from sqlalchemy import event
+
+from .logging_config import setup_logging
+
+logger = setup_logging("metrics")
+
+# Sub-millisecond statements up to slow batch writes
+_DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_TASK_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0)
+# Broker hops take milliseconds, provider timestamps can trail by minutes
+_LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0, 3600.0)
+
+FETCH_SECONDS = Histogram(
+    "marketflow_fetch_seconds", "Time spent in one fetcher call", ["source", "operation"]
+)
+FETCH_ERRORS = Counter(
+    "marketflow_fetch_errors_total", "Fetcher calls that raised", ["source", "operation", "error"]
+)
+TASK_SECONDS = Histogram(
+    "marketflow_task_seconds", "Celery task runtime by final state", ["task", "state"],
+    buckets=_TASK_BUCKETS
+)
+TASK_RETRIES = Counter("marketflow_task_retries_total", "Celery task retries", ["task"])
+TASK_FAILURES = Counter("marketflow_task_failures_total", "Celery tasks that failed", ["task", "error"])
+DB_STATEMENT_SECONDS = Histogram(
+    "marketflow_db_statement_seconds", "Database statement time", ["engine", "operation"],
+    buckets=_DB_BUCKETS
+)
+DB_COMMIT_SECONDS = Histogram(
+    "marketflow_db_commit_seconds", "Session commit time, flush included", buckets=_DB_BUCKETS
+)
+PIPELINE_LAG_SECONDS = Histogram(
+    "marketflow_pipeline_lag_seconds", "Time a tick spent in one pipeline hop (see common.tracing)",
+    ["asset_type", "queue", "hop"], buckets=_LAG_BUCKETS
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "marketflow_http_request_seconds", "API request latency", ["method", "route", "status"]
+)
+
+def _multiprocess_dir():
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+def registry() -> CollectorRegistry:
+    """Registry to expose: every process' samples in multiprocess mode, else this process'"""
+    if _multiprocess_dir():
+        merged = CollectorRegistry()
+        multiprocess.MultiProcessCollector(merged)
+        return merged
+    return REGISTRY
+
+def render() -> Tuple[bytes, str]:
+    """Body and content type of a scrape"""
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
+
+def instrument_engine(engine, name: str):
+    """Time every statement of a (sync) Engine; pass async_engine.sync_engine for asyncio"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        DB_STATEMENT_SECONDS.labels(name, operation).observe(time.perf_counter() - started)
+
+def instrument_sessions(target):
+    """Time Session.commit() (flush included) of a sessionmaker or Session subclass"""
+
+    @event.listens_for(target, "before_commit")
+    def _started(session):
+        session.info["metrics_commit_started"] = time.perf_counter()
+
+    @event.listens_for(target, "after_commit")
+    def _finished(session):
+        started = session.info.pop("metrics_commit_started", None)
+        if started is not None:
+            DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
+
+def instrument_celery(port: int = 0):
+    """
+    Record task runtimes, retries and failures through Celery signals and,
+    when `port` is set, serve /metrics from the worker's main process.
+    """
+    from celery.signals import (
+        task_failure,
+        task_postrun,
+        task_prerun,
+        task_retry,
+        worker_init,
+        worker_process_shutdown,
+    )
+
+    started = {}
+
+    @task_prerun.connect(weak=False)
+    def _task_started(task_id=None, task=None, **kwargs):
+        started[task_id] = time.perf_counter()
+
+    @task_postrun.connect(weak=False)
+    def _task_finished(task_id=None, task=None, state=None, **kwargs):
+        began = started.pop(task_id, None)
+        if began is not None and task is not None:
+            TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - began)
+
+    @task_retry.connect(weak=False)
+    def _task_retried(sender=None, **kwargs):
+        TASK_RETRIES.labels(getattr(sender, "name", "unknown")).inc()
+
+    @task_failure.connect(weak=False)
+    def _task_failed(sender=None, exception=None, **kwargs):
+        TASK_FAILURES.labels(getattr(sender, "name", "unknown"), type(exception).__name__).inc()
+
+    @worker_init.connect(weak=False)
+    def _serve(**kwargs):
+        if not port:
+            return
+        directory = _multiprocess_dir()
+        if directory:
+            # Samples of a previous run would be merged into this one
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(directory, exist_ok=True)
+        start_http_server(port, registry=registry())
+        logger.info(f"Serving worker metrics on :{port}" + (" (multiprocess)" if directory else ""))
+
+    @worker_process_shutdown.connect(weak=False)
+    def _child_exited(pid=None, **kwargs):
+        if _multiprocess_dir():
+            multiprocess.mark_process_dead(pid or os.getpid())
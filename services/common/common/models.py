@@ -1,7 +1,9 @@
-from sqlalchemy import Integer, String, Float, DateTime, Boolean, ForeignKey, UniqueConstraint, Date, Text
+from sqlalchemy import BigInteger, Integer, String, Float, DateTime, Boolean, ForeignKey, UniqueConstraint, Date, Text, LargeBinary, event
 from sqlalchemy.orm import relationship, DeclarativeBase, Mapped, mapped_column
 from datetime import datetime, timezone, date
 from typing import List, Optional
+from .config import settings
+from .partitions import create_default_partition, ensure_partitions
 
 class Base(DeclarativeBase):
     pass
@@ -23,26 +25,59 @@ class Symbol(Base):
     metrics: Mapped[List["DailyMetric"]] = relationship("DailyMetric", back_populates="symbol_rel", cascade="all, delete-orphan")
 
 class Price(Base):
-    """Time series price data"""
+    """Time series price data, range-partitioned by month on ts (see common.partitions)"""
     __tablename__ = "prices"
     __table_args__ = (
         UniqueConstraint("symbol_id", "ts", name="uq_symbol_ts"),
+        {"postgresql_partition_by": "RANGE (ts)"},
     )
     
-    index: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Keys of a partitioned table must contain the partition column
+    index: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     symbol_id: Mapped[int] = mapped_column(ForeignKey("symbols.id", ondelete="CASCADE"), nullable=False)
-    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
+    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, index=True, nullable=False)
     open: Mapped[Optional[float]] = mapped_column(Float)
     high: Mapped[Optional[float]] = mapped_column(Float)
     low: Mapped[Optional[float]] = mapped_column(Float)
     close: Mapped[float] = mapped_column(Float, nullable=False)
     volume: Mapped[Optional[float]] = mapped_column(Float)
     source: Mapped[str] = mapped_column(String(30), nullable=False)
+    # Provider OHLC bar (kline, history); otherwise open/high/low are snapshot stats such as 24h ranges
+    is_bar: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
     inserted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     
     # Relationships
     symbol_rel: Mapped["Symbol"] = relationship("Symbol", back_populates="prices")
 
+@event.listens_for(Price.__table__, "after_create")
+def _create_price_partitions(target, connection, **kw):
+    create_default_partition(connection)
+    ensure_partitions(connection, settings.prices_partition_months_ahead)
+
+class PriceBarMixin:
+    """OHLCV bar columns shared by the rollup tables, keyed by bucket start"""
+    symbol_id: Mapped[int] = mapped_column(ForeignKey("symbols.id", ondelete="CASCADE"), primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    open: Mapped[float] = mapped_column(Float, nullable=False)
+    high: Mapped[float] = mapped_column(Float, nullable=False)
+    low: Mapped[float] = mapped_column(Float, nullable=False)
+    close: Mapped[float] = mapped_column(Float, nullable=False)
+    volume: Mapped[Optional[float]] = mapped_column(Float)
+    ticks: Mapped[int] = mapped_column(Integer, nullable=False)  # Raw prices rows in the bar
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+class PriceBar1m(PriceBarMixin, Base):
+    """1-minute bars rolled up from prices"""
+    __tablename__ = "price_bars_1m"
+
+class PriceBar1h(PriceBarMixin, Base):
+    """1-hour bars rolled up from price_bars_1m"""
+    __tablename__ = "price_bars_1h"
+
+class PriceBar1d(PriceBarMixin, Base):
+    """1-day (UTC) bars rolled up from price_bars_1h"""
+    __tablename__ = "price_bars_1d"
+
 class DailyMetric(Base):
     """Calculated daily metrics like moving averages"""
     __tablename__ = "daily_metrics"
@@ -63,6 +98,53 @@ class DailyMetric(Base):
     # Relationships
     symbol_rel: Mapped["Symbol"] = relationship("Symbol", back_populates="metrics")
 
+class IndicatorState(Base):
+    """Streaming indicator values and their serialized running state, one row per symbol"""
+    __tablename__ = "indicator_state"
+    
+    symbol_id: Mapped[int] = mapped_column(ForeignKey("symbols.id", ondelete="CASCADE"), primary_key=True)
+    last_ts: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    last_close: Mapped[Optional[float]] = mapped_column(Float)
+    ma_20: Mapped[Optional[float]] = mapped_column(Float)
+    ma_50: Mapped[Optional[float]] = mapped_column(Float)
+    rsi_14: Mapped[Optional[float]] = mapped_column(Float)
+    volatility_20: Mapped[Optional[float]] = mapped_column(Float)
+    state: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+class BackfillChunk(Base):
+    """Checkpoint of one historical backfill chunk (symbol x time range)"""
+    __tablename__ = "backfill_chunks"
+    __table_args__ = (
+        UniqueConstraint("symbol", "interval", "chunk_start", name="uq_backfill_chunk"),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(50), nullable=False)
+    asset_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    interval: Mapped[str] = mapped_column(String(10), nullable=False)
+    chunk_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    chunk_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False, index=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows: Mapped[Optional[int]] = mapped_column(Integer)
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+class PipelineTrace(Base):
+    """Stage timings of a sampled tick, from the provider's timestamp to the ETL commit"""
+    __tablename__ = "pipeline_traces"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(50), nullable=False)
+    asset_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    queue: Mapped[str] = mapped_column(String(50), nullable=False)
+    source_ts: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    fetched_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    etl_started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    committed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
 class ETLJob(Base):
     """Tracking ETL job statuses"""
     __tablename__ = "etl_jobs"
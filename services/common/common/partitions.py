@@ -0,0 +1,115 @@
+"""
+Prices partitions
+prices is range-partitioned on ts, one partition per UTC month, plus a
+DEFAULT partition so a write never fails for lack of a partition. The
+maintenance task creates months ahead of time and detaches or drops months
+older than the retention window.
+"""
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from .logging_config import setup_logging
+
+logger = setup_logging("partitions")
+
+PARENT = "prices"
+DEFAULT_PARTITION = f"{PARENT}_default"
+_NAME = re.compile(rf"^{PARENT}_y(\d{{4}})m(\d{{2}})$")
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+def create_default_partition(conn):
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT"))
+
+def list_partitions(conn) -> List[date]:
+    """Months that currently have an attached partition"""
+    names = conn.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:parent AS regclass)
+            """
+        ),
+        {"parent": PARENT}
+    ).scalars()
+    months = []
+    for name in names:
+        match = _NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+def create_partition(conn, month: date) -> bool:
+    """
+    Attach the partition for `month`, moving any rows the DEFAULT partition
+    already holds for that range. Returns False if it already existed.
+    """
+    if month in list_partitions(conn):
+        return False
+    name, lower, upper = partition_name(month), _bound(month), _bound(add_months(month, 1))
+
+    # Build it detached so the rows parked in DEFAULT can be moved first,
+    # ATTACH then only has to validate the (now empty) range in DEFAULT
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = conn.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE ts >= {lower} AND ts < {upper}
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        )
+    ).rowcount
+    conn.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})"))
+
+    logger.info(f"Created partition {name}" + (f" ({moved} rows moved from {DEFAULT_PARTITION})" if moved else ""))
+    return True
+
+def ensure_partitions(conn, months_ahead: int, now: Optional[datetime] = None) -> List[str]:
+    """Make sure the current month and the next `months_ahead` months have partitions"""
+    current = month_start(now or datetime.now(timezone.utc))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if create_partition(conn, month):
+            created.append(partition_name(month))
+    return created
+
+def expire_partitions(conn, retention_months: int, drop: bool = False, now: Optional[datetime] = None) -> List[str]:
+    """
+    Detach (or drop) partitions that end before the retention window.
+    retention_months <= 0 keeps everything.
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+    expired = []
+    for month in list_partitions(conn):
+        if add_months(month, 1) > cutoff:
+            continue
+        name = partition_name(month)
+        conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+        logger.info(f"{'Dropped' if drop else 'Detached'} expired partition {name}")
+        expired.append(name)
+    return expired
@@ -0,0 +1,173 @@
+"""
+Distributed rate limiting
+Token buckets kept in Redis, one per data source, so every ingestion
+process and host draws from the same request-weight budget.
+"""
+import asyncio
+import math
+import time
+from typing import Dict, Mapping, Optional
+
+import redis
+from redis.commands.core import Script
+
+from .config import settings
+from .exceptions import RateLimitError
+from .logging_config import setup_logging
+from .redis_client import get_redis
+
+logger = setup_logging("rate-limit")
+
+# KEYS: bucket hash, block key  ARGV: capacity, refill per ms, weight
+# Returns 0 when the weight was taken, else the milliseconds to wait.
+_TOKEN_BUCKET = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return blocked
+end
+
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local weight = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= weight then
+    tokens = tokens - weight
+else
+    wait = math.ceil((weight - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 1000)
+return wait
+"""
+
+class RateLimiter:
+    """Token bucket of `per_minute` request weight for one source, shared via Redis"""
+
+    def __init__(
+        self,
+        source: str,
+        per_minute: int,
+        weight_header: Optional[str] = None,
+        weight_limit: Optional[int] = None,
+        client: Optional[redis.Redis] = None,
+    ):
+        self.source = source
+        self.capacity = per_minute
+        self.refill_per_ms = per_minute / 60000.0
+        self.weight_header = weight_header      # Header reporting weight used this minute
+        self.weight_limit = weight_limit        # Provider's own limit for that header
+        self._client = client
+        self._script: Optional[Script] = None
+        self._bucket_key = f"ratelimit:{source}:bucket"
+        self._block_key = f"ratelimit:{source}:blocked"
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    def try_acquire(self, weight: int = 1) -> float:
+        """Take `weight` if available; returns 0.0 or the seconds to wait. Fails open without Redis."""
+        weight = min(weight, self.capacity)
+        try:
+            script = self._script
+            if script is None:
+                script = self._script = self.client.register_script(_TOKEN_BUCKET)
+            wait_ms = script(
+                keys=[self._bucket_key, self._block_key],
+                args=[self.capacity, self.refill_per_ms, weight],
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Rate limiter for {self.source} unavailable, not throttling: {e}")
+            return 0.0
+        return int(wait_ms) / 1000.0
+
+    def acquire(self, weight: int = 1, max_wait: Optional[float] = None):
+        """Block until `weight` is granted; raise RateLimitError if that takes longer than max_wait"""
+        max_wait = settings.rate_limit_max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(weight)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitError(self.source, retry_after=math.ceil(wait))
+            time.sleep(wait)
+
+    async def acquire_async(self, weight: int = 1, max_wait: Optional[float] = None):
+        """acquire() for coroutines, sleeps without blocking the event loop"""
+        max_wait = settings.rate_limit_max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(weight)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitError(self.source, retry_after=math.ceil(wait))
+            await asyncio.sleep(wait)
+
+    def block_for(self, seconds: float):
+        """Stop every process from calling this source for `seconds`"""
+        try:
+            self.client.set(self._block_key, 1, px=max(int(seconds * 1000), 1))
+        except redis.RedisError as e:
+            logger.warning(f"Could not record {self.source} back-off: {e}")
+        logger.warning(f"Backing off {self.source} for {seconds:.0f}s")
+
+    def observe(self, status_code: int, headers: Mapping[str, str]):
+        """
+        Feed a provider response back into the limiter. Honours Retry-After on
+        429/418 (raising RateLimitError) and pauses early when the provider's
+        used-weight header gets close to its limit.
+        """
+        if status_code in (418, 429):
+            retry_after = int(headers.get("Retry-After", 60))
+            self.block_for(retry_after)
+            raise RateLimitError(self.source, retry_after=retry_after)
+
+        if self.weight_header and self.weight_limit and self.weight_header in headers:
+            used = int(headers[self.weight_header])
+            if used >= 0.9 * self.weight_limit:
+                # Weight windows reset on the minute boundary
+                self.block_for(max(60 - time.time() % 60, 1))
+
+class NoRateLimit(RateLimiter):
+    """Limiter of a source without a budget (local stand-ins); never waits and never touches Redis"""
+
+    def __init__(self, source: str):
+        super().__init__(source, per_minute=0)
+
+    def try_acquire(self, weight: int = 1) -> float:
+        return 0.0
+
+    def observe(self, status_code: int, headers: Mapping[str, str]):
+        pass
+
+    def block_for(self, seconds: float):
+        pass
+
+_limiters: Dict[str, RateLimiter] = {}
+
+def get_rate_limiter(source: str) -> RateLimiter:
+    """Shared limiter per provider (all Yahoo fetchers draw from one budget)"""
+    if source not in _limiters:
+        if source == "binance":
+            _limiters[source] = RateLimiter(
+                source,
+                settings.rate_limit_binance_per_min,
+                weight_header="X-MBX-USED-WEIGHT-1M",
+                weight_limit=6000,
+            )
+        elif source == "yahoo":
+            _limiters[source] = RateLimiter(source, settings.rate_limit_yahoo_per_min)
+        else:
+            raise ValueError(f"No rate limit configured for {source}")
+    return _limiters[source]
@@ -0,0 +1,37 @@
+import redis
+import redis.asyncio
+from .config import settings
+
+_client = None
+_async_client = None
+
+def get_redis() -> redis.Redis:
+    """Process-wide Redis client (redis-py resets its pool after a fork)"""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+        )
+    return _client
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """Process-wide asyncio Redis client, bound to the running event loop"""
+    global _async_client
+    if _async_client is None:
+        _async_client = redis.asyncio.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+        )
+    return _async_client
+
+async def close_async_redis():
+    """Release the asyncio client's connections (call on event loop shutdown)"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List
 from enum import Enum
 
@@ -15,6 +15,19 @@ class DataSource(str, Enum):
     YAHOO = "yahoo"
     ALPHA_VANTAGE = "alpha_vantage"
 
+class CandleInterval(str, Enum):
+    M1 = "1m"
+    M5 = "5m"
+    M15 = "15m"
+    H1 = "1h"
+    H4 = "4h"
+    D1 = "1d"
+
+    @property
+    def delta(self) -> timedelta:
+        amount, unit = int(self.value[:-1]), self.value[-1]
+        return timedelta(**{{"m": "minutes", "h": "hours", "d": "days"}[unit]: amount})
+
 # Request Schemas
 class PriceHistoryRequest(BaseModel):
     symbol: str
@@ -22,6 +35,10 @@ class PriceHistoryRequest(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
 
+class MultiPriceRequest(BaseModel):
+    symbols: List[str] = Field(min_length=1, max_length=500)
+    limit: int = Field(default=20, le=1000, ge=1)
+
 # Response Schemas
 class SymbolResponse(BaseModel):
     id: int
@@ -43,6 +60,32 @@ class PriceResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class LatestPriceResponse(BaseModel):
+    symbol: str
+    ts: datetime
+    open: Optional[float]
+    high: Optional[float]
+    low: Optional[float]
+    close: float
+    volume: Optional[float]
+    source: Optional[str]
+
+class CandleResponse(BaseModel):
+    ts: datetime  # Bucket start
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: Optional[float]
+
+class IndicatorResponse(BaseModel):
+    last_ts: Optional[datetime]
+    last_close: Optional[float]
+    ma_20: Optional[float]
+    ma_50: Optional[float]
+    rsi_14: Optional[float]
+    volatility_20: Optional[float]
+
 class PriceHistoryResponse(BaseModel):
     symbol: str
     count: int
@@ -0,0 +1,83 @@
+"""
+Pipeline tracing
+Every payload carries a `trace` dict of epoch-second stamps, one per stage
+it passes: fetched (BaseFetcher), published (handed to the broker),
+etl_started (an ETL task picked it up) and committed. With the payload's
+own `ts` as the source time, the gaps between stamps show whether the
+provider, the broker, the worker pool or Postgres holds a tick back.
+
+Stamps come from different hosts, so lags are only as exact as their clocks.
+"""
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+# Absolute on purpose: collectors register once, even when this package is also imported as services.common.common
+from common.metrics import PIPELINE_LAG_SECONDS
+
+STAGES = ("fetched", "published", "etl_started", "committed")
+
+# hop -> (from, to); "source" is the tick's own timestamp
+HOPS = {
+    "fetch": ("source", "fetched"),
+    "publish": ("fetched", "published"),
+    "queue": ("published", "etl_started"),
+    "write": ("etl_started", "committed"),
+    "total": ("source", "committed"),
+}
+
+def stamp(payloads: Iterable[Dict[str, Any]], stage: str, at: Optional[float] = None):
+    """Record that `payloads` reached `stage` (now, unless `at` is given)"""
+    at = at or time.time()
+    for payload in payloads:
+        payload.setdefault("trace", {})[stage] = at
+
+def _source_time(ts) -> Optional[float]:
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if not isinstance(ts, datetime):
+        return None
+    return (ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)).timestamp()
+
+def stage_times(payload: Dict[str, Any]) -> Dict[str, float]:
+    """Epoch seconds of every stage the payload went through, source included"""
+    times = dict(payload.get("trace") or {})
+    source = _source_time(payload.get("ts"))
+    if source is not None:
+        times["source"] = source
+    return times
+
+def observe_lags(payloads: Iterable[Dict[str, Any]], asset_type: str, queue: str):
+    """Feed the per-hop lag histograms with every payload's stamps"""
+    for payload in payloads:
+        times = stage_times(payload)
+        for hop, (start, end) in HOPS.items():
+            if start in times and end in times:
+                PIPELINE_LAG_SECONDS.labels(asset_type, queue, hop).observe(max(times[end] - times[start], 0.0))
+
+def sample(payloads: Iterable[Dict[str, Any]], rate: float) -> List[Dict[str, Any]]:
+    """The fraction `rate` of payloads whose full timings are kept"""
+    if rate <= 0:
+        return []
+    return [payload for payload in payloads if rate >= 1 or random.random() < rate]
+
+def trace_rows(payloads: Iterable[Dict[str, Any]], asset_type: str, queue: str) -> List[Dict[str, Any]]:
+    """pipeline_traces rows for `payloads`"""
+    def at(times: Dict[str, float], stage: str) -> Optional[datetime]:
+        return datetime.fromtimestamp(times[stage], tz=timezone.utc) if stage in times else None
+
+    rows = []
+    for payload in payloads:
+        times = stage_times(payload)
+        rows.append({
+            "symbol": payload["symbol"],
+            "asset_type": asset_type,
+            "queue": queue,
+            "source_ts": at(times, "source"),
+            "fetched_at": at(times, "fetched"),
+            "published_at": at(times, "published"),
+            "etl_started_at": at(times, "etl_started"),
+            "committed_at": at(times, "committed"),
+        })
+    return rows
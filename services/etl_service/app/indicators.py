@@ -0,0 +1,197 @@
+"""
+ETL Service - Streaming Indicators
+O(1) per-tick SMA, Wilder RSI and rolling volatility kept per symbol
+"""
+import math
+import struct
+from array import array
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from common.models import IndicatorState
+
+MA_SHORT = 20
+MA_LONG = 50
+RSI_PERIOD = 14
+RESYNC_EVERY = 1000  # Recompute running sums from the window to cancel float drift
+
+# count, head, rsi_count, sum_short, sum_long, mean_short, m2_short, avg_gain, avg_loss, last_close
+_HEADER = struct.Struct("<QHQddddddd")
+
+class StreamingIndicators:
+    """Running-sum SMA20/SMA50, Wilder-smoothed RSI14 and Welford volatility over 20 ticks"""
+
+    def __init__(self):
+        self.window = array("d", [0.0] * MA_LONG)  # Ring buffer of the last MA_LONG closes
+        self.head = 0                               # Next slot to write
+        self.count = 0
+        self.rsi_count = 0
+        self.sum_short = 0.0
+        self.sum_long = 0.0
+        self.mean_short = 0.0
+        self.m2_short = 0.0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.last_close: Optional[float] = None
+
+    def _ago(self, k: int) -> float:
+        """Close k ticks before the latest one"""
+        return self.window[(self.head - 1 - k) % MA_LONG]
+
+    def update(self, close: float):
+        """Fold one close into every indicator in constant time"""
+        leaving_long = self.window[self.head] if self.count >= MA_LONG else 0.0
+        leaving_short = self._ago(MA_SHORT - 1) if self.count >= MA_SHORT else None
+
+        self.sum_long += close - leaving_long
+        self.sum_short += close - (leaving_short or 0.0)
+
+        # Welford: grow until the window is full, then slide
+        if leaving_short is None:
+            n = self.count + 1
+            delta = close - self.mean_short
+            self.mean_short += delta / n
+            self.m2_short += delta * (close - self.mean_short)
+        else:
+            old_mean = self.mean_short
+            self.mean_short += (close - leaving_short) / MA_SHORT
+            self.m2_short += (close - leaving_short) * (close - self.mean_short + leaving_short - old_mean)
+            self.m2_short = max(self.m2_short, 0.0)
+
+        # Wilder smoothing, seeded with the simple average of the first RSI_PERIOD changes
+        if self.last_close is not None:
+            change = close - self.last_close
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            self.rsi_count += 1
+            n = min(self.rsi_count, RSI_PERIOD)
+            self.avg_gain += (gain - self.avg_gain) / n
+            self.avg_loss += (loss - self.avg_loss) / n
+
+        self.window[self.head] = close
+        self.head = (self.head + 1) % MA_LONG
+        self.count += 1
+        self.last_close = close
+
+        if self.count % RESYNC_EVERY == 0:
+            self._resync()
+
+    def _resync(self):
+        short = [self._ago(k) for k in range(min(self.count, MA_SHORT))]
+        self.sum_short = math.fsum(short)
+        self.sum_long = math.fsum(self._ago(k) for k in range(min(self.count, MA_LONG)))
+        self.mean_short = self.sum_short / len(short)
+        self.m2_short = math.fsum((x - self.mean_short) ** 2 for x in short)
+
+    @property
+    def ma_20(self) -> Optional[float]:
+        return self.sum_short / MA_SHORT if self.count >= MA_SHORT else None
+
+    @property
+    def ma_50(self) -> Optional[float]:
+        return self.sum_long / MA_LONG if self.count >= MA_LONG else None
+
+    @property
+    def volatility_20(self) -> Optional[float]:
+        return math.sqrt(self.m2_short / MA_SHORT) if self.count >= MA_SHORT else None
+
+    @property
+    def rsi_14(self) -> Optional[float]:
+        if self.rsi_count < RSI_PERIOD:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            self.count, self.head, self.rsi_count,
+            self.sum_short, self.sum_long, self.mean_short, self.m2_short,
+            self.avg_gain, self.avg_loss,
+            math.nan if self.last_close is None else self.last_close,
+        )
+        return header + self.window.tobytes()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "StreamingIndicators":
+        state = cls()
+        (
+            state.count, state.head, state.rsi_count,
+            state.sum_short, state.sum_long, state.mean_short, state.m2_short,
+            state.avg_gain, state.avg_loss, last_close,
+        ) = _HEADER.unpack_from(blob)
+        state.last_close = None if math.isnan(last_close) else last_close
+        state.window = array("d")
+        state.window.frombytes(blob[_HEADER.size:])
+        return state
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+def update_indicators(db, ticks: Iterable[Tuple[int, datetime, float]]) -> int:
+    """
+    Advance the persisted indicator state of every symbol in `ticks`
+    ((symbol_id, ts, close) tuples) inside the caller's transaction.
+    Ticks at or before a symbol's last_ts are ignored. Returns symbols updated.
+    """
+    by_symbol: Dict[int, list] = defaultdict(list)
+    for symbol_id, ts, close in ticks:
+        by_symbol[symbol_id].append((_utc(ts), float(close)))
+    if not by_symbol:
+        return 0
+
+    symbol_ids = sorted(by_symbol)
+
+    # Make sure every row exists so FOR UPDATE serializes concurrent workers
+    db.execute(
+        insert(IndicatorState)
+        .values([{"symbol_id": symbol_id} for symbol_id in symbol_ids])
+        .on_conflict_do_nothing(index_elements=["symbol_id"])
+    )
+    stored = {
+        row.symbol_id: row
+        for row in db.execute(
+            select(IndicatorState.symbol_id, IndicatorState.last_ts, IndicatorState.state)
+            .where(IndicatorState.symbol_id.in_(symbol_ids))
+            .order_by(IndicatorState.symbol_id)
+            .with_for_update()
+        )
+    }
+
+    rows = []
+    for symbol_id in symbol_ids:
+        row = stored[symbol_id]
+        state = StreamingIndicators.from_bytes(row.state) if row.state else StreamingIndicators()
+        last_ts = row.last_ts
+
+        for ts, close in sorted(by_symbol[symbol_id]):
+            if last_ts is not None and ts <= last_ts:
+                continue
+            state.update(close)
+            last_ts = ts
+
+        if last_ts == row.last_ts:
+            continue
+        rows.append({
+            "symbol_id": symbol_id,
+            "last_ts": last_ts,
+            "last_close": state.last_close,
+            "ma_20": state.ma_20,
+            "ma_50": state.ma_50,
+            "rsi_14": state.rsi_14,
+            "volatility_20": state.volatility_20,
+            "state": state.to_bytes(),
+            "updated_at": datetime.now(timezone.utc),
+        })
+
+    if rows:
+        stmt = insert(IndicatorState)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["symbol_id"],
+            set_={column: stmt.excluded[column] for column in rows[0] if column != "symbol_id"},
+        )
+        db.execute(stmt, rows)
+    return len(rows)
@@ -0,0 +1,123 @@
+"""
+ETL Service - Metrics Engine
+Vectorized daily metrics for every active symbol of an asset type
+"""
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from common.models import DailyMetric
+from common.logging_config import setup_logging
+
+logger = setup_logging("etl-metrics-engine")
+
+WINDOW = 50       # Longest lookback (MA50)
+MIN_HISTORY = 20  # Same cut-off as _calculate_symbol_metrics
+
+def load_close_matrix(db, asset_type: str, window: int = WINDOW):
+    """
+    Load the last `window` daily closes of all active symbols in one query.
+    Returns (symbol_ids, closes, counts) where closes is a (symbols x window)
+    matrix in ascending time order, right-aligned and NaN-padded on the left.
+    """
+    rows = db.execute(
+        text(
+            """
+            SELECT s.id AS symbol_id, w.rn, w.close
+            FROM symbols s
+            CROSS JOIN LATERAL (
+                SELECT b.close, ROW_NUMBER() OVER (ORDER BY b.bucket DESC) AS rn
+                FROM price_bars_1d b
+                WHERE b.symbol_id = s.id
+                ORDER BY b.bucket DESC
+                LIMIT :window
+            ) w
+            WHERE s.asset_type = :asset_type AND s.is_active = true
+            """
+        ),
+        {"asset_type": asset_type, "window": window}
+    ).all()
+
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, window)), np.empty(0, dtype=np.int64)
+
+    ids, rn, close = (np.asarray(col) for col in zip(*rows))
+    symbol_ids, row_idx = np.unique(ids.astype(np.int64), return_inverse=True)
+
+    closes = np.full((len(symbol_ids), window), np.nan)
+    closes[row_idx, window - rn.astype(np.int64)] = close.astype(np.float64)
+    counts = np.bincount(row_idx, minlength=len(symbol_ids))
+    return symbol_ids, closes, counts
+
+def compute_metrics(closes: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Matrix version of _calculate_symbol_metrics, one row per symbol.
+    Rows with fewer than MIN_HISTORY closes are flagged invalid; ma_50 is NaN
+    below 50 closes.
+    """
+    last_20 = closes[:, -20:]
+    prev, last = closes[:, -2], closes[:, -1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ma_20 = last_20.mean(axis=1)
+        ma_50 = np.where(counts >= 50, closes[:, -50:].mean(axis=1), np.nan)
+        daily_return = (last - prev) / prev * 100
+
+        # RSI-14 over the changes inside the last 14 closes, averaged over 14
+        changes = np.diff(closes[:, -14:], axis=1)
+        avg_gain = np.clip(changes, 0, None).sum(axis=1) / 14
+        avg_loss = np.clip(-changes, 0, None).sum(axis=1) / 14
+        rsi_14 = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+        # Population standard deviation of the last 20 closes
+        volatility_20 = last_20.std(axis=1)
+
+    # A zero previous close made the per-symbol version raise and skip the symbol
+    valid = (counts >= MIN_HISTORY) & (prev != 0)
+
+    return {
+        "valid": valid,
+        "ma_20": ma_20,
+        "ma_50": ma_50,
+        "rsi_14": rsi_14,
+        "volatility_20": volatility_20,
+        "daily_return": daily_return,
+    }
+
+def _to_optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+def run_metrics(db, asset_type: str, day: Optional[date] = None) -> int:
+    """Compute and bulk-upsert DailyMetric rows for an asset type, returns rows written"""
+    day = day or date.today()
+    symbol_ids, closes, counts = load_close_matrix(db, asset_type)
+    if len(symbol_ids) == 0:
+        return 0
+
+    metrics = compute_metrics(closes, counts)
+    columns = ("ma_20", "ma_50", "rsi_14", "volatility_20", "daily_return")
+
+    rows = [
+        {
+            "symbol_id": int(symbol_ids[i]),
+            "date": day,
+            **{column: _to_optional(metrics[column][i]) for column in columns},
+        }
+        for i in np.flatnonzero(metrics["valid"])
+    ]
+    if not rows:
+        return 0
+
+    stmt = insert(DailyMetric)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_symbol_date",
+        set_={column: stmt.excluded[column] for column in columns},
+    )
+    db.execute(stmt, rows)
+    db.commit()
+
+    logger.info(f"Upserted {len(rows)} {asset_type} daily metrics ({len(symbol_ids) - len(rows)} skipped)")
+    return len(rows)
@@ -0,0 +1,151 @@
+"""
+ETL Service - OHLCV Rollups
+Keeps price_bars_1m/1h/1d in step with prices. Every level is recomputed
+bucket by bucket from the level below (1m from raw prices, 1h from 1m,
+1d from 1h), so re-delivered or corrected ticks never double count and a
+touched bucket costs at most 60 / 24 source rows above the first level.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from common.logging_config import setup_logging
+
+logger = setup_logging("etl-rollups")
+
+# Bars are aligned to UTC midnight, whatever the session time zone
+_BIN = "date_bin(CAST(:step AS interval), {ts}, TIMESTAMPTZ '2000-01-01 00:00:00+00')"
+
+class _Level:
+    def __init__(self, table: str, step: timedelta, source: str, raw: bool):
+        self.table = table
+        self.step = step
+        self.source = source
+        self.raw = raw
+
+    @property
+    def aggregates(self) -> str:
+        """Bar columns from source rows `s`, in the order of COLUMNS"""
+        if self.raw:
+            # Only provider bars carry their own open/high/low; a snapshot's are
+            # e.g. 24h ticker stats, so it contributes its close alone
+            return """
+                (array_agg(CASE WHEN s.is_bar THEN COALESCE(s.open, s.close) ELSE s.close END ORDER BY s.ts))[1],
+                max(CASE WHEN s.is_bar THEN COALESCE(s.high, s.close) ELSE s.close END),
+                min(CASE WHEN s.is_bar THEN COALESCE(s.low, s.close) ELSE s.close END),
+                (array_agg(s.close ORDER BY s.ts DESC))[1],
+                sum(s.volume),
+                count(*)
+            """
+        return """
+            (array_agg(s.open ORDER BY s.ts))[1],
+            max(s.high),
+            min(s.low),
+            (array_agg(s.close ORDER BY s.ts DESC))[1],
+            sum(s.volume),
+            sum(s.ticks)
+        """
+
+    @property
+    def source_rows(self) -> str:
+        """Source as (symbol_id, ts, open, high, low, close, volume[, ticks | is_bar])"""
+        if self.raw:
+            return "prices"
+        return f"(SELECT symbol_id, bucket AS ts, open, high, low, close, volume, ticks FROM {self.source})"
+
+LEVELS: List[_Level] = [
+    _Level("price_bars_1m", timedelta(minutes=1), "prices", raw=True),
+    _Level("price_bars_1h", timedelta(hours=1), "price_bars_1m", raw=False),
+    _Level("price_bars_1d", timedelta(days=1), "price_bars_1h", raw=False),
+]
+
+COLUMNS = "symbol_id, bucket, open, high, low, close, volume, ticks, updated_at"
+_UPSERT = """
+    ON CONFLICT (symbol_id, bucket) DO UPDATE SET
+        open = EXCLUDED.open, high = EXCLUDED.high, low = EXCLUDED.low,
+        close = EXCLUDED.close, volume = EXCLUDED.volume, ticks = EXCLUDED.ticks,
+        updated_at = EXCLUDED.updated_at
+"""
+
+def update_bars(db, ticks: Iterable[Tuple[int, datetime]]) -> int:
+    """
+    Recompute every bar containing one of the (symbol_id, ts) ticks just
+    written, inside the caller's transaction. Returns bars written.
+    """
+    ticks = list(ticks)
+    if not ticks:
+        return 0
+    symbol_ids = [symbol_id for symbol_id, _ in ticks]
+    timestamps = [ts for _, ts in ticks]
+
+    written = 0
+    for level in LEVELS:
+        result = db.execute(
+            text(
+                f"""
+                WITH touched AS (
+                    SELECT DISTINCT t.symbol_id, {_BIN.format(ts="t.ts")} AS bucket
+                    FROM unnest(CAST(:symbol_ids AS integer[]), CAST(:timestamps AS timestamptz[])) AS t(symbol_id, ts)
+                )
+                INSERT INTO {level.table} ({COLUMNS})
+                SELECT k.symbol_id, k.bucket, {level.aggregates}, now()
+                FROM touched k
+                JOIN {level.source_rows} s
+                  ON s.symbol_id = k.symbol_id
+                 AND s.ts >= k.bucket
+                 AND s.ts < k.bucket + CAST(:step AS interval)
+                GROUP BY k.symbol_id, k.bucket
+                {_UPSERT}
+                """
+            ),
+            {"step": level.step, "symbol_ids": symbol_ids, "timestamps": timestamps}
+        )
+        written += result.rowcount
+    return written
+
+def rebuild_bars(db, start: datetime, end: datetime, symbol_ids: Optional[List[int]] = None) -> int:
+    """
+    Repair: rebuild every bar overlapping [start, end) from raw prices,
+    dropping bars whose source rows are gone. Runs in the caller's
+    transaction; returns bars written. Upserts, so overlapping rebuilds
+    (e.g. parallel backfill chunks sharing a day) do not collide.
+    """
+    def symbol_filter(alias: str) -> str:
+        return f"AND {alias}.symbol_id = ANY(CAST(:symbol_ids AS integer[]))" if symbol_ids else ""
+
+    # [start, end) widened to whole buckets of the level
+    bounds = f"""
+        {_BIN.format(ts="CAST(:start AS timestamptz)")} AS lo,
+        {_BIN.format(ts="CAST(:end AS timestamptz) - INTERVAL '1 microsecond'")} + CAST(:step AS interval) AS hi
+    """
+
+    written = 0
+    for level in LEVELS:
+        params = {"step": level.step, "start": start, "end": end, "symbol_ids": symbol_ids}
+        db.execute(
+            text(
+                f"""
+                DELETE FROM {level.table} b
+                USING (SELECT {bounds}) r
+                WHERE b.bucket >= r.lo AND b.bucket < r.hi {symbol_filter("b")}
+                """
+            ),
+            params
+        )
+        result = db.execute(
+            text(
+                f"""
+                INSERT INTO {level.table} ({COLUMNS})
+                SELECT s.symbol_id, {_BIN.format(ts="s.ts")}, {level.aggregates}, now()
+                FROM {level.source_rows} s, (SELECT {bounds}) r
+                WHERE s.ts >= r.lo AND s.ts < r.hi {symbol_filter("s")}
+                GROUP BY 1, 2
+                {_UPSERT}
+                """
+            ),
+            params
+        )
+        written += result.rowcount
+    logger.info(f"Rebuilt {written} bars for {start:%Y-%m-%d %H:%M} -> {end:%Y-%m-%d %H:%M}")
+    return written
@@ -0,0 +1,142 @@
+"""
+ETL Service - Symbol Cache
+Process-local symbol -> id map so the hot path skips the symbols lookup
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from common.config import settings
+from common.models import Symbol
+from common.logging_config import setup_logging
+
+logger = setup_logging("etl-symbol-cache")
+
+class SymbolCache:
+    """Bounded LRU of symbol ids with TTL eviction and hit/miss counters"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[name]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, name: str, symbol_id: int):
+        with self._lock:
+            self._entries[name] = (symbol_id, time.monotonic() + self.ttl)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.created = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "created": self.created,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def warm(self, db) -> int:
+        """Load active symbols so the first batches are already hits"""
+        rows = db.execute(
+            select(Symbol.symbol, Symbol.id)
+            .where(Symbol.is_active)
+            .order_by(Symbol.id.desc())
+            .limit(self.max_size)
+        ).all()
+        for name, symbol_id in rows:
+            self.put(name, symbol_id)
+        logger.info(f"Warmed symbol cache with {len(rows)} symbols")
+        return len(rows)
+
+    def resolve(self, db, sources: Dict[str, str], asset_type: str) -> Tuple[Dict[str, int], Set[str]]:
+        """Map symbol names to ids, creating missing symbols race-free
+
+        `sources` maps each symbol name to the source it was fetched from.
+        Returns the ids and the names this call inserted into symbols.
+        """
+        symbol_ids: Dict[str, int] = {}
+        created: Set[str] = set()
+        missing = []
+        for name in sources:
+            symbol_id = self.get(name)
+            if symbol_id is None:
+                missing.append(name)
+            else:
+                symbol_ids[name] = symbol_id
+
+        if missing:
+            loaded, created = self._load_or_create(db, missing, sources, asset_type)
+            symbol_ids.update(loaded)
+        return symbol_ids, created
+
+    def _load_or_create(
+        self, db, names: Iterable[str], sources: Dict[str, str], asset_type: str
+    ) -> Tuple[Dict[str, int], Set[str]]:
+        names = list(names)
+        symbol_ids = dict(
+            db.execute(
+                insert(Symbol)
+                .values([
+                    {
+                        "symbol": name,
+                        "display_name": name,
+                        "asset_type": asset_type,
+                        "source": sources[name],
+                        "is_active": True,
+                    }
+                    for name in names
+                ])
+                .on_conflict_do_nothing(index_elements=["symbol"])
+                .returning(Symbol.symbol, Symbol.id)
+            ).all()
+        )
+        created = set(symbol_ids)
+        for name in created:
+            logger.info(f"Created new symbol: {name}")
+        self.created += len(created)
+
+        # Rows that already existed (or that another worker just committed)
+        existing = [name for name in names if name not in created]
+        if existing:
+            rows = db.execute(
+                select(Symbol.symbol, Symbol.id).where(Symbol.symbol.in_(existing))
+            ).all()
+            for name, symbol_id in rows:
+                self.put(name, symbol_id)
+            symbol_ids.update(dict(rows))
+
+        # Symbols created here are only cached once they show up as committed
+        # rows on a later miss, so a rolled back batch never poisons the cache
+        return symbol_ids, created
+
+# Per-process instance, warmed on worker_process_init
+symbol_cache = SymbolCache(settings.symbol_cache_max_size, settings.symbol_cache_ttl)
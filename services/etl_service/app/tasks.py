@@ -3,14 +3,39 @@ ETL Service - Celery Tasks
 Processes data received from ingestion service
 """
 import json
-from datetime import datetime, date
+import time
+from datetime import datetime, date, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+from celery.signals import worker_process_init
+from sqlalchemy.dialects.postgresql import insert
 from common.celery_app import celery_app
+from common.config import settings
 from common.db import SessionLocal
-from common.models import Symbol, Price, DailyMetric, ETLJob
+from common.cache_versions import CATALOG_SCOPE, bump_versions
+from common.latest_prices import update_latest
+from common.live_feed import publish_ticks
+from common.partitions import ensure_partitions, expire_partitions
+from common.models import Symbol, Price, PriceBar1d, DailyMetric, ETLJob, PipelineTrace
 from common.logging_config import setup_logging
+from common.tracing import observe_lags, sample, stamp, trace_rows
+from .symbol_cache import symbol_cache
+from .metrics_engine import run_metrics
+from .indicators import update_indicators
+from .rollups import rebuild_bars, update_bars
 
 logger = setup_logging("etl-tasks")
 
+@worker_process_init.connect
+def warm_symbol_cache(**kwargs):
+    """Fill the per-process symbol cache right after the worker child forks"""
+    db = SessionLocal()
+    try:
+        symbol_cache.warm(db)
+    except Exception as e:
+        logger.warning(f"Symbol cache warm-up failed: {e}")
+    finally:
+        db.close()
+
 @celery_app.task(name="etl.process_crypto")
 def process_crypto(payload):
     return _process_data(payload, "crypto")
@@ -27,50 +52,26 @@ def process_commodity(payload):
 def process_bond(payload):
     return _process_data(payload, "bond")
 
+@celery_app.task(name="etl.process_batch")
+def process_batch(payloads, asset_type):
+    return _process_batch(payloads, asset_type)
+
 def _process_data(body, asset_type):
     """Internal helper to process message and write to the database"""
+    started = time.time()
     db = SessionLocal()
     try:
-        if isinstance(body, str):
-            body = json.loads(body)
-            
-        symbol_name = body["symbol"]
-        source = body["source"]
-        ts = datetime.fromisoformat(body["ts"].replace("Z", "+00:00"))
-        price_val = body["price"]
-        
-        # find symbol or create
-        symbol = db.query(Symbol).filter(Symbol.symbol == symbol_name).first()
-        
-        if symbol is None:
-            symbol = Symbol(
-                symbol=symbol_name,
-                display_name=symbol_name,
-                asset_type=asset_type,
-                source=source,
-                is_active=True
-            )
-            db.add(symbol)
-            db.flush()
-            logger.info(f"Created new symbol: {symbol_name}")
-            
-        # save price
-        price_record = Price(
-            symbol_id=symbol.id,
-            ts=ts,
-            open=body.get("open"),
-            high=body.get("high"),
-            low=body.get("low"),
-            close=price_val,
-            volume=body.get("volume"),
-            source=source
-        )
-        
-        db.merge(price_record)
+        row = _parse_payload(body)
+        stamp([row], "etl_started", started)
+        _, created = _write_prices(db, [row], asset_type)
         db.commit()
+        stamp([row], "committed")
+        _invalidate_responses([row], bool(created))
+        _publish_ticks([row])
+        _trace(db, [row], asset_type)
         
-        logger.info(f"Processed {symbol_name} @ {ts} = {price_val}")
-        return {"status": "success", "symbol": symbol_name, "price": price_val}
+        logger.info(f"Processed {row['symbol']} @ {row['ts']} = {row['price']}")
+        return {"status": "success", "symbol": row["symbol"], "price": row["price"]}
             
     except Exception as e:
         db.rollback()
@@ -79,6 +80,120 @@ def _process_data(body, asset_type):
     finally:
         db.close()
 
+def _process_batch(payloads, asset_type):
+    """Write a whole fetch result in one transaction"""
+    started = time.time()
+    db = SessionLocal()
+    try:
+        rows = [_parse_payload(body) for body in payloads]
+        stamp(rows, "etl_started", started)
+        written, created = _write_prices(db, rows, asset_type)
+        db.commit()
+        stamp(rows, "committed")
+        _invalidate_responses(rows, bool(created))
+        _publish_ticks(rows)
+        _trace(db, rows, asset_type)
+
+        logger.info(f"Processed batch of {written} {asset_type} prices")
+        logger.debug(f"Symbol cache: {symbol_cache.stats()}")
+        return {"status": "success", "asset_type": asset_type, "count": written}
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error processing {asset_type} batch: {e}")
+        raise
+    finally:
+        db.close()
+
+def _parse_payload(body) -> dict:
+    """Normalize a fetcher payload (dict or JSON string)"""
+    if isinstance(body, str):
+        body = json.loads(body)
+    ts = body["ts"]
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    return {**body, "ts": ts}
+
+def _write_prices(db, rows, asset_type) -> Tuple[int, Set[str]]:
+    """Upsert parsed payloads into prices with a single INSERT ... ON CONFLICT
+    and advance the streaming indicators in the same transaction; returns the
+    rows written and the symbols created for them"""
+    if not rows:
+        return 0, set()
+
+    sources = {row["symbol"]: row["source"] for row in rows}
+    symbol_ids, created = symbol_cache.resolve(db, sources, asset_type)
+
+    # ON CONFLICT DO UPDATE cannot touch the same row twice, keep the last tick
+    values = {}
+    for row in rows:
+        symbol_id = symbol_ids[row["symbol"]]
+        values[(symbol_id, row["ts"])] = {
+            "symbol_id": symbol_id,
+            "ts": row["ts"],
+            "open": row.get("open"),
+            "high": row.get("high"),
+            "low": row.get("low"),
+            "close": row["price"],
+            "volume": row.get("volume"),
+            "source": row["source"],
+            "is_bar": bool(row.get("bar")),
+        }
+
+    stmt = insert(Price)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_symbol_ts",
+        set_={
+            column: stmt.excluded[column]
+            for column in ("open", "high", "low", "close", "volume", "source", "is_bar")
+        },
+    )
+    db.execute(stmt, list(values.values()))
+
+    update_indicators(db, ((row["symbol_id"], row["ts"], row["close"]) for row in values.values()))
+    update_bars(db, ((row["symbol_id"], row["ts"]) for row in values.values()))
+    return len(values), created
+
+def _invalidate_responses(rows, new_symbols: bool = False):
+    """Bump the API cache versions of every symbol just committed"""
+    scopes = {row["symbol"] for row in rows}
+    if new_symbols:
+        scopes.add(CATALOG_SCOPE)
+    bump_versions(scopes)
+
+def _publish_ticks(rows):
+    """Hand committed ticks to Redis: latest-price hashes and the live feed"""
+    ticks = [
+        {
+            "symbol": row["symbol"],
+            "ts": row["ts"],
+            "open": row.get("open"),
+            "high": row.get("high"),
+            "low": row.get("low"),
+            "close": row["price"],
+            "volume": row.get("volume"),
+            "source": row["source"],
+        }
+        for row in rows
+    ]
+    update_latest(ticks)
+    publish_ticks(ticks)
+
+def _trace(db, rows, asset_type):
+    """Export per-hop lags of committed ticks and keep a sample of them in pipeline_traces"""
+    queue = f"etl.{asset_type}"
+    observe_lags(rows, asset_type, queue)
+    sampled = sample(rows, settings.trace_sample_rate)
+    if not sampled:
+        return
+    try:
+        db.execute(insert(PipelineTrace), trace_rows(sampled, asset_type, queue))
+        db.commit()
+    except Exception as e:
+        # The prices are committed already, losing a trace sample is fine
+        db.rollback()
+        logger.warning(f"Could not store {len(sampled)} pipeline traces: {e}")
+
 @celery_app.task(name="etl.calculate_metrics", bind=True)
 def calculate_metrics(self, asset_type: str):
     """
@@ -99,30 +214,18 @@ def calculate_metrics(self, asset_type: str):
         db.add(job)
         db.commit()
 
-        # Get active symbols for this asset type
-        symbols = db.query(Symbol).filter(
-            Symbol.asset_type == asset_type,
-            Symbol.is_active
-        ).all()
-        
-        processed = 0
-        for symbol in symbols:
-            try:
-                _calculate_symbol_metrics(db, symbol)
-                logger.info(f"Calculating metrics for {symbol.symbol}")
-                processed += 1
-            except Exception as e:
-                logger.error(f"Failed to calculate metrics for {symbol.symbol}: {e}")
-                continue
+        # One query, one matrix pass and one upsert for the whole asset type
+        processed = run_metrics(db, asset_type)
         
         job.status = "completed"
         job.finished_at = datetime.utcnow()
         db.commit()
 
-        logger.info(f"Calculated metrics for {processed}/{len(symbols)} {asset_type} symbols")
+        logger.info(f"Calculated metrics for {processed} {asset_type} symbols")
         return {"status": "success", "asset_type": asset_type, "processed": processed}
 
     except Exception as e:
+        db.rollback()
         if job:
             job.status = "failed"
             job.error_message = str(e)
@@ -133,19 +236,57 @@ def calculate_metrics(self, asset_type: str):
     finally:
         db.close()
 
+@celery_app.task(name="etl.repair_bars")
+def repair_bars(start: Optional[str] = None, end: Optional[str] = None, symbols: Optional[List[str]] = None):
+    """Rebuild the OHLCV rollups of a time range (default: the last few days) from raw prices"""
+    end_ts = datetime.fromisoformat(end) if end else datetime.now(timezone.utc)
+    start_ts = datetime.fromisoformat(start) if start else end_ts - timedelta(days=settings.rollup_repair_days)
+
+    db = SessionLocal()
+    try:
+        symbol_ids = None
+        if symbols:
+            symbol_ids = [row.id for row in db.query(Symbol.id).filter(Symbol.symbol.in_(symbols))]
+        written = rebuild_bars(db, start_ts, end_ts, symbol_ids)
+        db.commit()
+        return {"status": "success", "bars": written}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Bar repair {start_ts} -> {end_ts} failed: {e}")
+        raise
+    finally:
+        db.close()
+
+@celery_app.task(name="etl.maintain_partitions")
+def maintain_partitions():
+    """Create the coming months' prices partitions and retire expired ones"""
+    db = SessionLocal()
+    try:
+        conn = db.connection()
+        created = ensure_partitions(conn, settings.prices_partition_months_ahead)
+        expired = expire_partitions(conn, settings.prices_retention_months, drop=settings.prices_retention_drop)
+        db.commit()
+        return {"status": "success", "created": created, "expired": expired}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Partition maintenance failed: {e}")
+        raise
+    finally:
+        db.close()
+
 def _calculate_symbol_metrics(db, symbol: Symbol):
-    """Calculate metrics for a single symbol"""
+    """Calculate metrics for a single symbol (reference for metrics_engine)"""
     today = date.today()
     
-    # Get last 50 prices for calculations
-    prices = db.query(Price).filter(
-        Price.symbol_id == symbol.id
-    ).order_by(Price.ts.desc()).limit(50).all()
+    # Get last 50 daily bars for calculations
+    bars = db.query(PriceBar1d).filter(
+        PriceBar1d.symbol_id == symbol.id
+    ).order_by(PriceBar1d.bucket.desc()).limit(50).all()
     
-    if len(prices) < 20:
+    if len(bars) < 20:
         return  # Not enough data
     
-    closes = [p.close for p in reversed(prices)]
+    closes = [b.close for b in reversed(bars)]
     
     # Calculate metrics
     ma_20 = sum(closes[-20:]) / 20
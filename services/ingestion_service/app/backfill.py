@@ -0,0 +1,240 @@
+"""
+Ingestion Service - Historical Backfill
+Splits a date range into per-symbol chunks, loads them into prices and
+checkpoints every chunk in backfill_chunks so interrupted runs resume.
+
+Usage:
+    python -m services.ingestion_service.app.backfill crypto BTCUSDT,ETHUSDT \
+        --start 2024-01-01 --end 2024-07-01 --interval 1m [--local]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from common.bulk_load import load_prices
+from common.cache_versions import CATALOG_SCOPE, bump_versions
+from common.config import settings
+from common.db import SessionLocal
+from common.models import BackfillChunk
+from common.logging_config import setup_logging
+from .fetchers.crypto_fetcher import crypto_fetcher
+from .fetchers.equity_fetcher import equity_fetcher
+from .fetchers.commodity_fetcher import commodity_fetcher
+from .fetchers.bond_fetcher import bond_fetcher
+
+from services.etl_service.app.rollups import rebuild_bars
+from services.etl_service.app.symbol_cache import symbol_cache
+
+logger = setup_logging("ingestion-backfill")
+
+FETCHERS = {
+    "crypto": crypto_fetcher,
+    "equity": equity_fetcher,
+    "commodity": commodity_fetcher,
+    "bond": bond_fetcher,
+}
+
+# Time span covered by one chunk, sized to a couple of provider requests
+CHUNK_SPANS = {
+    "1m": timedelta(days=1),
+    "5m": timedelta(days=3),
+    "15m": timedelta(days=10),
+    "1h": timedelta(days=30),
+    "1d": timedelta(days=365),
+}
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def plan_chunks(start: datetime, end: datetime, interval: str) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end) into consecutive chunks for the given bar interval"""
+    if interval not in CHUNK_SPANS:
+        raise ValueError(f"Unsupported backfill interval: {interval}")
+    start, end = _utc(start), _utc(end)
+    span = CHUNK_SPANS[interval]
+
+    chunks = []
+    cursor = start
+    while cursor < end:
+        chunk_end = min(cursor + span, end)
+        chunks.append((cursor, chunk_end))
+        cursor = chunk_end
+    return chunks
+
+def enqueue_chunks(db, symbols: List[str], asset_type: str, start: datetime, end: datetime, interval: str) -> int:
+    """Record missing checkpoints; chunks from an earlier run keep their status"""
+    rows = [
+        {
+            "symbol": symbol,
+            "asset_type": asset_type,
+            "interval": interval,
+            "chunk_start": chunk_start,
+            "chunk_end": chunk_end,
+        }
+        for symbol in symbols
+        for chunk_start, chunk_end in plan_chunks(start, end, interval)
+    ]
+    if not rows:
+        return 0
+    db.execute(
+        insert(BackfillChunk).on_conflict_do_nothing(constraint="uq_backfill_chunk"),
+        rows
+    )
+    db.commit()
+    return len(rows)
+
+def _claimable():
+    now = datetime.now(timezone.utc)
+    stale_before = now - timedelta(seconds=settings.backfill_stale_after)
+    retry_before = now - timedelta(seconds=settings.backfill_retry_delay)
+    return (
+        or_(
+            BackfillChunk.status == "pending",
+            (BackfillChunk.status == "failed") & (BackfillChunk.updated_at <= retry_before),
+            (BackfillChunk.status == "running") & (BackfillChunk.updated_at < stale_before),
+        ),
+        BackfillChunk.attempts < settings.backfill_max_attempts,
+    )
+
+def count_in_flight(db) -> int:
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.backfill_stale_after)
+    return db.execute(
+        select(func.count()).select_from(BackfillChunk).where(
+            BackfillChunk.status == "running",
+            BackfillChunk.updated_at >= stale_before,
+        )
+    ).scalar_one()
+
+def count_claimable(db) -> int:
+    return db.execute(
+        select(func.count()).select_from(BackfillChunk).where(*_claimable())
+    ).scalar_one()
+
+def claim_chunk(db) -> Optional[BackfillChunk]:
+    """Atomically take the oldest claimable chunk, skipping ones other workers hold"""
+    chunk = db.execute(
+        select(BackfillChunk)
+        .where(*_claimable())
+        .order_by(BackfillChunk.chunk_start, BackfillChunk.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    if chunk is None:
+        db.rollback()
+        return None
+
+    chunk.status = "running"
+    chunk.attempts += 1
+    chunk.updated_at = datetime.now(timezone.utc)
+    db.commit()
+    return chunk
+
+def _load_payloads(db, chunk: BackfillChunk, payloads) -> Tuple[int, bool]:
+    """COPY a chunk's bars into prices and rebuild the rollups it covers,
+    inside the current transaction; returns the rows loaded and whether the
+    chunk's symbol had to be created
+
+    Historical bars arrive out of order across chunks, so the streaming
+    indicator state is left to the live path.
+    """
+    if not payloads:
+        return 0, False
+    source = payloads[0]["source"]
+    symbol_ids, created = symbol_cache.resolve(db, {chunk.symbol: source}, chunk.asset_type)
+    symbol_id = symbol_ids[chunk.symbol]
+    stats = load_prices(
+        (
+            (symbol_id, p["ts"], p.get("open"), p.get("high"), p.get("low"), p["price"], p.get("volume"), p["source"])
+            for p in payloads
+        ),
+        db=db,
+        bars=True
+    )
+    rebuild_bars(db, chunk.chunk_start, chunk.chunk_end, [symbol_id])
+    return stats.rows, bool(created)
+
+def run_chunk(db, chunk: BackfillChunk) -> int:
+    """Fetch one chunk and load it into prices, then mark it done"""
+    try:
+        payloads = FETCHERS[chunk.asset_type].fetch_history(
+            chunk.symbol, chunk.chunk_start, chunk.chunk_end, chunk.interval
+        )
+        written, new_symbol = _load_payloads(db, chunk, payloads)
+
+        chunk.status = "done"
+        chunk.rows = written
+        chunk.error_message = None
+        chunk.updated_at = datetime.now(timezone.utc)
+        db.commit()
+        if written:
+            bump_versions([chunk.symbol, CATALOG_SCOPE] if new_symbol else [chunk.symbol])
+
+        logger.info(f"Backfilled {chunk.symbol} {chunk.interval} {chunk.chunk_start:%Y-%m-%d %H:%M} -> {chunk.chunk_end:%Y-%m-%d %H:%M}: {written} rows")
+        return written
+
+    except Exception as e:
+        db.rollback()
+        db.execute(
+            update(BackfillChunk)
+            .where(BackfillChunk.id == chunk.id)
+            .values(status="failed", error_message=str(e), updated_at=datetime.now(timezone.utc))
+        )
+        db.commit()
+        logger.error(f"Backfill chunk {chunk.id} ({chunk.symbol}) failed: {e}")
+        raise
+
+def drain(max_chunks: Optional[int] = None) -> int:
+    """Claim and run chunks until none are left (one backfill lane)"""
+    done = 0
+    db = SessionLocal()
+    try:
+        while max_chunks is None or done < max_chunks:
+            chunk = claim_chunk(db)
+            if chunk is None:
+                break
+            try:
+                run_chunk(db, chunk)
+            except Exception:
+                # Recorded on the checkpoint and retried on a later claim; the traceback only lands here
+                logger.exception(f"Chunk {chunk.id} failed")
+            done += 1
+    finally:
+        db.close()
+    return done
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical OHLCV into prices")
+    parser.add_argument("asset_type", choices=sorted(FETCHERS))
+    parser.add_argument("symbols", help="Comma separated symbols, e.g. BTCUSDT,ETHUSDT")
+    parser.add_argument("--start", required=True, type=datetime.fromisoformat)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=datetime.now(timezone.utc))
+    parser.add_argument("--interval", default="1d", choices=sorted(CHUNK_SPANS))
+    parser.add_argument("--concurrency", type=int, default=settings.backfill_concurrency)
+    parser.add_argument("--local", action="store_true", help="Run chunks in this process instead of on Celery workers")
+    args = parser.parse_args()
+
+    symbols = [symbol.strip() for symbol in args.symbols.split(",") if symbol.strip()]
+
+    if not args.local:
+        from .tasks import backfill
+        result = backfill.delay(symbols, args.asset_type, args.start.isoformat(), args.end.isoformat(), args.interval)
+        logger.info(f"Queued backfill task {result.id}")
+        return
+
+    db = SessionLocal()
+    try:
+        planned = enqueue_chunks(db, symbols, args.asset_type, args.start, args.end, args.interval)
+    finally:
+        db.close()
+    logger.info(f"Planned {planned} chunks, running {args.concurrency} lanes locally")
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        completed = sum(pool.map(lambda _: drain(), range(args.concurrency)))
+    logger.info(f"Processed {completed} chunks")
+
+if __name__ == "__main__":
+    main()
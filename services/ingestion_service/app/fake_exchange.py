@@ -0,0 +1,95 @@
+"""
+Ingestion Service - Fake Exchange
+Local stand-in for Binance's REST ticker/24hr and klines endpoints, serving
+the seeded synthetic market. Point CryptoFetcher at it with
+BINANCE_REST_URL=http://<host>:<port>/api/v3 to run the real fetch path
+without Binance's rate limits or its moving prices.
+
+Usage:
+    python -m services.ingestion_service.app.fake_exchange --port 8080 --symbols 1000 --seed 42
+"""
+import argparse
+import json
+import time
+from typing import List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+from common.config import settings
+from common.logging_config import setup_logging
+from .synthetic_market import INTERVALS, SyntheticMarket, fake_symbols
+
+logger = setup_logging("ingestion-fake-exchange")
+
+MAX_KLINES = 1000
+
+def _error(code: int, msg: str) -> JSONResponse:
+    """Binance's error body"""
+    return JSONResponse(status_code=400, content={"code": code, "msg": msg})
+
+def create_app(symbols: Optional[List[str]] = None, seed: Optional[int] = None) -> FastAPI:
+    market = SyntheticMarket(settings.fake_exchange_seed if seed is None else seed)
+    listed = symbols or fake_symbols(settings.fake_exchange_symbols)
+    app = FastAPI(title="MarketFlow Fake Exchange", docs_url=None, redoc_url=None)
+
+    def valid(symbol: str) -> bool:
+        # Any Binance-shaped pair is served, listed or not, so the real SYMBOLS work too
+        return symbol.isalnum() and symbol.isupper() and 2 <= len(symbol) <= 20
+
+    @app.get("/api/v3/ping")
+    def ping():
+        return {}
+
+    @app.get("/api/v3/ticker/24hr")
+    def ticker_24hr(symbol: Optional[str] = None, symbols: Optional[str] = None):
+        if symbol and symbols:
+            return _error(-1101, "Too many parameters; expected 'symbol' or 'symbols'.")
+        if symbol:
+            if not valid(symbol):
+                return _error(-1121, "Invalid symbol.")
+            return market.ticker(symbol)
+
+        try:
+            wanted = json.loads(symbols) if symbols else listed
+        except json.JSONDecodeError:
+            return _error(-1100, "Illegal characters found in parameter 'symbols'.")
+        if not all(isinstance(s, str) and valid(s) for s in wanted):
+            return _error(-1121, "Invalid symbol.")
+        return [market.ticker(s) for s in wanted]
+
+    @app.get("/api/v3/klines")
+    def klines(
+        symbol: str,
+        interval: str,
+        startTime: Optional[int] = None,
+        endTime: Optional[int] = None,
+        limit: int = Query(default=500, ge=1, le=MAX_KLINES),
+    ):
+        if not valid(symbol):
+            return _error(-1121, "Invalid symbol.")
+        if interval not in INTERVALS:
+            return _error(-1120, "Invalid interval.")
+
+        step = INTERVALS[interval] * 1000
+        latest = int(time.time() * 1000)
+        end = min(endTime if endTime is not None else latest, latest)
+        # Without startTime Binance returns the most recent `limit` bars
+        start = startTime if startTime is not None else (end // step - limit + 1) * step
+        return market.bars(symbol, interval, start, end, limit)
+
+    logger.info(f"Fake exchange listing {len(listed)} symbols, seed {market.seed}")
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a seeded synthetic market behind Binance's REST API")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--symbols", type=int, default=settings.fake_exchange_symbols, help="Pairs returned by an unfiltered ticker/24hr")
+    parser.add_argument("--seed", type=int, default=settings.fake_exchange_seed)
+    args = parser.parse_args()
+    uvicorn.run(create_app(fake_symbols(args.symbols), args.seed), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
+from .yahoo_fetcher import YahooBatchFetcher
 from .crypto_fetcher import crypto_fetcher, CryptoFetcher 
 from .equity_fetcher import equity_fetcher, EquityFetcher
 from .commodity_fetcher import commodity_fetcher, CommodityFetcher
 from .bond_fetcher import bond_fetcher, BondFetcher
+from .fake_fetcher import fake_fetcher, FakeExchangeFetcher
 
 __all__ = [
+    "YahooBatchFetcher",
     "crypto_fetcher", "CryptoFetcher",
     "equity_fetcher", "EquityFetcher",
     "commodity_fetcher", "CommodityFetcher",
     "bond_fetcher", "BondFetcher",
+    "fake_fetcher", "FakeExchangeFetcher",
 ]
\ No newline at end of file
@@ -1,15 +1,45 @@
+import functools
+import math
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from common.logging_config import setup_logging
+from common.metrics import FETCH_ERRORS, FETCH_SECONDS
+from common.rate_limit import NoRateLimit, RateLimiter, get_rate_limiter
 from common.schemas import AssetType
 
+def _timed(method):
+    """Record latency and errors of a fetcher method, labelled by source"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            FETCH_ERRORS.labels(self.source_name, method.__name__, type(e).__name__).inc()
+            raise
+        finally:
+            FETCH_SECONDS.labels(self.source_name, method.__name__).observe(time.perf_counter() - started)
+    return wrapper
+
 class BaseFetcher(ABC):
     """Abstract base class for all data fetchers"""
 
-    def __init__(self, source_name: str):
+    # Public fetch methods every subclass gets timed without touching its code
+    _TIMED = ("fetch_price", "fetch_batch", "fetch_history")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls._TIMED:
+            if name in cls.__dict__:
+                setattr(cls, name, _timed(cls.__dict__[name]))
+
+    def __init__(self, source_name: str, rate_limit_key: Optional[str] = None):
         self.source_name = source_name
         self.logger = setup_logging(f"fetcher.{source_name}")
+        # Shared (Redis) budget of the provider, acquired before each request
+        self.rate_limiter: RateLimiter = get_rate_limiter(rate_limit_key) if rate_limit_key else NoRateLimit(source_name)
 
     @abstractmethod
     def fetch_price(self, symbol: str) -> Dict[str, Any]:
@@ -21,6 +51,11 @@ class BaseFetcher(ABC):
         """Current prices for more than one symbols"""
         pass 
 
+    @abstractmethod
+    def fetch_history(self, symbol: str, start: datetime, end: datetime, interval: str) -> List[Dict[str, Any]]:
+        """OHLCV bars in [start, end), one payload per bar"""
+        pass
+
     def _build_payload(
         self,
         symbol: str,
@@ -30,8 +65,11 @@ class BaseFetcher(ABC):
         open_price: Optional[float] = None,
         high: Optional[float] = None,
         low: Optional[float] = None,
+        ts: Optional[datetime] = None,
+        bar: bool = False,
     ) -> Dict[str, Any]:
-        """Creates standard payload"""
+        """Creates standard payload; `bar` marks open/high/low of a real OHLC
+        bar rather than snapshot stats (e.g. a 24h ticker)"""
         return {
             "symbol": symbol,
             "asset_type": asset_type,
@@ -41,5 +79,26 @@ class BaseFetcher(ABC):
             "open": open_price,
             "high": high,
             "low": low,
-            "ts": datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+            "ts": (ts or datetime.utcnow()).isoformat(),
+            "bar": bar,
+            "trace": {"fetched": time.time()},  # Stage stamps, see common.tracing
+        }
+
+    def _payloads_from_history(self, symbol: str, asset_type: AssetType, hist) -> List[Dict[str, Any]]:
+        """Converts a yfinance history frame into payloads, one per bar"""
+        has_volume = "Volume" in hist.columns
+        return [
+            self._build_payload(
+                symbol=symbol,
+                asset_type=asset_type,
+                price=float(row.Close),
+                volume=float(row.Volume) if has_volume and row.Volume else None,
+                open_price=float(row.Open),
+                high=float(row.High),
+                low=float(row.Low),
+                ts=row.Index.to_pydatetime(),
+                bar=True
+            )
+            for row in hist.itertuples()
+            if not math.isnan(row.Close)
+        ]
\ No newline at end of file
@@ -1,19 +1,29 @@
+from common.config import settings
 from common.exceptions import DataFetchError
 from common.schemas import AssetType
 from common.exceptions import RateLimitError
+import asyncio
+import json
 import httpx
-from typing import List, Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Any, Dict, Optional, Set
 from .base import BaseFetcher
 
 class CryptoFetcher(BaseFetcher):
     """Fetches crypto prices from Binance API"""
 
-    BASE_URL = "https://api.binance.com/api/v3"
+    BASE_URL = settings.binance_rest_url
     SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+    KLINES_LIMIT = 1000  # Max bars per klines request
+    TICKER_BATCH_SIZE = 100  # Symbols per ticker/24hr?symbols=[...] request
+    MAX_CONCURRENCY = 10  # Parallel per-symbol requests in the async fallback
 
     def __init__(self):
-        super().__init__("binance")
+        super().__init__("binance", rate_limit_key="binance")
         self.client = httpx.Client(timeout=10.0)
+        self.async_transport: Optional[httpx.AsyncBaseTransport] = None  # Per-symbol fallback's, default network
+        self.invalid_symbols: Set[str] = set()  # Rejected with 400 (e.g. delisted), skipped from then on
 
     def fetch_price(self, symbol: str) -> Dict[str, Any]:
         """
@@ -21,50 +31,178 @@ class CryptoFetcher(BaseFetcher):
         GET /api/v3/ticker/24hr?symbol=BTCUSDT
         """
         try:
+            self.rate_limiter.acquire(2)
             response = self.client.get(
                 f"{self.BASE_URL}/ticker/24hr",
                 params={"symbol": symbol}
             )
-
-            if response.status_code == 429:
-                raise RateLimitError("binance")
+            self.rate_limiter.observe(response.status_code, response.headers)
 
             response.raise_for_status()
             data = response.json()
 
             self.logger.info(f"Fetched {symbol}: {data['lastPrice']}")
-            
-            return self._build_payload(
-                symbol=symbol,
-                asset_type=AssetType.CRYPTO,
-                price=float(data["lastPrice"]),
-                volume=float(data['volume']),
-                open_price=float(data['openPrice']),
-                high=float(data["highPrice"]),
-                low=float(data["lowPrice"])
-            )
+            return self._payload_from_ticker(data)
 
         except httpx.HTTPError as e:
             raise DataFetchError("binance", symbol, str(e))
 
+    def fetch_history(self, symbol: str, start: datetime, end: datetime, interval: str = "1m") -> List[Dict[str, Any]]:
+        """
+        Binance klines, paginated by open time
+        GET /api/v3/klines?symbol=BTCUSDT&interval=1m&startTime=...&endTime=...
+        """
+        cursor = int(start.timestamp() * 1000)
+        end_ms = int(end.timestamp() * 1000) - 1
+        results = []
+
+        try:
+            while cursor <= end_ms:
+                self.rate_limiter.acquire(2)
+                response = self.client.get(
+                    f"{self.BASE_URL}/klines",
+                    params={
+                        "symbol": symbol,
+                        "interval": interval,
+                        "startTime": cursor,
+                        "endTime": end_ms,
+                        "limit": self.KLINES_LIMIT
+                    }
+                )
+                self.rate_limiter.observe(response.status_code, response.headers)
+
+                response.raise_for_status()
+                klines = response.json()
+
+                for open_time, open_price, high, low, close, volume, *_ in klines:
+                    results.append(self._build_payload(
+                        symbol=symbol,
+                        asset_type=AssetType.CRYPTO,
+                        price=float(close),
+                        volume=float(volume),
+                        open_price=float(open_price),
+                        high=float(high),
+                        low=float(low),
+                        ts=datetime.fromtimestamp(open_time / 1000, tz=timezone.utc),
+                        bar=True
+                    ))
+
+                if len(klines) < self.KLINES_LIMIT:
+                    break
+                cursor = klines[-1][0] + 1
+
+        except httpx.HTTPError as e:
+            raise DataFetchError("binance", symbol, str(e))
+
+        return results
+
     def fetch_batch(self, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Fetches prices of all crypto symbols"""
-        symbols = symbols or self.SYMBOLS
+        """
+        Fetches prices of all crypto symbols with one request per TICKER_BATCH_SIZE
+        GET /api/v3/ticker/24hr?symbols=["BTCUSDT","ETHUSDT"]
+        A chunk the endpoint rejects (e.g. one delisted symbol) is retried
+        per symbol concurrently so the rest of the chunk still lands; the
+        symbols Binance rejects there are left out of later batches.
+        """
+        symbols = [symbol for symbol in symbols or self.SYMBOLS if symbol not in self.invalid_symbols]
         results = []
 
-        for symbol in symbols:
+        for i in range(0, len(symbols), self.TICKER_BATCH_SIZE):
+            chunk = symbols[i:i + self.TICKER_BATCH_SIZE]
             try:
-                result = self.fetch_price(symbol)
-                results.append(result)
+                results.extend(self._fetch_tickers(chunk))
+            except RateLimitError:
+                raise
             except Exception as e:
-                self.logger.error(f"Failed to fetch {symbol}: {e}")
-                continue
-        
+                self.logger.warning(f"Batch ticker request failed ({e}), falling back to per-symbol requests")
+                results.extend(_run(self._fetch_each_async(chunk)))
+
+        self.logger.info(f"Fetched {len(results)}/{len(symbols)} crypto prices")
         return results
 
+    def _fetch_tickers(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        self.rate_limiter.acquire(self._ticker_weight(len(symbols)))
+        response = self.client.get(
+            f"{self.BASE_URL}/ticker/24hr",
+            params={"symbols": json.dumps(symbols, separators=(",", ":"))}
+        )
+        self.rate_limiter.observe(response.status_code, response.headers)
+
+        response.raise_for_status()
+        return [self._payload_from_ticker(data) for data in response.json()]
+
+    async def _fetch_each_async(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """One ticker request per symbol, at most MAX_CONCURRENCY in flight"""
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+        async with httpx.AsyncClient(timeout=10.0, transport=self.async_transport) as client:
+            async def fetch_one(symbol: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    try:
+                        await self.rate_limiter.acquire_async(2)
+                        response = await client.get(
+                            f"{self.BASE_URL}/ticker/24hr",
+                            params={"symbol": symbol}
+                        )
+                        self.rate_limiter.observe(response.status_code, response.headers)
+                        response.raise_for_status()
+                        return self._payload_from_ticker(response.json())
+                    except RateLimitError:
+                        raise
+                    except Exception as e:
+                        if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 400:
+                            self.invalid_symbols.add(symbol)
+                            self.logger.warning(f"Binance rejected {symbol}, skipping it from now on: {e}")
+                        else:
+                            self.logger.error(f"Failed to fetch {symbol}: {e}")
+                        return None
+
+            tasks = [asyncio.create_task(fetch_one(symbol)) for symbol in symbols]
+            try:
+                payloads = await asyncio.gather(*tasks)
+            except RateLimitError:
+                # Stop the rest of the chunk instead of spending more weight while blocked
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        return [payload for payload in payloads if payload is not None]
+
+    @staticmethod
+    def _ticker_weight(count: int) -> int:
+        """Request weight of ticker/24hr?symbols=[...] as documented by Binance"""
+        if count <= 20:
+            return 2
+        if count <= 100:
+            return 40
+        return 80
+
+    def _payload_from_ticker(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Standard payload from a ticker/24hr object, stamped with Binance's closeTime"""
+        return self._build_payload(
+            symbol=data["symbol"],
+            asset_type=AssetType.CRYPTO,
+            price=float(data["lastPrice"]),
+            volume=float(data['volume']),
+            open_price=float(data['openPrice']),
+            high=float(data["highPrice"]),
+            low=float(data["lowPrice"]),
+            ts=datetime.fromtimestamp(data["closeTime"] / 1000, tz=timezone.utc)
+        )
+
     def __del__(self):
         if hasattr(self, 'client'):
             self.client.close()
 
+def _run(coro):
+    """asyncio.run that also works when the caller is already inside an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
 # Singleton Instance
 crypto_fetcher = CryptoFetcher()
\ No newline at end of file
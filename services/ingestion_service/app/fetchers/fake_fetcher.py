@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from common.config import settings
+from common.schemas import AssetType
+from .base import BaseFetcher
+from ..synthetic_market import SyntheticMarket, fake_symbols
+
+class FakeExchangeFetcher(BaseFetcher):
+    """Seeded random-walk prices for load tests, no network and no rate limit"""
+
+    ASSET_TYPE = AssetType.CRYPTO
+    KLINES_LIMIT = 1000
+
+    def __init__(self, symbols: Optional[List[str]] = None, seed: Optional[int] = None):
+        super().__init__("fake")
+        self.market = SyntheticMarket(settings.fake_exchange_seed if seed is None else seed)
+        self.SYMBOLS = symbols or fake_symbols(settings.fake_exchange_symbols)
+
+    def fetch_price(self, symbol: str) -> Dict[str, Any]:
+        return self._payload_from_ticker(self.market.ticker(symbol))
+
+    def fetch_batch(self, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        return [self._payload_from_ticker(self.market.ticker(symbol, now_ms)) for symbol in symbols or self.SYMBOLS]
+
+    def fetch_history(self, symbol: str, start: datetime, end: datetime, interval: str = "1m") -> List[Dict[str, Any]]:
+        """Bars opening in [start, end), same values the Binance stand-in serves"""
+        cursor = int(start.timestamp() * 1000)
+        end_ms = int(end.timestamp() * 1000) - 1
+        results = []
+        while cursor <= end_ms:
+            klines = self.market.bars(symbol, interval, cursor, end_ms, self.KLINES_LIMIT)
+            for open_time, open_price, high, low, close, volume, *_ in klines:
+                results.append(self._build_payload(
+                    symbol=symbol,
+                    asset_type=self.ASSET_TYPE,
+                    price=float(close),
+                    volume=float(volume),
+                    open_price=float(open_price),
+                    high=float(high),
+                    low=float(low),
+                    ts=datetime.fromtimestamp(open_time / 1000, tz=timezone.utc),
+                    bar=True
+                ))
+            if len(klines) < self.KLINES_LIMIT:
+                break
+            cursor = klines[-1][0] + 1
+        return results
+
+    def _payload_from_ticker(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._build_payload(
+            symbol=data["symbol"],
+            asset_type=self.ASSET_TYPE,
+            price=float(data["lastPrice"]),
+            volume=float(data["volume"]),
+            open_price=float(data["openPrice"]),
+            high=float(data["highPrice"]),
+            low=float(data["lowPrice"]),
+            ts=datetime.fromtimestamp(data["closeTime"] / 1000, tz=timezone.utc)
+        )
+
+# Singleton instance
+fake_fetcher = FakeExchangeFetcher()
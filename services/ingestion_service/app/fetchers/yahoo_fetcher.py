@@ -0,0 +1,107 @@
+import math
+import pandas as pd
+import yfinance as yf
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Union
+from .base import BaseFetcher
+from common.exceptions import DataFetchError
+from common.schemas import AssetType
+
+class YahooBatchFetcher(BaseFetcher):
+    """Base for Yahoo Finance fetchers, downloads every ticker in one request"""
+
+    SYMBOLS: Union[List[str], Dict[str, str]] = []  # Symbol list or {our symbol: yahoo ticker}
+    ASSET_TYPE: AssetType
+    HAS_VOLUME = True
+    BATCH_SIZE = 500  # Tickers per yf.download call, at most the rate limit's bucket
+    # Intraday bars, each poll lands on its own row; 5 days reach across weekends and holidays
+    INTERVAL = "5m"
+    PERIOD = "5d"
+
+    def __init__(self, source_name: str):
+        super().__init__(source_name, rate_limit_key="yahoo")
+        self.last_failures: Dict[str, str] = {}
+
+    def _yahoo_symbol(self, symbol: str) -> str:
+        if isinstance(self.SYMBOLS, dict):
+            return self.SYMBOLS.get(symbol.upper(), symbol)
+        return symbol
+
+    def fetch_price(self, symbol: str) -> Dict[str, Any]:
+        results = self.fetch_batch([symbol])
+        if not results:
+            raise DataFetchError(self.source_name, symbol, self.last_failures.get(symbol.upper(), "No price data available"))
+        return results[0]
+
+    def fetch_batch(self, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Latest intraday bar of every symbol; per-ticker failures land in last_failures"""
+        symbols = [symbol.upper() for symbol in (symbols or list(self.SYMBOLS))]
+        self.last_failures = {}
+        results = []
+
+        # The bucket caps a larger request at its capacity, which would let a chunk past the budget
+        batch_size = min(self.BATCH_SIZE, self.rate_limiter.capacity or self.BATCH_SIZE)
+        for i in range(0, len(symbols), batch_size):
+            chunk = {self._yahoo_symbol(symbol): symbol for symbol in symbols[i:i + batch_size]}
+            # yf.download issues one request per ticker
+            self.rate_limiter.acquire(len(chunk))
+            try:
+                frame = yf.download(
+                    list(chunk),
+                    period=self.PERIOD,
+                    interval=self.INTERVAL,
+                    group_by="column",
+                    auto_adjust=False,
+                    threads=True,
+                    progress=False,
+                )
+            except Exception as e:
+                raise DataFetchError(self.source_name, ",".join(chunk.values()), str(e))
+            results.extend(self._payloads_from_download(frame, chunk))
+
+        if self.last_failures:
+            self.logger.error(f"Failed to fetch {len(self.last_failures)} symbols: {self.last_failures}")
+        self.logger.info(f"Fetched {len(results)}/{len(symbols)} {self.ASSET_TYPE.value} prices")
+        return results
+
+    def _payloads_from_download(self, frame: pd.DataFrame, tickers: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Turn the wide (field, ticker) frame into one payload per ticker"""
+        if frame.empty:
+            self.last_failures.update({symbol: "No data returned" for symbol in tickers.values()})
+            return []
+        if not isinstance(frame.columns, pd.MultiIndex):
+            frame.columns = pd.MultiIndex.from_product([frame.columns, list(tickers)])
+
+        results = []
+        for ticker, symbol in tickers.items():
+            if ticker not in frame.columns.get_level_values(1):
+                self.last_failures[symbol] = "No price data available"
+                continue
+            bars = frame.xs(ticker, axis=1, level=1).reindex(columns=["Open", "High", "Low", "Close", "Volume"])
+            # The last bar Yahoo printed a close for, every field from that same bar
+            last = bars["Close"].last_valid_index()
+            if last is None:
+                self.last_failures[symbol] = "No price data available"
+                continue
+            bar = bars.loc[last]
+            results.append(self._build_payload(
+                symbol=symbol,
+                asset_type=self.ASSET_TYPE,
+                price=float(bar["Close"]),
+                volume=_optional(bar["Volume"]) if self.HAS_VOLUME else None,
+                open_price=_optional(bar["Open"]),
+                high=_optional(bar["High"]),
+                low=_optional(bar["Low"]),
+                ts=last.to_pydatetime(),
+                bar=True
+            ))
+        return results
+
+    def fetch_history(self, symbol: str, start: datetime, end: datetime, interval: str = "1d") -> List[Dict[str, Any]]:
+        self.rate_limiter.acquire(1)
+        hist = yf.Ticker(self._yahoo_symbol(symbol)).history(start=start, end=end, interval=interval)
+        return self._payloads_from_history(symbol.upper(), self.ASSET_TYPE, hist)
+
+def _optional(value) -> Optional[float]:
+    """NaN and zero (Yahoo's 'no value') become None"""
+    return float(value) if value and not math.isnan(value) else None
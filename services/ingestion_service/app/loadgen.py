@@ -0,0 +1,183 @@
+"""
+Ingestion Service - Load Generator
+Pushes synthetic ticks through the real pipeline (fake exchange fetcher ->
+etl.process_batch on RabbitMQ -> ETL workers -> Postgres) at a fixed rate
+per step, and reports what the pipeline actually sustained: ticks published,
+ticks committed to prices, and how fast the ETL queue backlog grew. The
+first rate whose backlog keeps growing is the saturation point.
+
+Needs running RabbitMQ, ETL workers consuming etl.<asset_type> and Postgres.
+
+Usage:
+    python -m services.ingestion_service.app.loadgen --rates 200,500,1000,2000 --step 60 --symbols 1000
+"""
+import argparse
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from common.celery_app import celery_app
+from common.db import engine
+from common.logging_config import setup_logging
+from .fetchers.fake_fetcher import FakeExchangeFetcher
+from .synthetic_market import fake_symbols
+from .tasks import _publish_batch
+
+logger = setup_logging("ingestion-loadgen")
+
+@dataclass
+class StepResult:
+    rate: float                 # ticks/s asked for
+    seconds: float
+    published: int              # ticks handed to RabbitMQ
+    committed: int              # rows that reached prices during the step
+    backlog_start: int          # etl queue depth, messages
+    backlog_end: int
+    backlog_growth: float       # messages/s, least squares over the step's samples
+    batch_size: int
+    samples: List[Tuple[float, int, int]] = field(default_factory=list)  # (elapsed, committed, backlog)
+
+    @property
+    def publish_rate(self) -> float:
+        return self.published / self.seconds
+
+    @property
+    def commit_rate(self) -> float:
+        return self.committed / self.seconds
+
+    @property
+    def saturated(self) -> bool:
+        # A backlog rising by more than 5% of the offered load per second is not draining
+        return self.backlog_growth * self.batch_size > 0.05 * self.rate
+
+class PipelineProbe:
+    """Reads the ETL queue depth from RabbitMQ and the committed fake ticks from Postgres"""
+
+    def __init__(self, queue: str, source: str):
+        self.queue = queue
+        self.source = source
+        self.since = datetime.now(timezone.utc)
+        self._connection = celery_app.connection_for_read()
+
+    def backlog(self) -> int:
+        """Ready messages in the queue (prefetched ones count as taken)"""
+        return self._connection.default_channel.queue_declare(queue=self.queue, passive=True).message_count
+
+    def committed(self) -> int:
+        with engine.connect() as conn:
+            return conn.execute(
+                text("SELECT count(*) FROM prices WHERE source = :source AND ts >= :since"),
+                {"source": self.source, "since": self.since}
+            ).scalar()
+
+    def close(self):
+        self._connection.release()
+
+def _growth(samples: List[Tuple[float, int, int]]) -> float:
+    if len(samples) < 2:
+        return 0.0
+    elapsed, _, backlog = zip(*samples)
+    return float(np.polyfit(elapsed, backlog, 1)[0])
+
+def run_step(
+    fetcher: FakeExchangeFetcher, probe: PipelineProbe, asset_type: str,
+    rate: float, seconds: float, batch_size: int, report_every: float
+) -> StepResult:
+    """Publish `rate` ticks/s in batches of `batch_size` for `seconds`"""
+    symbols = fetcher.SYMBOLS
+    interval = batch_size / rate
+    committed_start = probe.committed()
+    result = StepResult(rate, seconds, 0, 0, probe.backlog(), 0, 0.0, batch_size)
+
+    started = time.monotonic()
+    next_publish = next_report = started
+    cursor = 0
+    while (now := time.monotonic()) < started + seconds:
+        if now >= next_report:
+            result.samples.append((now - started, probe.committed() - committed_start, probe.backlog()))
+            _, committed, backlog = result.samples[-1]
+            logger.info(
+                f"rate {rate:.0f}/s  t+{now - started:4.0f}s  published {result.published}  "
+                f"committed {committed}  backlog {backlog} msgs"
+            )
+            next_report += report_every
+        if now < next_publish:
+            time.sleep(max(min(next_publish, next_report) - now, 0))
+            continue
+
+        chunk = [symbols[(cursor + i) % len(symbols)] for i in range(batch_size)]
+        cursor = (cursor + batch_size) % len(symbols)
+        _publish_batch(fetcher.fetch_batch(chunk), asset_type)
+        result.published += batch_size
+        # Fixed schedule: a slow publish is caught up instead of lowering the rate
+        next_publish += interval
+
+    result.seconds = time.monotonic() - started
+    result.samples.append((result.seconds, probe.committed() - committed_start, probe.backlog()))
+    result.committed = result.samples[-1][1]
+    result.backlog_end = result.samples[-1][2]
+    result.backlog_growth = _growth(result.samples)
+    return result
+
+def drain(probe: PipelineProbe, timeout: float) -> Optional[float]:
+    """Seconds until the queue is empty, None if it still is not after `timeout`"""
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if probe.backlog() == 0:
+            return time.monotonic() - started
+        time.sleep(1.0)
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive synthetic ticks through ingestion, RabbitMQ, ETL and Postgres")
+    parser.add_argument("--rates", default="100,500,1000", help="Comma separated ticks/s, one step each")
+    parser.add_argument("--step", type=float, default=60.0, help="Seconds per rate")
+    parser.add_argument("--batch-size", type=int, default=100, help="Ticks per etl.process_batch message")
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--asset-type", default="crypto", help="Routes to etl.<asset_type>")
+    parser.add_argument("--report-every", type=float, default=5.0, help="Seconds between samples")
+    parser.add_argument("--drain-timeout", type=float, default=300.0, help="Seconds to wait for the backlog after the last step")
+    parser.add_argument("--output", default=None, help="Write the step results as JSON")
+    args = parser.parse_args()
+
+    fetcher = FakeExchangeFetcher(fake_symbols(args.symbols), args.seed)
+    probe = PipelineProbe(f"etl.{args.asset_type}", fetcher.source_name)
+    results = []
+    try:
+        for rate in (float(rate) for rate in args.rates.split(",")):
+            results.append(run_step(fetcher, probe, args.asset_type, rate, args.step, args.batch_size, args.report_every))
+        drained = drain(probe, args.drain_timeout)
+    finally:
+        probe.close()
+
+    print(f"{'offered/s':>10} {'published/s':>12} {'committed/s':>12} {'backlog':>9} {'growth msg/s':>13}")
+    for result in results:
+        print(
+            f"{result.rate:>10.0f} {result.publish_rate:>12.0f} {result.commit_rate:>12.0f} "
+            f"{result.backlog_end:>9} {result.backlog_growth:>13.2f}{'  SATURATED' if result.saturated else ''}"
+        )
+    saturated = next((result.rate for result in results if result.saturated), None)
+    print(f"Saturation: {f'{saturated:.0f} ticks/s' if saturated else 'not reached'}; "
+          f"backlog {'drained in %.0fs' % drained if drained is not None else 'not drained'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "args": vars(args),
+                "saturated_at": saturated,
+                "drain_seconds": drained,
+                "steps": [
+                    {**asdict(result), "publish_rate": result.publish_rate,
+                     "commit_rate": result.commit_rate, "saturated": result.saturated}
+                    for result in results
+                ],
+            }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
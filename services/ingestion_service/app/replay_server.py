@@ -0,0 +1,82 @@
+"""
+Ingestion Service - Replay Server
+Local stand-in for Binance's combined websocket stream. Replays messages
+recorded with `streaming --record` to every client, keeping the original
+spacing (scaled by --speed) and only sending the streams a client asked for.
+
+Usage:
+    python -m services.ingestion_service.app.replay_server ticks.jsonl --port 8765 --speed 10 --loop
+"""
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import parse_qs, urlparse
+
+from websockets.asyncio.server import serve
+
+from common.logging_config import setup_logging
+
+logger = setup_logging("ingestion-replay")
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _event_time(message: Dict[str, Any]) -> Optional[int]:
+    return message.get("data", message).get("E")
+
+def _requested_streams(path: str) -> Optional[Set[str]]:
+    streams = parse_qs(urlparse(path).query).get("streams")
+    return set(streams[0].split("/")) if streams else None
+
+class ReplayServer:
+    """Serves a recording over websockets, one independent replay per client"""
+
+    def __init__(self, messages: List[Dict[str, Any]], speed: float = 1.0, loop: bool = False):
+        self.messages = messages
+        self.speed = speed
+        self.loop = loop
+
+    async def handler(self, websocket):
+        wanted = _requested_streams(websocket.request.path)
+        logger.info(f"Client connected, streams={sorted(wanted) if wanted else 'all'}")
+        while True:
+            previous = None
+            for message in self.messages:
+                if wanted and message.get("stream") not in wanted:
+                    continue
+                event_time = _event_time(message)
+                if self.speed > 0 and previous is not None and event_time is not None:
+                    await asyncio.sleep(max(event_time - previous, 0) / 1000 / self.speed)
+                previous = event_time if event_time is not None else previous
+                await websocket.send(json.dumps(message))
+            if not self.loop:
+                break
+        await websocket.close()
+
+    async def serve(self, host: str = "localhost", port: int = 8765):
+        """Start listening; returns the websockets server (use as async context manager)"""
+        return await serve(self.handler, host, port)
+
+async def _main(args):
+    server = ReplayServer(load_recording(args.recording), speed=args.speed, loop=args.loop)
+    async with await server.serve(args.host, args.port):
+        logger.info(f"Replaying {len(server.messages)} messages on ws://{args.host}:{args.port}/stream")
+        await asyncio.Future()
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Binance stream messages over websockets")
+    parser.add_argument("recording", help="JSONL file written by streaming --record")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0, help="Time scale, 0 sends as fast as possible")
+    parser.add_argument("--loop", action="store_true", help="Restart the recording when it ends")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
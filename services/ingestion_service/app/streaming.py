@@ -0,0 +1,267 @@
+"""
+Ingestion Service - Streaming Crypto Ingestion
+Long-running asyncio client holding a Binance combined ticker/kline
+websocket, micro-batching ticks into etl.process_batch messages.
+
+Usage:
+    python -m services.ingestion_service.app.streaming --symbols BTCUSDT,ETHUSDT
+    python -m services.ingestion_service.app.streaming --url ws://localhost:8765/stream
+    python -m services.ingestion_service.app.streaming --record ticks.jsonl
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TextIO
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from common.config import settings
+from common.logging_config import setup_logging
+from common.schemas import AssetType
+from common.tracing import stamp
+from .fetchers.crypto_fetcher import crypto_fetcher
+
+logger = setup_logging("ingestion-streaming")
+
+Sink = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+def _ms_to_dt(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+def parse_message(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Combined-stream message -> standard payload (None for events we do not store)"""
+    data = message.get("data", message)
+    event = data.get("e")
+
+    if event == "24hrTicker":
+        return crypto_fetcher._build_payload(
+            symbol=data["s"],
+            asset_type=AssetType.CRYPTO,
+            price=float(data["c"]),
+            volume=float(data["v"]),
+            open_price=float(data["o"]),
+            high=float(data["h"]),
+            low=float(data["l"]),
+            ts=_ms_to_dt(data["E"])
+        )
+
+    if event == "kline" and data["k"]["x"]:  # Closed bars only
+        kline = data["k"]
+        return crypto_fetcher._build_payload(
+            symbol=data["s"],
+            asset_type=AssetType.CRYPTO,
+            price=float(kline["c"]),
+            volume=float(kline["v"]),
+            open_price=float(kline["o"]),
+            high=float(kline["h"]),
+            low=float(kline["l"]),
+            ts=_ms_to_dt(kline["t"]),
+            bar=True
+        )
+
+    return None
+
+async def celery_sink(batch: List[Dict[str, Any]]):
+    """Publish a micro-batch to the ETL without blocking the event loop"""
+    from services.etl_service.app.tasks import process_batch
+
+    stamp(batch, "published")
+    await asyncio.to_thread(
+        process_batch.apply_async, args=(batch, "crypto"), queue="etl.crypto"
+    )
+
+def _append(recorder: TextIO, lines: List[str]):
+    recorder.write("".join(f"{line}\n" for line in lines))
+    recorder.flush()
+
+class CryptoStream:
+    """Combined ticker/kline subscription with micro-batching and resuming reconnects"""
+
+    def __init__(
+        self,
+        symbols: List[str],
+        sink: Sink = celery_sink,
+        url: Optional[str] = None,
+        kline_interval: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        batch_interval: Optional[float] = None,
+        record_to: Optional[str] = None,
+    ):
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.sink = sink
+        self.url = url or settings.binance_stream_url
+        self.kline_interval = kline_interval
+        self.batch_size = batch_size or settings.stream_batch_size
+        self.batch_interval = batch_interval or settings.stream_batch_interval
+        self.record_to = record_to
+        self._recorder: Optional[TextIO] = None
+        self._recorded: List[str] = []  # Raw messages written out on the next flush, off the event loop
+        self._record_lock = asyncio.Lock()  # Keeps overlapping flushes appending in order
+
+        # Latest ticker per symbol plus closed klines, flushed together
+        self._tickers: Dict[str, Dict[str, Any]] = {}
+        self._bars: Dict[tuple, Dict[str, Any]] = {}
+        self._last_event: Optional[datetime] = None
+        self._stopped = asyncio.Event()
+        self.batches = 0
+        self.messages = 0
+        self.failed_flushes = 0
+        self._retry_at = 0.0  # After a failed flush, size-triggered flushes wait for this
+
+    @property
+    def stream_url(self) -> str:
+        streams = [f"{symbol.lower()}@ticker" for symbol in self.symbols]
+        if self.kline_interval:
+            streams += [f"{symbol.lower()}@kline_{self.kline_interval}" for symbol in self.symbols]
+        return f"{self.url}?streams={'/'.join(streams)}"
+
+    def stop(self):
+        self._stopped.set()
+
+    def _pending(self) -> int:
+        return len(self._tickers) + len(self._bars)
+
+    def _add(self, payload: Dict[str, Any], is_bar: bool):
+        if is_bar:
+            self._bars[(payload["symbol"], payload["ts"])] = payload
+        else:
+            self._tickers[payload["symbol"]] = payload
+
+    async def _write_recording(self):
+        async with self._record_lock:
+            if not self._recorder or not self._recorded:
+                return
+            lines, self._recorded = self._recorded, []
+            try:
+                await asyncio.to_thread(_append, self._recorder, lines)
+            except OSError as e:
+                logger.error(f"Could not record {len(lines)} messages to {self.record_to}: {e}")
+
+    async def flush(self):
+        """Hand pending ticks to the sink; a batch the sink rejects stays pending for the next flush"""
+        await self._write_recording()
+        if not self._pending():
+            return
+        tickers, bars = self._tickers, self._bars
+        self._tickers, self._bars = {}, {}
+        batch = list(bars.values()) + list(tickers.values())
+        try:
+            await self.sink(batch)
+        except Exception as e:
+            # Ticks that arrived during the attempt are newer than the re-queued ones
+            self._tickers = {**tickers, **self._tickers}
+            self._bars = {**bars, **self._bars}
+            self.failed_flushes += 1
+            self._retry_at = time.monotonic() + self.batch_interval
+            logger.error(f"Could not publish {len(batch)} ticks, keeping them for the next flush: {e}")
+            return
+        self.batches += 1
+        logger.debug(f"Flushed {len(batch)} ticks")
+
+    async def _flush_periodically(self):
+        while not self._stopped.is_set():
+            await asyncio.sleep(self.batch_interval)
+            await self.flush()
+
+    async def _resume_gap(self):
+        """After a reconnect, fetch the bars missed while disconnected over REST"""
+        if self._last_event is None:
+            return
+        since, now = self._last_event, datetime.now(timezone.utc)
+        if (now - since).total_seconds() < 60:
+            return
+        logger.info(f"Resuming gap {since:%H:%M:%S} -> {now:%H:%M:%S} from REST klines")
+        for symbol in self.symbols:
+            try:
+                bars = await asyncio.to_thread(crypto_fetcher.fetch_history, symbol, since, now, "1m")
+            except Exception as e:
+                logger.error(f"Gap fill for {symbol} failed: {e}")
+                continue
+            for bar in bars:
+                self._add(bar, is_bar=True)
+        await self.flush()
+
+    async def _consume(self, websocket):
+        async for raw in websocket:
+            self.messages += 1
+            if self._recorder:
+                self._recorded.append(raw if isinstance(raw, str) else raw.decode())
+            message = json.loads(raw)
+            payload = parse_message(message)
+            if payload is None:
+                continue
+            self._add(payload, is_bar=message.get("data", message)["e"] == "kline")
+            self._last_event = datetime.now(timezone.utc)
+            if self._pending() >= self.batch_size and time.monotonic() >= self._retry_at:
+                await self.flush()
+            if self._stopped.is_set():
+                break
+
+    async def run(self):
+        """Stay subscribed until stop(), reconnecting with capped exponential backoff"""
+        flusher = asyncio.create_task(self._flush_periodically())
+        if self.record_to:
+            self._recorder = await asyncio.to_thread(open, self.record_to, "a")
+        backoff = 1.0
+        try:
+            while not self._stopped.is_set():
+                try:
+                    async with connect(self.stream_url, ping_interval=20, max_queue=None) as websocket:
+                        logger.info(f"Subscribed to {len(self.symbols)} symbols at {self.url}")
+                        backoff = 1.0
+                        await self._resume_gap()
+                        consumer = asyncio.create_task(self._consume(websocket))
+                        stopper = asyncio.create_task(self._stopped.wait())
+                        done, _ = await asyncio.wait({consumer, stopper}, return_when=asyncio.FIRST_COMPLETED)
+                        stopper.cancel()
+                        if consumer in done:
+                            consumer.result()  # Re-raise connection errors
+                            if not self._stopped.is_set():
+                                raise ConnectionError("Stream closed by server")
+                        else:
+                            consumer.cancel()
+                except (OSError, WebSocketException, ConnectionError) as e:
+                    if self._stopped.is_set():
+                        break
+                    delay = backoff * (0.5 + random.random())
+                    logger.warning(f"Stream disconnected ({e}), reconnecting in {delay:.1f}s")
+                    await self.flush()
+                    try:
+                        await asyncio.wait_for(self._stopped.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    backoff = min(backoff * 2, 60.0)
+        finally:
+            flusher.cancel()
+            await self.flush()
+            if self._recorder:
+                await asyncio.to_thread(self._recorder.close)
+                self._recorder = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream real-time crypto ticks into the ETL")
+    parser.add_argument("--symbols", default=",".join(crypto_fetcher.SYMBOLS))
+    parser.add_argument("--url", default=settings.binance_stream_url, help="Combined stream endpoint (or a local replay server)")
+    parser.add_argument("--kline", default=None, help="Also store closed klines of this interval, e.g. 1m")
+    parser.add_argument("--record", default=None, help="Append raw messages to this JSONL file for replay")
+    args = parser.parse_args()
+
+    stream = CryptoStream(
+        symbols=[symbol.strip() for symbol in args.symbols.split(",") if symbol.strip()],
+        url=args.url,
+        kline_interval=args.kline,
+        record_to=args.record,
+    )
+    started = time.monotonic()
+    try:
+        asyncio.run(stream.run())
+    except KeyboardInterrupt:
+        pass
+    logger.info(f"Received {stream.messages} messages, sent {stream.batches} batches in {time.monotonic() - started:.0f}s")
+
+if __name__ == "__main__":
+    main()
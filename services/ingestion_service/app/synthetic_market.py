@@ -0,0 +1,137 @@
+"""
+Ingestion Service - Synthetic Market
+Seeded random-walk prices for any symbol at any time, shared by the fake
+exchange fetcher and the Binance stand-in server. Prices are a pure function
+of (seed, symbol, interval, time): the walk is cut into chunks of CHUNK
+steps whose end points are drawn from the seed, and each chunk is a Brownian
+bridge between them. Overlapping requests therefore always agree, and no
+state has to be kept between them.
+"""
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+CHUNK = 1000  # Steps per bridge
+DAILY_VOLATILITY = 0.02
+
+# Binance kline intervals in seconds
+INTERVALS = {
+    "1s": 1, "1m": 60, "3m": 180, "5m": 300, "15m": 900, "30m": 1800,
+    "1h": 3600, "2h": 7200, "4h": 14400, "6h": 21600, "8h": 28800, "12h": 43200,
+    "1d": 86400, "3d": 259200,
+}
+
+def fake_symbols(count: int) -> List[str]:
+    """Binance-looking symbols for a synthetic market of `count` pairs"""
+    return [f"FAKE{i:05d}USDT" for i in range(count)]
+
+def _symbol_key(symbol: str) -> int:
+    return zlib.crc32(symbol.encode())
+
+@lru_cache(maxsize=2048)  # ~24 kB each; two per symbol keep tickers warm
+def _chunk(seed: int, symbol: str, interval: int, chunk: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Log prices at the CHUNK + 1 step boundaries, wick sizes and volumes of one chunk"""
+    key = _symbol_key(symbol)
+    base = np.log(np.random.default_rng([seed, key]).uniform(1, 1000))
+    chunk_sigma = DAILY_VOLATILITY * np.sqrt(CHUNK * interval / 86400)
+    start, end = (
+        base + chunk_sigma * np.random.default_rng([seed, key, interval, c, 1]).normal()
+        for c in (chunk, chunk + 1)
+    )
+
+    rng = np.random.default_rng([seed, key, interval, chunk, 0])
+    step_sigma = DAILY_VOLATILITY * np.sqrt(interval / 86400)
+    walk = np.concatenate(([0.0], np.cumsum(rng.normal(0, step_sigma, CHUNK))))
+    t = np.linspace(0, 1, CHUNK + 1)
+    log_prices = start + (end - start) * t + walk - t * walk[-1]
+    wicks = np.abs(rng.normal(0, step_sigma, CHUNK))
+    volumes = rng.lognormal(3, 1, CHUNK) * interval / 60
+    return log_prices, wicks, volumes
+
+class SyntheticMarket:
+    """OHLCV bars and 24h tickers of a seeded market"""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+
+    def _steps(self, symbol: str, interval: int, first: int, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Log prices of steps first .. first + count (inclusive), wicks and volumes of the count bars between"""
+        price_chunks: List[np.ndarray] = []
+        wick_chunks: List[np.ndarray] = []
+        volume_chunks: List[np.ndarray] = []
+        for chunk in range(first // CHUNK, (first + count) // CHUNK + 1):
+            chunk_prices, chunk_wicks, chunk_volumes = _chunk(self.seed, symbol, interval, chunk)
+            price_chunks.append(chunk_prices[:-1])
+            wick_chunks.append(chunk_wicks)
+            volume_chunks.append(chunk_volumes)
+        offset = first - (first // CHUNK) * CHUNK
+        return (
+            np.concatenate(price_chunks)[offset:offset + count + 1],
+            np.concatenate(wick_chunks)[offset:offset + count],
+            np.concatenate(volume_chunks)[offset:offset + count],
+        )
+
+    def price(self, symbol: str, at: float) -> float:
+        """Price at epoch second `at` (one-second resolution)"""
+        log_prices, _, _ = self._steps(symbol, 1, int(at), 0)
+        return float(np.exp(log_prices[0]))
+
+    def bars(self, symbol: str, interval: str, start_ms: int, end_ms: int, limit: int) -> List[List[Any]]:
+        """Klines opening in [start_ms, end_ms], at most `limit`, in Binance's array format"""
+        seconds = INTERVALS[interval]
+        first = -(-start_ms // (seconds * 1000))
+        last = end_ms // (seconds * 1000)
+        count = min(last - first + 1, limit)
+        if count <= 0:
+            return []
+
+        log_prices, wicks, volumes = self._steps(symbol, seconds, first, count)
+        opens, closes = np.exp(log_prices[:-1]), np.exp(log_prices[1:])
+        highs = np.maximum(opens, closes) * (1 + wicks)
+        lows = np.minimum(opens, closes) * (1 - wicks)
+        klines = []
+        for i in range(count):
+            open_time = (first + i) * seconds * 1000
+            klines.append([
+                open_time, f"{opens[i]:.8f}", f"{highs[i]:.8f}", f"{lows[i]:.8f}", f"{closes[i]:.8f}",
+                f"{volumes[i]:.8f}", open_time + seconds * 1000 - 1, f"{volumes[i] * closes[i]:.8f}",
+                int(volumes[i]) + 1, f"{volumes[i] / 2:.8f}", f"{volumes[i] * closes[i] / 2:.8f}", "0",
+            ])
+        return klines
+
+    def ticker(self, symbol: str, now_ms: Optional[int] = None) -> Dict[str, Any]:
+        """A ticker/24hr object as of `now_ms` (default: now)"""
+        now_ms = now_ms or int(datetime.now(timezone.utc).timestamp() * 1000)
+        now = now_ms // 1000
+        last = self.price(symbol, now)
+        open_price = self.price(symbol, now - 86400)
+        _, wicks, volumes = self._steps(symbol, 1, now, 1)
+        high = max(open_price, last) * (1 + float(wicks[0]) * 30)
+        low = min(open_price, last) * (1 - float(wicks[0]) * 30)
+        volume = float(volumes[0]) * 86400
+        return {
+            "symbol": symbol,
+            "priceChange": f"{last - open_price:.8f}",
+            "priceChangePercent": f"{(last / open_price - 1) * 100:.3f}",
+            "weightedAvgPrice": f"{(open_price + last) / 2:.8f}",
+            "prevClosePrice": f"{open_price:.8f}",
+            "lastPrice": f"{last:.8f}",
+            "lastQty": f"{float(volumes[0]):.8f}",
+            "bidPrice": f"{last * 0.9999:.8f}",
+            "bidQty": "1.00000000",
+            "askPrice": f"{last * 1.0001:.8f}",
+            "askQty": "1.00000000",
+            "openPrice": f"{open_price:.8f}",
+            "highPrice": f"{high:.8f}",
+            "lowPrice": f"{low:.8f}",
+            "volume": f"{volume:.8f}",
+            "quoteVolume": f"{volume * last:.8f}",
+            "openTime": now_ms - 86400000,
+            "closeTime": now_ms,
+            "firstId": 0,
+            "lastId": int(volume),
+            "count": int(volume) + 1,
+        }
@@ -2,22 +2,29 @@
 Ingestion Service - Celery Tasks
 Data fetching tasks scheduled by Celery Beat
 """
+from datetime import datetime
 from common.celery_app import celery_app
+from common.config import settings
+from common.db import SessionLocal
+from common.exceptions import RateLimitError
 from common.logging_config import setup_logging
+from common.tracing import stamp
 from .fetchers.crypto_fetcher import crypto_fetcher
 from .fetchers.equity_fetcher import equity_fetcher
 from .fetchers.commodity_fetcher import commodity_fetcher
 from .fetchers.bond_fetcher import bond_fetcher
+from .backfill import enqueue_chunks, count_in_flight, count_claimable, drain
 
-from services.etl_service.app.tasks import (
-    process_crypto, 
-    process_equity, 
-    process_commodity, 
-    process_bond
-)
+from services.etl_service.app.tasks import process_batch
 
 logger = setup_logging("ingestion-tasks")
 
+def _publish_batch(data, asset_type: str):
+    """Hand a whole fetch result to the ETL as a single message"""
+    if data:
+        stamp(data, "published")
+        process_batch.apply_async(args=(data, asset_type), queue=f"etl.{asset_type}")
+
 @celery_app.task(
     name="ingestion.fetch_crypto",
     bind=True,
@@ -32,10 +39,12 @@ def fetch_crypto(self):
     logger.info("Starting crypto fetch task...")
     try:
         data = crypto_fetcher.fetch_batch()
-        for item in data:
-            process_crypto.delay(item)
+        _publish_batch(data, "crypto")
         logger.info(f"Triggered ETL for {len(data)} crypto prices")
         return {"status": "success", "count": len(data)}
+    except RateLimitError as e:
+        logger.warning(f"Crypto fetch rate limited, retrying in {e.retry_after}s")
+        raise self.retry(exc=e, countdown=e.retry_after)
     except Exception as e:
         logger.error(f"Crypto fetch failed: {e}")
         raise self.retry(exc=e)
@@ -45,9 +54,11 @@ def fetch_equity(self):
     logger.info("Starting equity fetch task...")
     try:
         data = equity_fetcher.fetch_batch()
-        for item in data:
-            process_equity.delay(item)
+        _publish_batch(data, "equity")
         return {"status": "success", "count": len(data)}
+    except RateLimitError as e:
+        logger.warning(f"Equity fetch rate limited, retrying in {e.retry_after}s")
+        raise self.retry(exc=e, countdown=e.retry_after)
     except Exception as e:
         logger.error(f"Equity fetch failed: {e}")
         raise self.retry(exc=e)
@@ -57,9 +68,11 @@ def fetch_commodity(self):
     logger.info("Starting commodity fetch task...")
     try:
         data = commodity_fetcher.fetch_batch()
-        for item in data:
-            process_commodity.delay(item)
+        _publish_batch(data, "commodity")
         return {"status": "success", "count": len(data)}
+    except RateLimitError as e:
+        logger.warning(f"Commodity fetch rate limited, retrying in {e.retry_after}s")
+        raise self.retry(exc=e, countdown=e.retry_after)
     except Exception as e:
         logger.error(f"Commodity fetch failed: {e}")
         raise self.retry(exc=e)
@@ -69,9 +82,42 @@ def fetch_bond(self):
     logger.info("Starting bond fetch task...")
     try:
         data = bond_fetcher.fetch_batch()
-        for item in data:
-            process_bond.delay(item)
+        _publish_batch(data, "bond")
         return {"status": "success", "count": len(data)}
+    except RateLimitError as e:
+        logger.warning(f"Bond fetch rate limited, retrying in {e.retry_after}s")
+        raise self.retry(exc=e, countdown=e.retry_after)
     except Exception as e:
         logger.error(f"Bond fetch failed: {e}")
-        raise self.retry(exc=e)
\ No newline at end of file
+        raise self.retry(exc=e)
+
+
+@celery_app.task(name="ingestion.backfill")
+def backfill(symbols, asset_type: str, start: str, end: str, interval: str = "1d"):
+    """
+    Plans backfill chunks and starts up to `backfill_concurrency` lanes.
+    Re-running with the same arguments resumes an interrupted backfill.
+    """
+    db = SessionLocal()
+    try:
+        planned = enqueue_chunks(
+            db, symbols, asset_type,
+            datetime.fromisoformat(start), datetime.fromisoformat(end), interval
+        )
+        lanes = min(
+            settings.backfill_concurrency - count_in_flight(db),
+            count_claimable(db)
+        )
+    finally:
+        db.close()
+
+    for _ in range(max(lanes, 0)):
+        backfill_chunk.delay()
+    logger.info(f"Backfill of {len(symbols)} {asset_type} symbols: {planned} chunks planned, {max(lanes, 0)} lanes started")
+    return {"status": "success", "chunks": planned, "lanes": max(lanes, 0)}
+
+@celery_app.task(name="ingestion.backfill_chunk")
+def backfill_chunk():
+    """Runs one checkpointed chunk, then hands the lane to the next pending chunk"""
+    if drain(max_chunks=1):
+        backfill_chunk.delay()
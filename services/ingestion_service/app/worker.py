@@ -15,6 +15,6 @@ if __name__ == "__main__":
     celery_app.worker_main([
         "worker",
         "--loglevel=INFO",
-        "--queues=ingestion.crypto,ingestion.equity,ingestion.commodity,ingestion.bond",
+        "--queues=ingestion.crypto,ingestion.equity,ingestion.commodity,ingestion.bond,ingestion.backfill",
         "--concurrency=2"  # Ingestion is usually lighter (I/O bound), so 2 is enough
     ])
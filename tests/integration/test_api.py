@@ -1,11 +1,33 @@
+import asyncio
+import pytest
+import redis.asyncio
 from fastapi.testclient import TestClient
 from services.api_service.app.main import app
+from services.api_service.app.core.cache import ResponseCache, response_cache
+from services.api_service.app.core.fanout import Subscription
+from services.common.common.cache_versions import bump_versions
+from services.common.common.config import settings
+from services.common.common.latest_prices import empty_key, latest_key, update_latest
+from services.common.common.live_feed import publish_ticks
+from services.common.common.redis_client import get_redis
 from services.common.common.models import Price
-from datetime import datetime
+from services.etl_service.app.rollups import rebuild_bars
+from datetime import datetime, timedelta
 
-client = TestClient(app)
+@pytest.fixture(scope="module")
+def client():
+    """One event loop for the whole module, as the async engine pool is bound to it."""
+    with TestClient(app) as client:
+        yield client
 
-def test_get_symbols(db_session, sample_symbol):
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Each test starts from an empty cache (rows are deleted between tests)."""
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+def test_get_symbols(client, db_session, sample_symbol):
     """Test retrieving the list of symbols."""
     response = client.get("/symbols")
     assert response.status_code == 200
@@ -13,7 +35,7 @@ def test_get_symbols(db_session, sample_symbol):
     assert len(data) >= 1
     assert any(s["symbol"] == sample_symbol.symbol for s in data)
 
-def test_get_price_history(db_session, sample_symbol):
+def test_get_price_history(client, db_session, sample_symbol):
     """Test retrieving price history for a symbol."""
     # Add a price record
     price = Price(
@@ -30,8 +52,203 @@ def test_get_price_history(db_session, sample_symbol):
     data = response.json()
     assert len(data) == 1
     assert data[0]["close"] == 50000.0
+    assert set(data[0]) == {"ts", "open", "high", "low", "close", "volume"}
+
+def test_price_history_cache_invalidated_by_version_bump(client, db_session, sample_symbol):
+    """Repeated reads are served from the cache until the ETL bumps the symbol."""
+    now = datetime.utcnow()
+    db_session.add(Price(symbol_id=sample_symbol.id, ts=now, close=100.0, source="test"))
+    db_session.commit()
+    assert len(client.get(f"/prices/{sample_symbol.symbol}").json()) == 1
+
+    db_session.add(Price(symbol_id=sample_symbol.id, ts=now + timedelta(minutes=1), close=101.0, source="test"))
+    db_session.commit()
+    assert len(client.get(f"/prices/{sample_symbol.symbol}").json()) == 1
+    assert response_cache.stats()["local_hits"] == 1
+
+    bump_versions([sample_symbol.symbol])
+    response_cache._versions.clear()  # Skip the version refresh interval
+    data = client.get(f"/prices/{sample_symbol.symbol}").json()
+    assert [row["close"] for row in data] == [101.0, 100.0]
+
+    # Another API process finds the entry in the shared Redis tier
+    async def from_replica():
+        async with redis.asyncio.Redis.from_url(settings.redis_url, decode_responses=True) as redis_client:
+            replica = ResponseCache(max_size=10, ttl=60, unversioned_ttl=5, version_refresh=0, client=redis_client)
+
+            async def load():
+                return {"prices": [], "next_cursor": None}
+
+            key = f"prices:{sample_symbol.symbol}:200:None:None:None"
+            return await replica.get_or_load(key, sample_symbol.symbol, load), replica
+
+    value, replica = asyncio.run(from_replica())
+    assert value["prices"] == data
+    assert replica.stats()["redis_hits"] == 1
+
+def test_price_history_pages_with_cursor(client, db_session, sample_symbol):
+    """Pages walk back through a time range via the X-Next-Cursor header."""
+    base = datetime(2026, 1, 1)
+    for i in range(5):
+        db_session.add(Price(symbol_id=sample_symbol.id, ts=base + timedelta(hours=i), close=float(i), source="test"))
+    db_session.commit()
+
+    params = {"limit": 2, "start_date": "2026-01-01T01:00:00", "end_date": "2026-01-01T05:00:00"}
+    pages = []
+    while True:
+        response = client.get(f"/prices/{sample_symbol.symbol}", params=params)
+        assert response.status_code == 200
+        pages.append([row["close"] for row in response.json()])
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert pages == [[4.0, 3.0], [2.0, 1.0]]
+    assert client.get(f"/prices/{sample_symbol.symbol}", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_multi_symbol_prices_in_one_request(client, db_session, sample_symbol):
+    """Top-N rows per symbol come back grouped by symbol, unknown symbols empty."""
+    base = datetime(2026, 1, 1)
+    for i in range(3):
+        db_session.add(Price(symbol_id=sample_symbol.id, ts=base + timedelta(minutes=i), close=float(i), source="test"))
+    db_session.commit()
+
+    response = client.get("/prices", params={"symbols": f"{sample_symbol.symbol},NOPE", "limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data) == [sample_symbol.symbol, "NOPE"]
+    assert [row["close"] for row in data[sample_symbol.symbol]] == [2.0, 1.0]
+    assert data["NOPE"] == []
+
+    response = client.post("/prices", json={"symbols": [sample_symbol.symbol], "limit": 1})
+    assert response.json() == {sample_symbol.symbol: [data[sample_symbol.symbol][0]]}
+
+def test_export_streams_arrow_and_csv(client, db_session, sample_symbol):
+    """Exports carry every matching row, readable back as an Arrow stream or CSV."""
+    pa = pytest.importorskip("pyarrow")
+    base = datetime(2026, 1, 1)
+    for i in range(5):
+        db_session.add(Price(symbol_id=sample_symbol.id, ts=base + timedelta(minutes=i), close=float(i), source="test"))
+    db_session.commit()
+
+    params = {"symbols": sample_symbol.symbol, "start": base.isoformat(), "batch_size": 1000}
+    response = client.get("/export/prices", params={**params, "format": "arrow"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("close").to_pylist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert set(table.column("symbol").to_pylist()) == {sample_symbol.symbol}
+
+    response = client.get("/export/prices", params={**params, "format": "csv"})
+    lines = response.text.splitlines()
+    assert lines[0] == "symbol,ts,open,high,low,close,volume,source"
+    assert len(lines) == 6
+
+    assert client.get("/export/prices", params={"format": "xml"}).status_code == 400
+    assert client.get("/export/nope").status_code == 400
+
+def test_latest_price_served_from_redis(client, db_session, sample_symbol):
+    """A missing hash entry is filled from Postgres once, then Redis answers alone."""
+    get_redis().delete(latest_key(sample_symbol.symbol), empty_key(sample_symbol.symbol))
+    ts = datetime(2026, 1, 1, 12, 0)
+    db_session.add(Price(symbol_id=sample_symbol.id, ts=ts, close=100.0, source="test"))
+    db_session.commit()
+
+    response = client.get(f"/latest/{sample_symbol.symbol}")
+    assert response.status_code == 200
+    assert response.json()["close"] == 100.0
+    assert get_redis().hget(latest_key(sample_symbol.symbol), "close") == "100.0"
+
+    # A newer tick recorded by the ETL shows up without touching the database
+    update_latest([{"symbol": sample_symbol.symbol, "ts": ts + timedelta(minutes=1), "close": 101.0, "source": "test"}])
+    data = client.get("/latest", params={"asset_type": sample_symbol.asset_type}).json()
+    assert [(row["symbol"], row["close"]) for row in data] == [(sample_symbol.symbol, 101.0)]
+    assert client.get("/latest", params={"asset_type": "bond"}).json() == []
+
+    assert client.get("/latest/NOPE").status_code == 404
+    get_redis().delete(latest_key(sample_symbol.symbol))
+
+def test_latest_remembers_symbols_without_prices(client, db_session, sample_symbol):
+    """A symbol with no prices is looked up once; until its first tick, polling skips Postgres."""
+    get_redis().delete(latest_key(sample_symbol.symbol), empty_key(sample_symbol.symbol))
+    assert client.get("/latest", params={"asset_type": sample_symbol.asset_type}).json() == []
+    assert get_redis().ttl(empty_key(sample_symbol.symbol)) > 0
+
+    # Rows written behind the latest hash stay unseen while the marker lives
+    ts = datetime(2026, 1, 1, 12, 0)
+    db_session.add(Price(symbol_id=sample_symbol.id, ts=ts, close=100.0, source="test"))
+    db_session.commit()
+    assert client.get(f"/latest/{sample_symbol.symbol}").status_code == 404
+
+    # The ETL's hash write takes precedence over the marker
+    update_latest([{"symbol": sample_symbol.symbol, "ts": ts, "close": 100.0, "source": "test"}])
+    assert client.get(f"/latest/{sample_symbol.symbol}").json()["close"] == 100.0
+    get_redis().delete(latest_key(sample_symbol.symbol), empty_key(sample_symbol.symbol))
+
+def test_live_feed_pushes_published_ticks(client):
+    """Ticks published by the ETL reach the clients watching that symbol only."""
+    tick = {"symbol": "LIVEUSDT", "ts": datetime(2026, 1, 1, 12, 0), "close": 1.5, "source": "test"}
+
+    with client.websocket_connect("/stream/prices?symbols=LIVEUSDT,OTHER") as websocket:
+        assert websocket.receive_json() == {"type": "subscribed", "symbols": ["LIVEUSDT", "OTHER"]}
+        publish_ticks([{**tick, "symbol": "NOTWATCHED"}, tick])
+        message = websocket.receive_json()
+        assert (message["symbol"], message["close"], message["ts"]) == ("LIVEUSDT", 1.5, "2026-01-01T12:00:00+00:00")
+
+    # TestClient buffers whole bodies, so the endless SSE stream is only checked for validation
+    assert client.get("/stream/prices", params={"symbols": ","}).status_code == 422
+
+def test_slow_subscriber_drops_oldest_ticks():
+    """A full client buffer keeps the newest ticks and counts what it dropped."""
+    subscription = Subscription(["X"], buffer_size=2)
+    for message in ("1", "2", "3"):
+        subscription.deliver(message)
+    assert subscription.dropped == 1
+    assert asyncio.run(subscription.next_within(0)) == "2"
+
+def test_get_candles_aggregates_buckets(client, db_session, sample_symbol):
+    """Rollup bars are merged into OHLCV candles in the database, oldest candle first."""
+    base = datetime(2026, 1, 1, 12, 0)
+    closes = [10.0, 12.0, 9.0, 11.0, 20.0, 18.0]
+    for i, close in enumerate(closes):
+        db_session.add(Price(
+            symbol_id=sample_symbol.id, ts=base + timedelta(minutes=2 * i),
+            close=close, volume=1.0, source="test"
+        ))
+    db_session.flush()
+    rebuild_bars(db_session, base, base + timedelta(hours=1))
+    db_session.commit()
+
+    response = client.get(
+        f"/prices/{sample_symbol.symbol}/candles",
+        params={"interval": "5m", "start": "2026-01-01T12:00:00", "end": "2026-01-01T13:00:00"}
+    )
+    assert response.status_code == 200
+    candles = response.json()
+    assert [c["ts"] for c in candles] == [
+        "2026-01-01T12:00:00Z", "2026-01-01T12:05:00Z", "2026-01-01T12:10:00Z"
+    ]
+    # 12:00 bucket holds the ticks at :00, :02 and :04
+    assert candles[0] == {
+        "ts": "2026-01-01T12:00:00Z", "open": 10.0, "high": 12.0, "low": 9.0, "close": 9.0, "volume": 3.0
+    }
+    assert candles[2]["close"] == 18.0
+
+    # The range is clamped to the last `limit` buckets
+    response = client.get(
+        f"/prices/{sample_symbol.symbol}/candles",
+        params={"interval": "5m", "start": "2026-01-01T12:00:00", "end": "2026-01-01T12:15:00", "limit": 1}
+    )
+    assert [c["ts"] for c in response.json()] == ["2026-01-01T12:10:00Z"]
+
+def test_metrics_label_requests_by_route(client, sample_symbol):
+    """Request latency is recorded under the route template, not the raw path."""
+    client.get(f"/prices/{sample_symbol.symbol}")
+    body = client.get("/metrics").text
+    assert 'marketflow_http_request_seconds_count{method="GET",route="/prices/{symbol}",status="200"}' in body
+    assert "marketflow_db_statement_seconds" in body
 
-def test_health_check():
+def test_health_check(client):
     """Test the health check endpoint."""
     response = client.get("/health")
     assert response.status_code == 200
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+from services.ingestion_service.app import backfill
+from services.common.common.models import BackfillChunk, Price
+
+class FlakyFetcher:
+    """Returns one bar per hour and fails the first call for a given chunk."""
+
+    def __init__(self, fail_on):
+        self.fail_on = fail_on
+
+    def fetch_history(self, symbol, start, end, interval):
+        if start == self.fail_on:
+            self.fail_on = None
+            raise RuntimeError("connection reset")
+        bars = []
+        ts = start
+        while ts < end:
+            bars.append({"symbol": symbol, "source": "test", "price": 1.0, "ts": ts})
+            ts += timedelta(hours=1)
+        return bars
+
+def test_plan_chunks_covers_range():
+    """Chunks are contiguous and clipped to the requested end."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    chunks = backfill.plan_chunks(start, start + timedelta(days=2, hours=6), "1m")
+
+    assert len(chunks) == 3
+    assert chunks[0][0] == start
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    assert chunks[-1][1] == start + timedelta(days=2, hours=6)
+
+def test_backfill_resumes_after_failure(db_session, monkeypatch):
+    """A failed chunk is retried on the next run and done chunks are not refetched."""
+    from services.etl_service.app.symbol_cache import symbol_cache
+
+    symbol_cache.clear()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    fetcher = FlakyFetcher(fail_on=start + timedelta(days=1))
+    monkeypatch.setitem(backfill.FETCHERS, "crypto", fetcher)
+
+    assert backfill.enqueue_chunks(db_session, ["BTCUSDT"], "crypto", start, start + timedelta(days=3), "1m") == 3
+    backfill.drain()
+
+    statuses = sorted(c.status for c in db_session.query(BackfillChunk).all())
+    assert statuses == ["done", "done", "failed"]
+
+    # Re-planning is idempotent and resumes only the failed chunk
+    monkeypatch.setattr(backfill.settings, "backfill_retry_delay", 0)
+    backfill.enqueue_chunks(db_session, ["BTCUSDT"], "crypto", start, start + timedelta(days=3), "1m")
+    assert backfill.drain() == 1
+
+    db_session.expire_all()
+    assert {c.status for c in db_session.query(BackfillChunk).all()} == {"done"}
+    assert db_session.query(Price).count() == 72
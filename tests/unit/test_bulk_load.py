@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+from services.common.common.bulk_load import load_prices
+from services.common.common.models import Price
+
+def _rows(symbol_id, n, close):
+    base_ts = datetime(2026, 1, 1)
+    for i in range(n):
+        yield (symbol_id, base_ts + timedelta(minutes=i), None, None, None, close + i, None, "test")
+
+def test_load_prices_streams_in_chunks(db_session, sample_symbol):
+    """Rows are copied in chunks, duplicates collapse and reloads upsert."""
+    rows = list(_rows(sample_symbol.id, 1000, 100.0))
+    rows.append(rows[0][:5] + (42.0,) + rows[0][6:])  # Later duplicate of the first key wins
+    rows.insert(2, rows[1][:5] + (7.0,) + rows[1][6:])  # So does one within the same chunk
+
+    stats = load_prices(iter(rows), chunk_size=300)
+    assert stats.rows == 1002
+    assert db_session.query(Price).count() == 1000
+    assert [price.close for price in db_session.query(Price).order_by(Price.ts).limit(2)] == [42.0, 7.0]
+    assert not any(price.is_bar for price in db_session.query(Price))  # Snapshots unless told otherwise
+
+    load_prices(_rows(sample_symbol.id, 10, 500.0), bars=True)
+    db_session.expire_all()
+    assert db_session.query(Price).count() == 1000
+    first = db_session.query(Price).order_by(Price.ts).first()
+    assert (first.close, first.is_bar) == (500.0, True)
@@ -1,4 +1,5 @@
 from services.etl_service.app.tasks import _calculate_symbol_metrics
+from services.etl_service.app.rollups import rebuild_bars
 from services.common.common.models import Price
 from datetime import datetime, timedelta
 
@@ -18,6 +19,8 @@ def test_rsi_calculation_logic(db_session, sample_symbol):
         db_session.add(p)
     
     db_session.commit()
+    rebuild_bars(db_session, base_ts - timedelta(days=25), base_ts + timedelta(days=1))
+    db_session.commit()
     
     # Run calculation
     _calculate_symbol_metrics(db_session, sample_symbol)
@@ -30,3 +33,92 @@ def test_rsi_calculation_logic(db_session, sample_symbol):
     assert metric.ma_20 > 0
     assert 0 <= metric.rsi_14 <= 100
     assert metric.volatility_20 >= 0
+
+def test_process_batch_upserts_prices(db_session):
+    """A batch creates missing symbols and upserts every tick in one pass."""
+    from services.etl_service.app.tasks import _process_batch
+    from services.etl_service.app.symbol_cache import symbol_cache
+    from services.common.common.models import Symbol
+
+    symbol_cache.clear()
+
+    ts = datetime(2026, 1, 1, 12, 0).isoformat()
+    batch = [
+        {"symbol": "BTCUSDT", "source": "binance", "price": 100.0, "volume": 5.0, "ts": ts},
+        {"symbol": "ETHUSDT", "source": "binance", "price": 10.0, "volume": 7.0, "ts": ts},
+    ]
+    result = _process_batch(batch, "crypto")
+    assert result["count"] == 2
+
+    # Same ticks again with a corrected price must update, not duplicate
+    batch[0]["price"] = 101.0
+    _process_batch(batch, "crypto")
+
+    assert db_session.query(Symbol).count() == 2
+    assert db_session.query(Price).count() == 2
+    btc = db_session.query(Symbol).filter_by(symbol="BTCUSDT").one()
+    assert db_session.query(Price).filter_by(symbol_id=btc.id).one().close == 101.0
+
+def test_metrics_engine_matches_per_symbol_metrics(db_session):
+    """The vectorized engine reproduces _calculate_symbol_metrics exactly."""
+    import random
+    import pytest
+    from services.etl_service.app.metrics_engine import run_metrics
+    from services.common.common.models import Symbol, DailyMetric
+
+    rng = random.Random(42)
+    base_ts = datetime.utcnow()
+    symbols = []
+    for name, n_prices in (("AAA", 60), ("BBB", 30), ("CCC", 10)):
+        symbol = Symbol(symbol=name, display_name=name, asset_type="equity", source="test")
+        db_session.add(symbol)
+        db_session.flush()
+        close = 100.0
+        for i in range(n_prices):
+            close *= 1 + rng.uniform(-0.03, 0.03)
+            db_session.add(Price(symbol_id=symbol.id, ts=base_ts - timedelta(days=i), close=close, source="test"))
+        symbols.append(symbol)
+    db_session.commit()
+    rebuild_bars(db_session, base_ts - timedelta(days=60), base_ts + timedelta(days=1))
+    db_session.commit()
+
+    for symbol in symbols:
+        _calculate_symbol_metrics(db_session, symbol)
+    columns = ("ma_20", "ma_50", "rsi_14", "volatility_20", "daily_return")
+    expected = {
+        m.symbol_id: {c: getattr(m, c) for c in columns}
+        for m in db_session.query(DailyMetric).all()
+    }
+    db_session.query(DailyMetric).delete()
+    db_session.commit()
+
+    assert run_metrics(db_session, "equity") == 2
+    db_session.expire_all()
+    actual = {
+        m.symbol_id: {c: getattr(m, c) for c in columns}
+        for m in db_session.query(DailyMetric).all()
+    }
+
+    assert actual.keys() == expected.keys()
+    for symbol_id, values in expected.items():
+        for column, value in values.items():
+            assert actual[symbol_id][column] == (None if value is None else pytest.approx(value, rel=1e-12))
+
+def test_process_batch_samples_pipeline_traces(db_session, monkeypatch):
+    """With every tick sampled, each one leaves its stage timings behind."""
+    from services.etl_service.app import tasks
+    from services.etl_service.app.symbol_cache import symbol_cache
+    from services.common.common.models import PipelineTrace
+
+    symbol_cache.clear()
+    monkeypatch.setattr(tasks.settings, "trace_sample_rate", 1.0)
+    batch = [{
+        "symbol": "BTCUSDT", "source": "binance", "price": 100.0,
+        "ts": datetime(2026, 1, 1, 12, 0).isoformat(), "trace": {"fetched": 1767268800.5, "published": 1767268801.0},
+    }]
+    tasks._process_batch(batch, "crypto")
+
+    trace = db_session.query(PipelineTrace).one()
+    assert (trace.symbol, trace.queue) == ("BTCUSDT", "etl.crypto")
+    assert trace.published_at < trace.etl_started_at <= trace.committed_at
+
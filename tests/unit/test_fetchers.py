@@ -0,0 +1,211 @@
+import json
+import uuid
+import httpx
+import pytest
+# The fetchers' own import path, so their except clauses see the same classes
+from common.exceptions import RateLimitError
+from common.rate_limit import NoRateLimit, RateLimiter
+from services.etl_service.app.indicators import StreamingIndicators
+from services.ingestion_service.app.fetchers.crypto_fetcher import CryptoFetcher
+
+def _ticker(symbol, price):
+    return {
+        "symbol": symbol, "lastPrice": str(price), "volume": "10", "openPrice": "1",
+        "highPrice": str(price), "lowPrice": "1", "closeTime": 1767225600000,
+    }
+
+def test_crypto_fetch_batch_uses_one_request_per_chunk():
+    """All symbols of a chunk come back from a single ticker/24hr call."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        symbols = json.loads(request.url.params["symbols"])
+        return httpx.Response(200, json=[_ticker(s, 100.0) for s in symbols])
+
+    fetcher = CryptoFetcher()
+    fetcher.TICKER_BATCH_SIZE = 2
+    fetcher.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    payloads = fetcher.fetch_batch(["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+
+    assert len(requests) == 2
+    assert [p["symbol"] for p in payloads] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    # Timestamp comes from Binance's closeTime, not the local clock
+    assert payloads[0]["ts"] == "2026-01-01T00:00:00+00:00"
+
+def _fallback_fetcher(handler, limiter):
+    """CryptoFetcher whose batch request is rejected, serving per-symbol requests from `handler`"""
+    def batch_handler(request):
+        return httpx.Response(400, json={"code": -1121, "msg": "Invalid symbol."})
+
+    fetcher = CryptoFetcher()
+    fetcher.rate_limiter = limiter
+    fetcher.client = httpx.Client(transport=httpx.MockTransport(batch_handler))
+    fetcher.async_transport = httpx.MockTransport(handler)
+    return fetcher
+
+def test_crypto_fallback_remembers_rejected_symbols():
+    """A symbol Binance rejects is skipped by later cycles instead of forcing the fallback again."""
+    requested = []
+
+    def handler(request):
+        symbol = request.url.params["symbol"]
+        requested.append(symbol)
+        if symbol == "GONEUSDT":
+            return httpx.Response(400, json={"code": -1121, "msg": "Invalid symbol."})
+        return httpx.Response(200, json=_ticker(symbol, 100.0))
+
+    fetcher = _fallback_fetcher(handler, NoRateLimit("binance-test"))
+    payloads = fetcher.fetch_batch(["BTCUSDT", "GONEUSDT", "ETHUSDT"])
+
+    assert sorted(p["symbol"] for p in payloads) == ["BTCUSDT", "ETHUSDT"]
+    assert fetcher.invalid_symbols == {"GONEUSDT"}
+    assert sorted(requested) == ["BTCUSDT", "ETHUSDT", "GONEUSDT"]
+
+    fetcher.client = httpx.Client(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json=[_ticker(s, 101.0) for s in json.loads(request.url.params["symbols"])])
+    ))
+    assert [p["symbol"] for p in fetcher.fetch_batch(["BTCUSDT", "GONEUSDT", "ETHUSDT"])] == ["BTCUSDT", "ETHUSDT"]
+
+def test_crypto_fallback_stops_on_rate_limit():
+    """A 429 in the per-symbol fallback ends the chunk and reaches the caller."""
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.params["symbol"])
+        return httpx.Response(429, headers={"Retry-After": "1"})
+
+    limiter = RateLimiter(f"test-{uuid.uuid4().hex}", per_minute=6000)
+    fetcher = _fallback_fetcher(handler, limiter)
+    fetcher.MAX_CONCURRENCY = 1
+    try:
+        with pytest.raises(RateLimitError):
+            fetcher.fetch_batch([f"SYM{i}USDT" for i in range(20)])
+    finally:
+        limiter.client.delete(limiter._bucket_key, limiter._block_key)
+    assert len(requested) == 1
+
+async def test_crypto_fallback_runs_inside_an_event_loop():
+    """fetch_batch can be called from a coroutine, e.g. the stream's gap fill."""
+    fetcher = _fallback_fetcher(lambda request: httpx.Response(200, json=_ticker(request.url.params["symbol"], 1.0)), NoRateLimit("binance-test"))
+    assert [p["symbol"] for p in fetcher.fetch_batch(["BTCUSDT"])] == ["BTCUSDT"]
+
+def test_yahoo_batch_reports_failed_tickers(monkeypatch):
+    """One multi-ticker download yields payloads for every ticker that has data."""
+    import math
+    import pandas as pd
+    from services.ingestion_service.app.fetchers import yahoo_fetcher
+    from services.ingestion_service.app.fetchers.commodity_fetcher import CommodityFetcher
+
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append(tickers)
+        index = pd.to_datetime(["2026-01-02 14:30", "2026-01-02 14:35"], utc=True)
+        columns = pd.MultiIndex.from_product([["Open", "High", "Low", "Close", "Volume"], tickers])
+        frame = pd.DataFrame(math.nan, index=index, columns=columns)
+        frame[("Close", "GC=F")] = [2000.0, math.nan]  # Current bar not printed yet
+        frame[("Open", "GC=F")] = [1990.0, 2010.0]  # Current open without a close
+        frame[("Volume", "GC=F")] = [0.0, math.nan]
+        return frame
+
+    monkeypatch.setattr(yahoo_fetcher.yf, "download", fake_download)
+    fetcher = CommodityFetcher()
+    payloads = fetcher.fetch_batch()
+
+    assert calls == [["GC=F", "SI=F"]]
+    assert len(payloads) == 1
+    assert payloads[0]["symbol"] == "GOLD"
+    assert payloads[0]["price"] == 2000.0
+    # Every field comes from the last closed bar, stamped with that bar's time
+    assert payloads[0]["open"] == 1990.0
+    assert payloads[0]["ts"] == "2026-01-02T14:30:00+00:00"
+    assert payloads[0]["bar"] is True
+    assert payloads[0]["volume"] is None
+    assert set(fetcher.last_failures) == {"SILVER"}
+
+def test_yahoo_chunks_fit_the_rate_limit_bucket(monkeypatch):
+    """No download asks for more tickers than the shared Yahoo budget can grant at once."""
+    import pandas as pd
+    from services.ingestion_service.app.fetchers import yahoo_fetcher
+    from services.ingestion_service.app.fetchers.equity_fetcher import EquityFetcher
+
+    calls = []
+    monkeypatch.setattr(yahoo_fetcher.yf, "download", lambda tickers, **kwargs: calls.append(tickers) or pd.DataFrame())
+    fetcher = EquityFetcher()
+    fetcher.rate_limiter = NoRateLimit("yahoo-test")
+    fetcher.rate_limiter.capacity = 2
+
+    fetcher.fetch_batch(["AMZN", "META", "NVDA"])
+    assert calls == [["AMZN", "META"], ["NVDA"]]
+
+def test_yahoo_polls_in_one_day_keep_their_own_rows(monkeypatch, db_session):
+    """Each poll stores the bar it saw, so intraday history and indicators keep moving."""
+    import pandas as pd
+    from services.common.common.models import IndicatorState, Price
+    from services.etl_service.app.symbol_cache import symbol_cache
+    from services.etl_service.app.tasks import _process_batch
+    from services.ingestion_service.app.fetchers import yahoo_fetcher
+    from services.ingestion_service.app.fetchers.equity_fetcher import EquityFetcher
+
+    served = []  # Bars Yahoo has printed so far today
+
+    def fake_download(tickers, **kwargs):
+        index = pd.to_datetime([at for at, _ in served], utc=True)
+        columns = pd.MultiIndex.from_product([["Open", "High", "Low", "Close", "Volume"], tickers])
+        return pd.DataFrame([[close] * len(columns) for _, close in served], index=index, columns=columns)
+
+    monkeypatch.setattr(yahoo_fetcher.yf, "download", fake_download)
+    symbol_cache.clear()
+    fetcher = EquityFetcher()
+    for bar in [("2026-01-02 14:30", 100.0), ("2026-01-02 14:35", 101.0)]:
+        served.append(bar)
+        _process_batch(fetcher.fetch_batch(["AMZN"]), "equity")
+        state = db_session.query(IndicatorState).one()
+        assert state.last_close == bar[1]
+        db_session.expire_all()
+
+    assert [price.close for price in db_session.query(Price).order_by(Price.ts)] == [100.0, 101.0]
+    assert StreamingIndicators.from_bytes(state.state).count == 2
+
+def test_crypto_fetcher_reads_the_fake_exchange():
+    """CryptoFetcher parses the stand-in's ticker/24hr and paginated klines like Binance's."""
+    from datetime import datetime, timedelta, timezone
+    from fastapi.testclient import TestClient
+    from services.ingestion_service.app.fake_exchange import create_app
+    from services.ingestion_service.app.fetchers.fake_fetcher import FakeExchangeFetcher
+
+    fetcher = CryptoFetcher()
+    fetcher.BASE_URL = "http://testserver/api/v3"
+    fetcher.client = TestClient(create_app(seed=7))
+
+    payloads = fetcher.fetch_batch(["BTCUSDT", "FAKE00001USDT"])
+    assert [p["symbol"] for p in payloads] == ["BTCUSDT", "FAKE00001USDT"]
+    assert all(p["low"] <= p["price"] <= p["high"] for p in payloads)
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    bars = fetcher.fetch_history("BTCUSDT", start, start + timedelta(minutes=1500), "1m")
+    assert len(bars) == 1500  # Two klines pages
+    assert bars[0]["ts"] == start.isoformat()
+    # One continuous walk: every bar opens where the previous one closed
+    assert all(b["open"] == a["price"] for a, b in zip(bars, bars[1:]))
+
+    # Same seed, same market, with or without the HTTP hop
+    local = FakeExchangeFetcher(seed=7).fetch_history("BTCUSDT", start, start + timedelta(minutes=1500), "1m")
+    assert [(b["ts"], b["price"]) for b in local] == [(b["ts"], b["price"]) for b in bars]
+
+def test_fake_exchange_rejects_what_binance_rejects():
+    from fastapi.testclient import TestClient
+    from services.ingestion_service.app.fake_exchange import create_app
+
+    client = TestClient(create_app(symbols=["FAKE00000USDT", "FAKE00001USDT"]))
+
+    assert len(client.get("/api/v3/ticker/24hr").json()) == 2
+    response = client.get("/api/v3/klines", params={"symbol": "btc-usdt", "interval": "1m"})
+    assert response.status_code == 400 and response.json()["code"] == -1121
+    response = client.get("/api/v3/klines", params={"symbol": "BTCUSDT", "interval": "7m"})
+    assert response.json()["code"] == -1120
+    # Without startTime: the latest `limit` bars, the last one still open
+    bars = client.get("/api/v3/klines", params={"symbol": "BTCUSDT", "interval": "1m", "limit": 5}).json()
+    assert len(bars) == 5 and bars[-1][6] >= bars[-1][0]
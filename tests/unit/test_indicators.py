@@ -0,0 +1,65 @@
+import random
+import statistics
+import pytest
+from datetime import datetime, timedelta
+from services.etl_service.app.indicators import StreamingIndicators
+
+def _wilder_rsi(closes, period=14):
+    changes = [b - a for a, b in zip(closes, closes[1:])]
+    avg_gain = sum(max(c, 0) for c in changes[:period]) / period
+    avg_loss = sum(max(-c, 0) for c in changes[:period]) / period
+    for c in changes[period:]:
+        avg_gain = (avg_gain * (period - 1) + max(c, 0)) / period
+        avg_loss = (avg_loss * (period - 1) + max(-c, 0)) / period
+    return 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+def test_streaming_indicators_match_full_recompute():
+    """Incremental state agrees with recomputing from the full history."""
+    rng = random.Random(7)
+    state = StreamingIndicators()
+    closes = []
+    close = 100.0
+    for _ in range(2500):
+        close *= 1 + rng.uniform(-0.01, 0.01)
+        closes.append(close)
+        state.update(close)
+
+    assert state.ma_20 == pytest.approx(sum(closes[-20:]) / 20, rel=1e-9)
+    assert state.ma_50 == pytest.approx(sum(closes[-50:]) / 50, rel=1e-9)
+    assert state.volatility_20 == pytest.approx(statistics.pstdev(closes[-20:]), rel=1e-6)
+    assert state.rsi_14 == pytest.approx(_wilder_rsi(closes), rel=1e-9)
+
+def test_streaming_indicators_round_trip():
+    """Persisted state resumes exactly where it left off."""
+    state = StreamingIndicators()
+    for i in range(30):
+        state.update(100 + (i % 7))
+
+    restored = StreamingIndicators.from_bytes(state.to_bytes())
+    for close in (101.5, 99.0):
+        state.update(close)
+        restored.update(close)
+
+    assert restored.ma_20 == state.ma_20
+    assert restored.rsi_14 == state.rsi_14
+    assert restored.ma_50 is None
+
+def test_process_batch_updates_indicator_state(db_session):
+    """Every landed tick advances the persisted indicators; replays are ignored."""
+    from services.etl_service.app.tasks import _process_batch
+    from services.etl_service.app.symbol_cache import symbol_cache
+    from services.common.common.models import IndicatorState
+
+    symbol_cache.clear()
+    base_ts = datetime(2026, 1, 1)
+    batch = [
+        {"symbol": "BTCUSDT", "source": "binance", "price": 100.0 + i, "ts": (base_ts + timedelta(minutes=i)).isoformat()}
+        for i in range(25)
+    ]
+    _process_batch(batch[:10], "crypto")
+    _process_batch(batch[5:], "crypto")
+
+    state = db_session.query(IndicatorState).one()
+    assert state.last_close == 124.0
+    assert state.ma_20 == pytest.approx(sum(range(105, 125)) / 20)
+    assert state.rsi_14 == 100.0
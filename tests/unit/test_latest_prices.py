@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from services.common.common.latest_prices import latest_key, update_latest
+from services.common.common.redis_client import get_redis
+
+@pytest.fixture
+def symbol():
+    symbol = f"TEST-{uuid.uuid4().hex}"
+    yield symbol
+    get_redis().delete(latest_key(symbol))
+
+def test_only_newer_ticks_replace_the_latest(symbol):
+    """Out-of-order deliveries never move the latest price backwards."""
+    now = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    tick = {"symbol": symbol, "ts": now, "close": 10.0, "volume": None, "source": "test"}
+
+    assert update_latest([tick]) == 1
+    assert update_latest([{**tick, "ts": now - timedelta(seconds=1), "close": 9.0}]) == 0
+    # Within one batch only the newest tick per symbol is sent
+    assert update_latest([{**tick, "ts": now + timedelta(seconds=2), "close": 12.0},
+                          {**tick, "ts": now + timedelta(seconds=1), "close": 11.0}]) == 1
+
+    stored = get_redis().hgetall(latest_key(symbol))
+    assert stored["close"] == "12.0"
+    assert stored["ts"] == (now + timedelta(seconds=2)).isoformat()
+    assert stored["volume"] == ""
@@ -0,0 +1,35 @@
+from services.ingestion_service.app import loadgen
+from services.ingestion_service.app.fetchers.fake_fetcher import FakeExchangeFetcher
+
+class _Probe:
+    """Queue that fills with every published batch and never drains"""
+
+    def __init__(self):
+        self.messages = 0
+
+    def backlog(self):
+        return self.messages
+
+    def committed(self):
+        return 0
+
+def test_run_step_paces_batches_and_flags_a_growing_backlog(monkeypatch):
+    probe = _Probe()
+    published = []
+
+    def publish(data, asset_type):
+        published.append((len(data), asset_type))
+        probe.messages += 1
+
+    monkeypatch.setattr(loadgen, "_publish_batch", publish)
+    fetcher = FakeExchangeFetcher(symbols=["FAKE00000USDT", "FAKE00001USDT", "FAKE00002USDT"], seed=1)
+
+    result = loadgen.run_step(fetcher, probe, "crypto", rate=200, seconds=1.0, batch_size=10, report_every=0.25)
+
+    # 200 ticks/s in batches of 10 for one second, symbols cycled
+    assert 18 <= len(published) <= 21
+    assert published[0] == (10, "crypto")
+    assert result.published == 10 * len(published)
+    assert result.backlog_end == len(published)
+    assert result.backlog_growth > 10
+    assert result.saturated
@@ -0,0 +1,53 @@
+import sys
+import pytest
+from sqlalchemy import text
+from prometheus_client import REGISTRY
+from services.common.common.db import SessionLocal
+from services.ingestion_service.app.fetchers.base import BaseFetcher
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+class FlakyFetcher(BaseFetcher):
+    def __init__(self):
+        super().__init__("metrics-test")
+
+    def fetch_price(self, symbol):
+        if symbol == "BAD":
+            raise ValueError(symbol)
+        return {"symbol": symbol}
+
+    def fetch_batch(self, symbols):
+        return [self.fetch_price(symbol) for symbol in symbols]
+
+    def fetch_history(self, symbol, start, end, interval):
+        return []
+
+def test_fetcher_calls_are_timed_and_errors_counted():
+    """Subclasses are instrumented by BaseFetcher without any code of their own."""
+    fetcher = FlakyFetcher()
+    before = sample("marketflow_fetch_seconds_count", source="metrics-test", operation="fetch_batch")
+
+    fetcher.fetch_batch(["A", "B"])
+    with pytest.raises(ValueError):
+        fetcher.fetch_price("BAD")
+
+    assert sample("marketflow_fetch_seconds_count", source="metrics-test", operation="fetch_batch") == before + 1
+    assert sample("marketflow_fetch_seconds_count", source="metrics-test", operation="fetch_price") >= 3
+    assert sample("marketflow_fetch_errors_total", source="metrics-test", operation="fetch_price", error="ValueError") >= 1
+
+def test_statements_and_commits_are_timed():
+    """Engine and session events feed the database histograms."""
+    statements = sample("marketflow_db_statement_seconds_count", engine="sync", operation="SELECT")
+    commits = sample("marketflow_db_commit_seconds_count")
+
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+        db.commit()
+
+    assert sample("marketflow_db_statement_seconds_count", engine="sync", operation="SELECT") == statements + 1
+    assert sample("marketflow_db_commit_seconds_count") == commits + 1
+
+def test_collectors_live_in_one_module():
+    """The package path reuses common.metrics instead of registering a second copy."""
+    assert "services.common.common.metrics" not in sys.modules
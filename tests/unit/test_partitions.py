@@ -0,0 +1,34 @@
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+from services.common.common.models import Price
+from services.common.common.partitions import (
+    DEFAULT_PARTITION, create_partition, ensure_partitions, expire_partitions, list_partitions
+)
+
+def test_new_partition_takes_over_rows_from_default(db_session, sample_symbol):
+    """Rows parked in the DEFAULT partition move into the month's partition when it is created."""
+    ts = datetime(2020, 3, 15, tzinfo=timezone.utc)
+    db_session.add(Price(symbol_id=sample_symbol.id, ts=ts, close=1.0, source="test"))
+    db_session.commit()
+    conn = db_session.connection()
+    assert conn.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar() == 1
+
+    assert create_partition(conn, date(2020, 3, 1))
+    assert not create_partition(conn, date(2020, 3, 1))
+    db_session.commit()
+
+    conn = db_session.connection()
+    assert conn.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar() == 0
+    assert conn.execute(text("SELECT count(*) FROM prices_y2020m03")).scalar() == 1
+    assert db_session.query(Price).filter_by(symbol_id=sample_symbol.id).one().ts == ts
+
+    # Everything older than 12 months before "now" goes, the months ahead stay
+    now = datetime(2021, 6, 10, tzinfo=timezone.utc)
+    ensure_partitions(conn, months_ahead=1, now=now)
+    assert expire_partitions(conn, retention_months=12, drop=True, now=now) == ["prices_y2020m03"]
+    db_session.commit()
+
+    months = list_partitions(db_session.connection())
+    assert date(2020, 3, 1) not in months
+    assert {date(2021, 6, 1), date(2021, 7, 1)} <= set(months)
+    assert db_session.query(Price).count() == 0
@@ -0,0 +1,47 @@
+import uuid
+import pytest
+from services.common.common.exceptions import RateLimitError
+from services.common.common.rate_limit import NoRateLimit, RateLimiter
+
+@pytest.fixture
+def limiter():
+    limiter = RateLimiter(f"test-{uuid.uuid4().hex}", per_minute=60, weight_header="X-USED", weight_limit=100)
+    yield limiter
+    limiter.client.delete(limiter._bucket_key, limiter._block_key)
+
+def test_bucket_is_shared_and_refills(limiter):
+    """A second limiter on the same source sees the tokens the first one took."""
+    limiter.acquire(50)
+    other = RateLimiter(limiter.source, per_minute=60)
+
+    assert other.try_acquire(10) == 0
+    wait = other.try_acquire(5)
+    assert 4 < wait <= 5
+
+def test_acquire_gives_up_after_max_wait(limiter):
+    """Long waits are handed back to the caller as RateLimitError."""
+    limiter.acquire(60)
+    with pytest.raises(RateLimitError) as exc:
+        limiter.acquire(30, max_wait=1)
+    assert exc.value.retry_after == 30
+
+def test_retry_after_blocks_every_process(limiter):
+    """A 429 stops all users of the source for Retry-After seconds."""
+    with pytest.raises(RateLimitError):
+        limiter.observe(429, {"Retry-After": "7"})
+    assert 6 < limiter.try_acquire(1) <= 7
+
+def test_used_weight_header_throttles_early(limiter):
+    """Nearing the provider's weight limit pauses until the window resets."""
+    limiter.observe(200, {"X-USED": "50"})
+    assert limiter.try_acquire(1) == 0
+    limiter.observe(200, {"X-USED": "95"})
+    assert limiter.try_acquire(1) > 0
+
+def test_unlimited_sources_never_wait():
+    """A source without a budget gets a limiter that grants everything, 429s included."""
+    limiter = NoRateLimit("local")
+    limiter.observe(429, {"Retry-After": "60"})
+
+    assert limiter.try_acquire(10_000) == 0.0
+    limiter.acquire(10_000, max_wait=0)
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from services.common.common.models import Price, PriceBar1m, PriceBar1h, PriceBar1d
+from services.etl_service.app.rollups import rebuild_bars
+from services.etl_service.app.symbol_cache import symbol_cache
+from services.etl_service.app.tasks import _process_batch
+
+def _tick(ts, price, volume=1.0):
+    return {"symbol": "BTCUSDT", "source": "binance", "price": price, "volume": volume, "ts": ts.isoformat()}
+
+def test_ticks_roll_up_through_every_level(db_session):
+    """Each committed batch refreshes the 1m, 1h and 1d bars it touches."""
+    symbol_cache.clear()
+    base = datetime(2026, 1, 1, 12, 0)
+    _process_batch([_tick(base, 100.0), _tick(base + timedelta(seconds=30), 105.0)], "crypto")
+    _process_batch([_tick(base + timedelta(minutes=1), 95.0), _tick(base + timedelta(minutes=1, seconds=30), 98.0)], "crypto")
+
+    minutes = db_session.query(PriceBar1m).order_by(PriceBar1m.bucket).all()
+    assert [(b.open, b.high, b.low, b.close, b.ticks) for b in minutes] == [
+        (100.0, 105.0, 100.0, 105.0, 2),
+        (95.0, 98.0, 95.0, 98.0, 2),
+    ]
+    hour = db_session.query(PriceBar1h).one()
+    assert (hour.open, hour.high, hour.low, hour.close, hour.volume, hour.ticks) == (100.0, 105.0, 95.0, 98.0, 4.0, 4)
+    assert db_session.query(PriceBar1d).one().close == 98.0
+
+    # A re-delivered tick with a corrected price replaces its value instead of adding to it
+    _process_batch([_tick(base + timedelta(minutes=1, seconds=30), 90.0)], "crypto")
+    db_session.expire_all()
+    hour = db_session.query(PriceBar1h).one()
+    assert (hour.low, hour.close, hour.ticks) == (90.0, 90.0, 4)
+
+def test_rebuild_drops_bars_without_prices(db_session, sample_symbol):
+    """The repair job recomputes bars from raw prices and prunes orphaned ones."""
+    base = datetime(2026, 1, 1, 12, 0)
+    for i in range(3):
+        db_session.add(Price(symbol_id=sample_symbol.id, ts=base + timedelta(hours=i), close=10.0 + i, source="test"))
+    db_session.commit()
+    rebuild_bars(db_session, base, base + timedelta(hours=3))
+    db_session.commit()
+    assert db_session.query(PriceBar1h).count() == 3
+
+    db_session.query(Price).filter(Price.ts >= base + timedelta(hours=2)).delete()
+    rebuild_bars(db_session, base + timedelta(hours=2), base + timedelta(hours=3), [sample_symbol.id])
+    db_session.commit()
+
+    assert db_session.query(PriceBar1m).count() == 2
+    assert db_session.query(PriceBar1h).count() == 2
+    day = db_session.query(PriceBar1d).one()
+    assert (day.open, day.close, day.ticks) == (10.0, 11.0, 2)
+
+def test_snapshot_ranges_do_not_widen_minute_bars(db_session):
+    """24h ticker open/high/low are not the minute's; only bars keep their own wicks."""
+    symbol_cache.clear()
+    base = datetime(2026, 1, 1, 12, 0)
+
+    def ticker(ts, price):
+        return {**_tick(ts, price), "open": 80.0, "high": 150.0, "low": 60.0}
+
+    _process_batch([ticker(base, 100.0), ticker(base + timedelta(seconds=20), 104.0), ticker(base + timedelta(seconds=40), 102.0)], "crypto")
+    kline = {**_tick(base + timedelta(minutes=1), 101.0), "open": 99.0, "high": 107.0, "low": 97.0, "bar": True}
+    _process_batch([kline], "crypto")
+
+    minutes = db_session.query(PriceBar1m).order_by(PriceBar1m.bucket).all()
+    assert [(b.open, b.high, b.low, b.close) for b in minutes] == [
+        (100.0, 104.0, 100.0, 102.0),
+        (99.0, 107.0, 97.0, 101.0),
+    ]
+    hour = db_session.query(PriceBar1h).one()
+    assert (hour.open, hour.high, hour.low, hour.close) == (100.0, 107.0, 97.0, 101.0)
@@ -0,0 +1,90 @@
+import asyncio
+from services.ingestion_service.app.replay_server import ReplayServer
+from services.ingestion_service.app.streaming import CryptoStream, parse_message
+
+def _ticker(symbol, price, event_time):
+    return {
+        "stream": f"{symbol.lower()}@ticker",
+        "data": {
+            "e": "24hrTicker", "E": event_time, "s": symbol, "c": str(price),
+            "o": "1", "h": str(price), "l": "1", "v": "10",
+        },
+    }
+
+def _kline(symbol, close, start, closed):
+    return {
+        "stream": f"{symbol.lower()}@kline_1m",
+        "data": {
+            "e": "kline", "E": start + 60000, "s": symbol,
+            "k": {"t": start, "o": "1", "h": str(close), "l": "1", "c": str(close), "v": "5", "x": closed},
+        },
+    }
+
+def test_parse_message_keeps_tickers_and_closed_klines():
+    ticker = parse_message(_ticker("BTCUSDT", 100.5, 1767225600000))
+    assert ticker["symbol"] == "BTCUSDT"
+    assert ticker["price"] == 100.5
+    assert ticker["ts"] == "2026-01-01T00:00:00+00:00"
+
+    assert parse_message(_kline("BTCUSDT", 101, 1767225600000, closed=False)) is None
+    assert parse_message(_kline("BTCUSDT", 101, 1767225600000, closed=True))["price"] == 101.0
+
+async def test_stream_coalesces_replayed_ticks_into_batches(tmp_path):
+    """Only the latest ticker per symbol is sent; unsubscribed streams are filtered server-side."""
+    start = 1767225600000
+    messages = [_ticker("BTCUSDT", 100 + i, start + i) for i in range(5)]
+    messages += [_ticker("ETHUSDT", 10, start + 5), _ticker("SOLUSDT", 1, start + 6)]
+    messages.append(_kline("BTCUSDT", 104, start, closed=True))
+
+    batches = []
+
+    async def sink(batch):
+        batches.append(batch)
+
+    server = ReplayServer(messages, speed=0)
+    async with await server.serve("localhost", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        stream = CryptoStream(
+            ["BTCUSDT", "ETHUSDT"], sink=sink, url=f"ws://localhost:{port}/stream",
+            kline_interval="1m", batch_size=1000, batch_interval=60, record_to=str(tmp_path / "ticks.jsonl"),
+        )
+        task = asyncio.create_task(stream.run())
+        for _ in range(100):
+            if stream.messages == 7:
+                break
+            await asyncio.sleep(0.02)
+        stream.stop()
+        await asyncio.wait_for(task, timeout=5)
+
+    assert stream.messages == 7  # SOLUSDT was never sent
+    sent = [payload for batch in batches for payload in batch]
+    tickers = {p["symbol"]: p["price"] for p in sent if p["ts"] != "2026-01-01T00:00:00+00:00"}
+    assert tickers == {"BTCUSDT": 104.0, "ETHUSDT": 10.0}
+    assert len(sent) == 3  # two coalesced tickers + one closed bar
+    # Raw messages are recorded on flush, every one of them
+    assert len((tmp_path / "ticks.jsonl").read_text().splitlines()) == 7
+
+def test_stream_url_lists_every_subscription():
+    stream = CryptoStream(["btcusdt"], url="ws://example/stream", kline_interval="1m")
+    assert stream.stream_url == "ws://example/stream?streams=btcusdt@ticker/btcusdt@kline_1m"
+
+async def test_failed_flush_keeps_the_batch_for_the_next_one():
+    """A broker error neither loses the micro-batch nor escapes flush()."""
+    sent = []
+
+    async def sink(batch):
+        if not sent:
+            sent.append(None)
+            raise ConnectionRefusedError("broker down")
+        sent.append(batch)
+
+    stream = CryptoStream(["BTCUSDT"], sink=sink, url="ws://example/stream")
+    stream._add(parse_message(_ticker("BTCUSDT", 100, 1767225600000)), is_bar=False)
+    await stream.flush()
+    assert stream.failed_flushes == 1 and stream._pending() == 1
+
+    # A newer ticker arriving meanwhile replaces the re-queued one
+    stream._add(parse_message(_ticker("BTCUSDT", 101, 1767225601000)), is_bar=False)
+    await stream.flush()
+    assert [p["price"] for p in sent[1]] == [101.0]
+    assert stream._pending() == 0 and stream.batches == 1
@@ -0,0 +1,41 @@
+import time
+from services.etl_service.app.symbol_cache import SymbolCache
+
+def test_cache_evicts_least_recently_used():
+    """The cache never grows beyond max_size."""
+    cache = SymbolCache(max_size=2, ttl=60)
+    cache.put("BTCUSDT", 1)
+    cache.put("ETHUSDT", 2)
+    cache.get("BTCUSDT")
+    cache.put("SOLUSDT", 3)
+
+    assert cache.get("ETHUSDT") is None
+    assert cache.get("BTCUSDT") == 1
+    assert cache.get("SOLUSDT") == 3
+
+def test_cache_expires_entries():
+    """Entries older than the TTL count as misses."""
+    cache = SymbolCache(max_size=10, ttl=0.01)
+    cache.put("BTCUSDT", 1)
+    time.sleep(0.02)
+
+    assert cache.get("BTCUSDT") is None
+    assert cache.stats()["misses"] == 1
+
+def test_resolve_creates_then_hits(db_session, sample_symbol):
+    """Known symbols are read once, new ones are created race-free."""
+    cache = SymbolCache(max_size=10, ttl=60)
+    sources = {"BTCUSDT": "binance", "ETHUSDT": "binance"}
+
+    first, created = cache.resolve(db_session, sources, "crypto")
+    db_session.commit()
+    second, created_again = cache.resolve(db_session, sources, "crypto")
+    third, _ = cache.resolve(db_session, sources, "crypto")
+
+    assert first["BTCUSDT"] == sample_symbol.id
+    assert first == second == third
+    # Only the call that inserted ETHUSDT reports it as created
+    assert created == {"ETHUSDT"} and created_again == set()
+    # ETHUSDT is only cached once its insert is committed
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 3
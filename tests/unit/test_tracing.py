@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from prometheus_client import REGISTRY
+from services.common.common.tracing import observe_lags, stage_times, stamp, trace_rows
+
+def test_stage_stamps_become_hop_lags_and_trace_rows():
+    """Each hop's lag is the gap between consecutive stamps, source ts first."""
+    source = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+    payload = {"symbol": "BTCUSDT", "ts": "2026-01-01T12:00:00+00:00", "trace": {"fetched": source + 2}}
+    stamp([payload], "published", source + 2.5)
+    stamp([payload], "etl_started", source + 4)
+    stamp([payload], "committed", source + 4.25)
+
+    assert stage_times(payload)["source"] == source
+
+    labels = {"asset_type": "crypto", "queue": "etl.tracing-test", "hop": "queue"}
+    observe_lags([payload], "crypto", "etl.tracing-test")
+    assert REGISTRY.get_sample_value("marketflow_pipeline_lag_seconds_sum", labels) == 1.5
+    assert REGISTRY.get_sample_value("marketflow_pipeline_lag_seconds_sum", {**labels, "hop": "total"}) == 4.25
+
+    row, = trace_rows([payload], "crypto", "etl.crypto")
+    assert row["source_ts"] == datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    assert (row["committed_at"] - row["fetched_at"]).total_seconds() == 2.25